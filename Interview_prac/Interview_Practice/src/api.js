@@ -1,13 +1,23 @@
 const BASE_URL = "http://localhost:8000"; // change if backend differs
 
+// A busy server sheds interview calls with 429 + Retry-After; retry a couple of times
+const MAX_BUSY_RETRIES = 2;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
 export const api = {
   post: async (endpoint, data) => {
     try {
-      const response = await fetch(`${BASE_URL}${endpoint}`, {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(data),
-      });
+      let response;
+      for (let attempt = 0; ; attempt++) {
+        response = await fetch(`${BASE_URL}${endpoint}`, {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify(data),
+        });
+        if (response.status !== 429 || attempt >= MAX_BUSY_RETRIES) break;
+        await sleep((Number(response.headers.get("Retry-After")) || 1) * 1000);
+      }
       return await response.json();
     } catch (err) {
       console.error("API POST Error:", err);
@@ -15,6 +25,20 @@ export const api = {
     }
   },
 
+  // Multipart file upload; the browser streams the file body
+  upload: async (endpoint, file) => {
+    try {
+      const form = new FormData();
+      form.append("file", file);
+      const response = await fetch(`${BASE_URL}${endpoint}`, { method: "POST", body: form });
+      const data = await response.json();
+      return response.ok ? data : { error: true, status: response.status, detail: data.detail };
+    } catch (err) {
+      console.error("API UPLOAD Error:", err);
+      return { error: true };
+    }
+  },
+
   get: async (endpoint) => {
     try {
       const response = await fetch(`${BASE_URL}${endpoint}`);
@@ -25,3 +49,51 @@ export const api = {
     }
   },
 };
+
+const WS_URL = BASE_URL.replace(/^http/, "ws");
+
+// Above this many unsent bytes, live speech chunks are skipped (answers are always sent)
+const MAX_BUFFERED_BYTES = 64 * 1024;
+
+// One persistent socket per interview: answers and speech chunks go up;
+// question tokens, questions, scores, speech stats and the report come down
+export const openInterviewSocket = (sessionId, onEvent) => {
+  const socket = new WebSocket(`${WS_URL}/ws/interview/${sessionId}`);
+  const pending = [];
+
+  socket.onopen = () => {
+    while (pending.length) socket.send(pending.shift());
+  };
+  socket.onmessage = (message) => {
+    const event = JSON.parse(message.data);
+    if (event.type === "heartbeat") {
+      socket.send(JSON.stringify({ type: "pong" }));
+      return;
+    }
+    onEvent(event);
+  };
+  socket.onerror = (err) => console.error("Interview socket error:", err);
+  socket.onclose = (event) => onEvent({ type: "closed", code: event.code, reason: event.reason });
+
+  const send = (data) => {
+    const payload = JSON.stringify(data);
+    if (socket.readyState === WebSocket.OPEN) {
+      socket.send(payload);
+      return true;
+    }
+    if (socket.readyState === WebSocket.CONNECTING) {
+      pending.push(payload);
+      return true;
+    }
+    return false;
+  };
+
+  return {
+    isOpen: () => socket.readyState === WebSocket.OPEN,
+    sendAnswer: (answer, seq) => send({ type: "answer", answer, seq }),
+    sendSpeechChunk: (text, start, end) =>
+      socket.bufferedAmount > MAX_BUFFERED_BYTES ? false : send({ type: "speech_chunk", text, start, end }),
+    end: () => send({ type: "end" }),
+    close: () => socket.close(),
+  };
+};
@@ -5,7 +5,7 @@ import { useInterview } from "../utils/InterviewContext.jsx"; // CORRECTED
 
 export default function BuildResume() {
   const navigate = useNavigate();
-  const { setBuiltResume, setResumeText } = useInterview();
+  const { setBuiltResume, setResumeText, setResumeId } = useInterview();
 
   const [form, setForm] = useState({
     name: "",
@@ -51,6 +51,7 @@ export default function BuildResume() {
     // Save to global context
     setBuiltResume(form);
     setResumeText(JSON.stringify(form, null, 2));
+    setResumeId("");
 
     const doc = new jsPDF();
     let y = 20;
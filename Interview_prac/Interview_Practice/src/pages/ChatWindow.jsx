@@ -1,7 +1,7 @@
 ﻿import React, { useState, useEffect, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import { useInterview } from "../utils/InterviewContext.jsx";
-import { api } from "../api.js";
+import { api, openInterviewSocket } from "../api.js";
 import QuestionDisplay from "../components/QuestionDisplay";
 import InterviewerAvatar from "../components/InterviewerAvatar";
 import Timer from "../components/Timer";
@@ -16,7 +16,7 @@ const ProgressBar = ({ progress }) => (
 
 export default function ChatWindow() {
   const navigate = useNavigate();
-  const { addMessage, chat, setScoreBreakdown, role, experience, difficulty, resumeText } = useInterview();
+  const { addMessage, chat, setScoreBreakdown, role, experience, difficulty, resumeText, resumeId } = useInterview();
   const [messages, setMessages] = useState([]);
   const [isListening, setIsListening] = useState(false);
   const [isSpeaking, setIsSpeaking] = useState(false);
@@ -24,12 +24,15 @@ export default function ChatWindow() {
   const [progress, setProgress] = useState(15);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
-  const [conversationHistory, setConversationHistory] = useState(null);
   const [interviewStarted, setInterviewStarted] = useState(false);
   const [timeRemaining, setTimeRemaining] = useState(600);
   const [isInterviewActive, setIsInterviewActive] = useState(false);
   const [sessionId, setSessionId] = useState(null);
   const recognitionRef = useRef(null);
+  const answerSeqRef = useRef(0);
+  const socketRef = useRef(null);
+  const pendingAnswerRef = useRef(null);
+  const speechClockRef = useRef({ origin: 0, segmentStart: 0 });
   const scrollRef = useRef(null);
   const timerIntervalRef = useRef(null);
 
@@ -44,10 +47,13 @@ export default function ChatWindow() {
           role: role || "Software Engineer",
           experience: experience || "2-3",
           difficulty: difficulty || "Medium",
-          resume_text: resumeText || ""
+          // An uploaded resume is referenced by id; its text stays on the server
+          resume_id: resumeId || null,
+          resume_text: resumeId ? "" : resumeText || ""
         });
         if (response.success && response.question) {
-          setConversationHistory([{ role: "interviewer", content: response.question }]);
+          answerSeqRef.current = 0;
+          socketRef.current = openInterviewSocket(newSessionId, handleSocketEvent);
           const welcomeMsg = "Welcome! Lets start your mock interview.";
           setMessages([
             { sender: "bot", text: welcomeMsg },
@@ -67,7 +73,8 @@ export default function ChatWindow() {
       }
     };
     startInterview();
-  }, [role, experience, difficulty, resumeText]);
+    return () => socketRef.current?.close();
+  }, [role, experience, difficulty, resumeText, resumeId]);
 
   useEffect(() => {
     scrollRef.current?.scrollIntoView({ behavior: "smooth" });
@@ -112,6 +119,7 @@ export default function ChatWindow() {
     } catch (err) {
       console.error("Error fetching final report:", err);
     }
+    socketRef.current?.close();
     setTimeout(() => navigate("/summary"), 3000);
   };
 
@@ -130,8 +138,14 @@ export default function ChatWindow() {
     
     recog.onstart = () => {
       console.log("Speech recognition started");
+      speechClockRef.current = { origin: performance.now(), segmentStart: 0 };
       setIsListening(true);
     };
+
+    recog.onspeechstart = () => {
+      const clock = speechClockRef.current;
+      clock.segmentStart = (performance.now() - clock.origin) / 1000;
+    };
     
     recog.onresult = (e) => {
       console.log("Speech recognition result received");
@@ -141,7 +155,13 @@ export default function ChatWindow() {
         if (e.results[i].isFinal) {
           console.log("Final transcript:", transcript);
           if (transcript.trim()) {
-            handleUserResponse(transcript);
+            // Final results feed the server's live speech stats (fillers, pace, pauses) for this answer
+            const clock = speechClockRef.current;
+            const end = (performance.now() - clock.origin) / 1000;
+            const streamed = socketRef.current?.isOpen()
+              && socketRef.current.sendSpeechChunk(transcript, clock.segmentStart, end);
+            clock.segmentStart = end;
+            handleUserResponse(transcript, { streamed });
           }
         } else {
           interimTranscript += transcript;
@@ -166,7 +186,53 @@ export default function ChatWindow() {
         recognitionRef.current.stop();
       }
     };
-  }, [conversationHistory]);
+  }, [sessionId, isInterviewActive]);
+
+  const showScore = (feedback, score) => {
+    if (feedback) {
+      setMessages(prev => [...prev, { sender: "bot", text: `Feedback: ${feedback}` }]);
+      addMessage("bot", `Feedback: ${feedback}`);
+    }
+    if (score) {
+      setMessages(prev => [...prev, { sender: "bot", text: `Score: ${score}/100` }]);
+      addMessage("bot", `Score: ${score}/100`);
+    }
+  };
+
+  // Deferred scoring over HTTP: poll until the interaction's score is attached
+  const pollScore = async (index, attempt = 0) => {
+    if (attempt >= 20) return;
+    const response = await api.get(`/crew-interview-scores/${sessionId}?since=${index}`);
+    const interaction = response.interactions?.[0];
+    if (interaction && interaction.status !== "pending") {
+      showScore(interaction.feedback, interaction.score);
+      return;
+    }
+    setTimeout(() => pollScore(index, attempt + 1), 1500);
+  };
+
+  // Events pushed over the interview socket (questions and scores arrive separately)
+  const handleSocketEvent = (event) => {
+    if (event.type === "question") {
+      answerSeqRef.current = event.seq;
+      setMessages(prev => [...prev, { sender: "bot", text: event.question }]);
+      addMessage("bot", event.question);
+      speakQuestion(event.question);
+    } else if (event.type === "score") {
+      showScore(event.feedback, event.score);
+    } else if (event.type === "speech_summary") {
+      applySpeechScores(event.clarity_score, event.confidence_score, event.filler_ratio / 100);
+    } else if (event.type === "error") {
+      if (event.expected_seq) answerSeqRef.current = event.expected_seq - 1;
+      const pending = pendingAnswerRef.current;
+      if (event.code === 429 && pending && pending.seq === event.seq) {
+        // Shed by the server's admission control: resend once it has had time to drain
+        setTimeout(() => socketRef.current?.sendAnswer(pending.text, pending.seq), event.retry_after * 1000);
+        return;
+      }
+      console.error("Interview socket:", event.error);
+    }
+  };
 
   const speakQuestion = (text) => {
     setIsSpeaking(true);
@@ -174,18 +240,25 @@ export default function ChatWindow() {
     speak(text, () => setIsSpeaking(false));
   };
 
-  const handleUserResponse = async (text) => {
+  const applySpeechScores = (clarityScore, confidenceScore, fillerRatio) => {
+    setScoreBreakdown(prev => ({
+      ...prev,
+      communication: Math.round((prev.communication + clarityScore) / 2),
+      confidence: Math.round((prev.confidence + confidenceScore) / 2),
+      fillerWords: Math.round((prev.fillerWords + (100 - fillerRatio * 100)) / 2)
+    }));
+  };
+
+  const handleUserResponse = async (text, { streamed = false } = {}) => {
     const cleanText = text.trim();
     if (!cleanText) return;
     setMessages(prev => [...prev, { sender: "user", text: cleanText }]);
     addMessage("user", cleanText);
-    const analysis = analyzeSpeech(cleanText);
-    setScoreBreakdown(prev => ({
-      ...prev,
-      communication: Math.round((prev.communication + analysis.clarityScore) / 2),
-      confidence: Math.round((prev.confidence + analysis.confidenceScore) / 2),
-      fillerWords: Math.round((prev.fillerWords + (100 - analysis.fillerRatio * 100)) / 2)
-    }));
+    // Spoken answers are analyzed server-side and arrive as a speech_summary event
+    if (!streamed) {
+      const analysis = analyzeSpeech(cleanText);
+      applySpeechScores(analysis.clarityScore, analysis.confidenceScore, analysis.fillerRatio);
+    }
     playDoneSound();
     
     // Add acknowledgment message
@@ -206,33 +279,32 @@ export default function ChatWindow() {
     
     setTimeout(async () => {
       try {
-        const response = await api.post("/crew-interview-answer", {
+        // The server keeps the transcript; only the new answer and its sequence number are sent
+        const seq = answerSeqRef.current + 1;
+        if (socketRef.current?.isOpen()) {
+          pendingAnswerRef.current = { text: cleanText, seq };
+          socketRef.current.sendAnswer(cleanText, seq);
+          return;
+        }
+        const response = await api.post("/crew-interview-turn", {
           session_id: sessionId,
-          role: role || "Software Engineer",
-          experience: experience || "2-3",
-          difficulty: difficulty || "Medium",
-          resume_text: resumeText || "",
-          user_message: cleanText,
-          conversation_history: conversationHistory
+          answer: cleanText,
+          seq
         });
+        if (response.detail?.expected_seq) {
+          answerSeqRef.current = response.detail.expected_seq - 1;
+          throw new Error(response.detail.error);
+        }
         if (response.success) {
+          answerSeqRef.current = seq;
           if (!isInterviewActive) return;
-          const updatedHistory = [...conversationHistory, { role: "user", content: cleanText }];
-          if (response.feedback) {
-            setMessages(prev => [...prev, { sender: "bot", text: `Feedback: ${response.feedback}` }]);
-            addMessage("bot", `Feedback: ${response.feedback}`);
-          }
-          if (response.score) {
-            setMessages(prev => [...prev, { sender: "bot", text: `Score: ${response.score}/100` }]);
-            addMessage("bot", `Score: ${response.score}/100`);
-          }
+          showScore(response.feedback, response.score);
           if (response.question) {
-            updatedHistory.push({ role: "interviewer", content: response.question });
-            setConversationHistory(updatedHistory);
             setMessages(prev => [...prev, { sender: "bot", text: response.question }]);
             addMessage("bot", response.question);
             speakQuestion(response.question);
           }
+          if (response.scoring_pending) pollScore(response.interaction_index);
         }
       } catch (err) {
         console.error("Error getting next question:", err);
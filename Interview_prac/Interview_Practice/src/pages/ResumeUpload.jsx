@@ -9,16 +9,43 @@ import pdfWorker from "pdfjs-dist/build/pdf.worker.min.mjs?url";
 pdfjsLib.GlobalWorkerOptions.workerSrc = pdfWorker;
 
 const MAX_FILE_SIZE = 5 * 1024 * 1024;
+const DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document";
 
 export default function ResumeUpload() {
   const navigate = useNavigate();
-  const { setResumeText, setResumeFile } = useInterview();
+  const { setResumeText, setResumeFile, setResumeId } = useInterview();
 
   const [fileName, setFileName] = useState("");
   const [loading, setLoading] = useState(false);
   const [progress, setProgress] = useState(0);
   const [error, setError] = useState("");
 
+  // Server-side extraction: the interview then references the resume by id
+  const uploadResume = async (file) => {
+    setLoading(true);
+    setProgress(30);
+    setError("");
+    const response = await api.upload("/upload-resume", file);
+    if (response.success) {
+      setResumeId(response.resume_id);
+      setResumeText(response.preview);
+      setResumeFile(file);
+      setProgress(100);
+      setLoading(false);
+      setTimeout(() => navigate("/interview"), 1000);
+      return;
+    }
+    setResumeId("");
+    if (file.type === "application/pdf") {
+      // Fall back to reading the PDF in the browser
+      console.warn("Server-side resume extraction failed, reading PDF locally:", response.detail);
+      return extractTextFromPDF(file);
+    }
+    setError(response.detail || "Could not read the resume. Try a PDF or 'Build Resume' instead.");
+    setLoading(false);
+    setProgress(0);
+  };
+
   const extractTextFromPDF = async (file) => {
     setLoading(true);
     setProgress(20);
@@ -126,9 +153,9 @@ export default function ResumeUpload() {
   const handleFile = (file) => {
     if (!file) return;
     if (file.size > MAX_FILE_SIZE) return setError("File too large");
-    if (file.type !== "application/pdf") return setError("Only PDF allowed");
+    if (file.type !== "application/pdf" && file.type !== DOCX_TYPE) return setError("Only PDF or DOCX allowed");
     setFileName(file.name);
-    extractTextFromPDF(file);
+    uploadResume(file);
   };
 
   return (
@@ -148,7 +175,7 @@ export default function ResumeUpload() {
             <h1 className="text-4xl font-bold bg-gradient-to-r from-cyan-400 to-blue-500 bg-clip-text text-transparent mb-2">
               Upload Your Resume
             </h1>
-            <p className="text-cyan-200">PDF file to personalize your interview experience</p>
+            <p className="text-cyan-200">PDF or DOCX file to personalize your interview experience</p>
           </div>
 
           {/* Upload Area */}
@@ -159,14 +186,14 @@ export default function ResumeUpload() {
           >
             <input
               type="file"
-              accept=".pdf"
+              accept=".pdf,.docx"
               onChange={(e) => handleFile(e.target.files?.[0])}
               className="absolute inset-0 opacity-0 cursor-pointer"
             />
             <div className="text-center">
               <div className="text-6xl mb-4">📄</div>
               <p className="text-xl font-bold text-cyan-300 mb-2">
-                {loading ? "Reading PDF..." : "Drop your PDF here"}
+                {loading ? "Reading resume..." : "Drop your resume here"}
               </p>
               <p className="text-cyan-200/70 text-sm">or click to browse</p>
               {fileName && (
@@ -198,7 +225,7 @@ export default function ResumeUpload() {
           {/* Buttons */}
           <div className="flex gap-4 flex-col sm:flex-row">
             <button
-              onClick={() => { setResumeText("No resume"); navigate("/interview"); }}
+              onClick={() => { setResumeText("No resume"); setResumeId(""); navigate("/interview"); }}
               className="flex-1 py-3 border-2 border-cyan-500/50 text-cyan-300 font-bold rounded-xl hover:bg-cyan-500/20 hover:border-cyan-400 transition transform hover:scale-105"
             >
               Skip for Now
@@ -213,7 +240,7 @@ export default function ResumeUpload() {
 
           {/* Info Text */}
           <p className="text-center text-cyan-300/60 text-xs mt-6">
-            Max file size: 5MB • PDF format only
+            Max file size: 5MB • PDF or DOCX
           </p>
         </div>
       </div>
@@ -22,6 +22,7 @@ export const InterviewProvider = ({ children }) => {
   // === Resume Handling ===
   const [resumeFile, setResumeFile] = useState(null);      // File object
   const [resumeText, setResumeText] = useState("");        // Extracted text from PDF
+  const [resumeId, setResumeId] = useState("");            // Server-side extracted resume (content hash)
   const [builtResume, setBuiltResume] = useState("");      // User-built quick resume
 
   // === Interview Chat ===
@@ -58,6 +59,7 @@ export const InterviewProvider = ({ children }) => {
     setDifficulty("");
     setResumeFile(null);
     setResumeText("");
+    setResumeId("");
     setBuiltResume("");
     setChat([]);
     setOverallScore(0);
@@ -77,6 +79,7 @@ export const InterviewProvider = ({ children }) => {
     // Resume
     resumeFile, setResumeFile,
     resumeText, setResumeText,
+    resumeId, setResumeId,
     builtResume, setBuiltResume,
 
     // Chat
@@ -1,8 +1,33 @@
-﻿from crewai import Agent, Task
+﻿from crewai import Agent, Task, LLM
 import os
 
 GROQ_API_KEY = os.getenv('GROQ_API_KEY_4')
 
+# Chunk summaries are optional (the report falls back to scores), so their LLM
+# request is cut off after this many seconds and not retried
+CHUNK_SUMMARY_LLM_TIMEOUT = float(os.getenv("CHUNK_SUMMARY_LLM_TIMEOUT", "30"))
+
+# Per-answer text kept in prompts; long answers are cut to keep chunk prompts small
+DIGEST_QUESTION_CHARS = 200
+DIGEST_ANSWER_CHARS = 500
+
+
+def block_digest(index, block):
+    """Compact prompt text for one interaction block"""
+    scores = block.get("scores") or {}
+    question = (block.get("question") or "").strip()[:DIGEST_QUESTION_CHARS]
+    answer = (block.get("answer") or "").strip()[:DIGEST_ANSWER_CHARS]
+    topic = f" [{block['topic']}]" if block.get("topic") else ""
+    return (
+        f"Q{index + 1}{topic} score {scores.get('final_score', block.get('score', 0))}/100 "
+        f"(domain {scores.get('domain_knowledge', 0)}, communication {scores.get('communication', 0)}, "
+        f"confidence {scores.get('confidence', 0)}, depth {scores.get('depth', 0)})\n"
+        f"  Question: {question}\n"
+        f"  Answer: {answer}\n"
+        f"  Feedback: {(block.get('feedback') or '').strip()}"
+    )
+
+
 class FeedbackAgent:
     def __init__(self):
         self.agent = Agent(
@@ -13,10 +38,79 @@ class FeedbackAgent:
             allow_delegation=False,
             llm='groq/llama-3.1-8b-instant'
         )
+        # Same persona for the map step, with a bounded single-attempt request
+        self.chunk_agent = Agent(
+            role='Interview Report Generator',
+            goal='Generate comprehensive final interview reports',
+            backstory='Expert at synthesizing interview data',
+            verbose=True,
+            allow_delegation=False,
+            max_retry_limit=0,
+            llm=LLM(model='groq/llama-3.1-8b-instant', timeout=CHUNK_SUMMARY_LLM_TIMEOUT, max_retries=0)
+        )
     
-    def create_report_task(self, role, experience, difficulty, interaction_blocks, topics_covered, average_score):
+    def create_chunk_summary_task(self, role, difficulty, blocks, first_index):
+        """Map step: summarize one consecutive chunk of interaction blocks"""
+        digests = "\n\n".join(block_digest(first_index + i, block) for i, block in enumerate(blocks))
+        last = first_index + len(blocks)
+        
         task = Task(
-            description=f'Generate final interview report for {role} role',
+            description=f"""Summarize questions {first_index + 1}-{last} of a {difficulty} {role} interview.
+
+{digests}
+
+Return ONLY a JSON object with keys:
+"summary" (2-3 sentences on how the candidate did in this part),
+"strengths" (list, at most 3), "weaknesses" (list, at most 3),
+"notable" (list of at most 2 specific answers worth mentioning, cite them as Q<number>).""",
+            expected_output='JSON with a summary of this part of the interview',
+            agent=self.chunk_agent
+        )
+        return task
+    
+    def create_report_task(self, role, experience, difficulty, interaction_blocks, topics_covered, average_score,
+                           aggregates=None, chunk_summaries=None):
+        """Reduce step: create the final report task from score aggregates and chunk summaries
+        
+        Short interviews pass no `chunk_summaries`; their blocks are digested directly.
+        """
+        aggregates = aggregates or {}
+        dimension_lines = "\n".join(
+            f"- {dim}: mean {stats['mean']}, min {stats['min']}, max {stats['max']}, "
+            f"trend {stats['trend']:+} per answer"
+            for dim, stats in aggregates.get("dimensions", {}).items()
+        ) or "- No scored answers"
+        topic_lines = "\n".join(
+            f"- {topic}: {stats['count']} answers, mean final score {stats['final_score']}"
+            for topic, stats in aggregates.get("topics", {}).items()
+        ) or "- None"
+        if chunk_summaries:
+            evidence = "INTERVIEW SECTION SUMMARIES (in order):\n" + "\n".join(
+                f"- {summary}" for summary in chunk_summaries)
+        else:
+            evidence = "ANSWERS:\n" + ("\n\n".join(
+                block_digest(i, block) for i, block in enumerate(interaction_blocks)) or "- None")
+        
+        task = Task(
+            description=f"""Generate the final interview report for a {role} candidate.
+
+EXPERIENCE LEVEL: {experience}
+DIFFICULTY: {difficulty}
+ANSWERS SCORED: {aggregates.get("count", len(interaction_blocks))}
+AVERAGE SCORE: {average_score:.1f}/100
+TOPICS COVERED: {", ".join(topics_covered) if topics_covered else "None"}
+
+SCORES BY DIMENSION (0-100; trend is the change per answer over the interview):
+{dimension_lines}
+
+SCORES BY QUESTION TYPE (introduction, follow-up, harder follow-up, new question):
+{topic_lines}
+
+{evidence}
+
+Base every statement on these numbers. Return ONLY a JSON object with keys:
+"overall_assessment", "strengths" (list), "weak_areas" (list), "communication_analysis",
+"technical_depth", "recommendations" (list), "hire_verdict", "confidence_level", "final_score".""",
             expected_output='JSON with interview report',
             agent=self.agent
         )
@@ -7,13 +7,40 @@ import json
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY_2")
 
-# Set API key for litellm
-os.environ['GROQ_API_KEY'] = GROQ_API_KEY
+# Identical for every evaluation, so it leads the prompt (prefix prompt caching)
+EVALUATION_RULES = """Evaluate an interview answer and decide on follow-up strategy.
+
+EVALUATE:
+1. Answer Quality (0-100 confidence score)
+2. Completeness (is it thorough or vague?)
+3. Technical Accuracy (is it correct?)
+4. Relevance to resume (if resume provided, does answer relate to their background?)
+
+DECIDE:
+- If confidence < 30%: Answer is vague/wrong → "different_question"
+- If confidence 30-70%: Answer is partial or needs clarification → "followup"
+- If confidence > 70%: Answer is good → "hard_followup"
+
+FOLLOW-UP STRATEGY:
+- For "followup": Ask clarifying questions about the same topic
+- For "hard_followup": Ask deeper/more challenging questions about the same topic
+- For "different_question": Move to a completely different topic
+- If a resume is provided and the answer relates to items in it, ask follow-up questions about those specific experiences
+
+Return JSON format:
+{
+    "confidence": 0-100,
+    "decision": "followup" or "hard_followup" or "different_question",
+    "reasoning": "Why you made this decision"
+}"""
 
 class FollowUpAgent:
     """CrewAI Agent that evaluates answers and decides on follow-up strategy"""
     
     def __init__(self):
+        # Set API key for litellm (here rather than at import, so importing the module has no side effects)
+        if GROQ_API_KEY:
+            os.environ['GROQ_API_KEY'] = GROQ_API_KEY
         self.agent = Agent(
             role="Answer Evaluator",
             goal="Evaluate candidate answers and decide whether to ask follow-ups, harder questions, or move to new topics",
@@ -28,8 +55,9 @@ class FollowUpAgent:
         )
     
     def create_evaluation_task(self, current_question: str, user_answer: str, 
-                              role: str, experience: str, asked_questions: list, resume_text: str = "") -> Task:
-        """Create a task to evaluate the answer"""
+                              role: str, experience: str, asked_questions: list, resume_text: str = "",
+                              resume_digest: str = None) -> Task:
+        """Create a task to evaluate the answer; with `resume_digest` the full resume is not sent"""
         
         asked_questions_str = "\n".join([f"- {q}" for q in asked_questions[-5:]]) if asked_questions else "None yet"
         
@@ -42,47 +70,33 @@ class FollowUpAgent:
         )
         
         resume_context = ""
-        if is_valid_resume:
+        if is_valid_resume and resume_digest:
+            resume_context = f"""
+CANDIDATE'S RESUME (summary):
+{resume_digest}
+"""
+        elif is_valid_resume:
             resume_context = f"""
 CANDIDATE'S RESUME:
 {resume_text}
-
-IMPORTANT: If the answer relates to items in their resume, ask follow-up questions about those specific experiences."""
+"""
         
+        # Static rubric first, then the session's context, then this turn's question and answer
         task = Task(
-            description=f"""Evaluate this interview answer and decide on follow-up strategy.
-
-QUESTION ASKED: {current_question}
-
-CANDIDATE ANSWER: {user_answer}
+            description=f"""{EVALUATION_RULES}
 
 CONTEXT:
 - Role: {role}
 - Experience: {experience}
-- Previously Asked Questions: {asked_questions_str}{resume_context}
-
-EVALUATE:
-1. Answer Quality (0-100 confidence score)
-2. Completeness (is it thorough or vague?)
-3. Technical Accuracy (is it correct?)
-4. Relevance to resume (if resume provided, does answer relate to their background?)
+{resume_context}
+PREVIOUSLY ASKED QUESTIONS:
+{asked_questions_str}
 
-DECIDE:
-- If confidence < 30%: Answer is vague/wrong → "different_question"
-- If confidence 30-70%: Answer is partial or needs clarification → "followup"
-- If confidence > 70%: Answer is good → "hard_followup"
+QUESTION ASKED: {current_question}
 
-FOLLOW-UP STRATEGY:
-- For "followup": Ask clarifying questions about the same topic
-- For "hard_followup": Ask deeper/more challenging questions about the same topic
-- For "different_question": Move to a completely different topic
+CANDIDATE ANSWER: {user_answer}
 
-Return JSON format:
-{{
-    "confidence": 0-100,
-    "decision": "followup" or "hard_followup" or "different_question",
-    "reasoning": "Why you made this decision"
-}}""",
+Evaluate this answer now:""",
             expected_output="JSON with confidence, decision, and reasoning",
             agent=self.agent
         )
@@ -7,9 +7,45 @@ from .followup_agent import FollowUpAgent
 from .scoring_agent import ScoringAgent
 from .feedback_agent import FeedbackAgent
 from memory.session_memory import session_manager
-from utils.pdf_generator import PDFReportGenerator
+from memory.analytics_store import analytics_store
+from memory.percentile_index import percentile_index
+from utils.report_cache import report_filename
+from utils.report_service import report_service
+from utils.local_scorer import local_scorer, compute_final_score, SCORE_DIMENSIONS
+from utils.skill_taxonomy import skill_extractor, has_profile, profile_digest
+from utils.question_bank import rank_topics, select_questions, role_questions
+from memory.resume_artifacts import resume_artifacts, OPENING_QUESTIONS
+from utils.audio_analysis import blend_audio_scores
+from utils.interview_channel import channel_registry
+from utils.llm_scheduler import llm_scheduler, NEXT_QUESTION, SCORING, REPORT
+from memory.token_ledger import token_ledger, DIGEST, ECONOMY
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from typing import Dict
+import contextvars
 import json
 import os
+import threading
+import time
+
+# Skip the ScoringAgent for empty answers and exact non-answers (opt-in with LOCAL_SCORING_GATE=1)
+LOCAL_SCORING_GATE = os.getenv("LOCAL_SCORING_GATE", "0") == "1"
+
+# Return the next question without waiting for the ScoringAgent; scores are
+# attached to the interaction block later and pushed / polled
+DEFERRED_SCORING = os.getenv("DEFERRED_SCORING", "0") == "1"
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "4"))
+SCORING_WAIT_TIMEOUT = float(os.getenv("SCORING_WAIT_TIMEOUT", "60"))
+
+# Final reports are map-reduced: interviews longer than REPORT_CHUNK_SIZE answers
+# are summarized in chunks concurrently (at most REPORT_MAP_WORKERS LLM calls at
+# once across all sessions), then the FeedbackAgent reduces the chunk summaries
+REPORT_CHUNK_SIZE = int(os.getenv("REPORT_CHUNK_SIZE", "6"))
+REPORT_MAP_WORKERS = int(os.getenv("REPORT_MAP_WORKERS", "4"))
+REPORT_MAP_TIMEOUT = float(os.getenv("REPORT_MAP_TIMEOUT", "45"))
+
+# Candidates without a resume who start the same role and difficulty at the same
+# moment share one opening-question call; set to 1 to give each their own sample
+DIVERSE_OPENING_QUESTIONS = os.getenv("DIVERSE_OPENING_QUESTIONS", "0") == "1"
 
 class InterviewCrew:
     """Orchestrates the interview crew of agents"""
@@ -19,6 +55,10 @@ class InterviewCrew:
         self.followup = FollowUpAgent()
         self.scoring = ScoringAgent()
         self.feedback = FeedbackAgent()
+        self._scoring_pool = ThreadPoolExecutor(max_workers=SCORING_WORKERS, thread_name_prefix="scoring")
+        self._pending_scores: Dict[str, Dict[int, Future]] = {}
+        self._pending_lock = threading.Lock()
+        self._report_pool = ThreadPoolExecutor(max_workers=REPORT_MAP_WORKERS, thread_name_prefix="report-map")
     
     def start_interview(self, session_id: str, role: str, experience: str, 
                        difficulty: str, resume_text: str) -> str:
@@ -37,36 +77,110 @@ class InterviewCrew:
         # Create session
         session_manager.create_session(session_id, role, experience, difficulty, resume_text)
         
-        # Create crew for initial question
+        # A repeat interview with the same resume and role starts from cached artifacts
+        has_resume = bool(resume_text and resume_text.strip() and resume_text.strip() != "No resume"
+                          and len(resume_text.strip()) > 50)
+        artifacts = resume_artifacts.take_opening(resume_text, role) if has_resume else None
+        if artifacts:
+            print("⚡ Opening question from the resume artifact cache - no LLM call")
+            question = artifacts["opening_question"]
+            profile, topics = artifacts["profile"], artifacts["topics"]
+        else:
+            profile = skill_extractor.profile(resume_text)
+            topics = rank_topics(profile, role)
+            if has_resume and has_profile(profile):
+                openings = self._opening_questions(session_id, role, experience, difficulty, resume_text, profile, topics)
+                question = openings[0]
+                resume_artifacts.store(resume_text, role, profile, topics, openings)
+            else:
+                crew = Crew(
+                    agents=[self.interviewer.agent],
+                    tasks=[
+                        self.interviewer.create_question_task(
+                            role=role,
+                            experience=experience,
+                            difficulty=difficulty,
+                            resume_text=resume_text,
+                            asked_questions=[],
+                            topics_covered=[],
+                            resume_profile=profile
+                        )
+                    ],
+                    verbose=True
+                )
+                
+                # Get first question
+                result = llm_scheduler.kickoff(crew, NEXT_QUESTION, coalesce=not DIVERSE_OPENING_QUESTIONS,
+                                               session_id=session_id)
+                question = str(result).strip()
+        session_manager.set_resume_artifacts(session_id, profile, topics)
+        
+        # Track the question and topic
+        session_manager.add_asked_question(session_id, question, "introduction", 1)
+        session_manager.add_topic_covered(session_id, "introduction")
+        session_manager.append_transcript(session_id, "interviewer", question)
+        
+        print(f"\n❓ FIRST QUESTION:\n{question}\n")
+        return question
+    
+    def _opening_questions(self, session_id: str, role: str, experience: str, difficulty: str, resume_text: str,
+                           profile: dict, topics: list) -> list:
+        """Several opening questions from one InterviewerAgent call, topped up from the question bank"""
         crew = Crew(
             agents=[self.interviewer.agent],
             tasks=[
-                self.interviewer.create_question_task(
+                self.interviewer.create_opening_questions_task(
                     role=role,
                     experience=experience,
                     difficulty=difficulty,
                     resume_text=resume_text,
-                    asked_questions=[],
-                    topics_covered=[]
+                    resume_profile=profile,
+                    resume_topics=topics,
+                    count=OPENING_QUESTIONS
                 )
             ],
             verbose=True
         )
-        
-        # Get first question
-        result = crew.kickoff()
-        question = str(result).strip()
-        
-        # Track the question and topic
-        session_manager.add_asked_question(session_id, question, "introduction", 1)
-        session_manager.add_topic_covered(session_id, "introduction")
-        
-        print(f"\n❓ FIRST QUESTION:\n{question}\n")
-        return question
+        text = str(llm_scheduler.kickoff(crew, NEXT_QUESTION, session_id=session_id)).strip()
+        try:
+            questions = json.loads(text[text.index("["):text.rindex("]") + 1])
+            openings = [q.strip() for q in questions if isinstance(q, str) and q.strip()]
+        except ValueError:
+            openings = [text] if text else []
+        for seed in select_questions(profile, role, openings, limit=OPENING_QUESTIONS, topics=topics):
+            if len(openings) >= OPENING_QUESTIONS:
+                break
+            if seed not in openings:
+                openings.append(seed)
+        return openings[:OPENING_QUESTIONS]
     
-    def process_answer(self, session_id: str, user_answer: str, role: str, 
-                      experience: str, difficulty: str, resume_text: str,
-                      conversation_history: list) -> dict:
+    def answer_turn(self, session_id: str, user_answer: str, seq: int) -> dict:
+        """Process an answer sent as a delta (session id, answer, seq)
+        
+        Everything else comes from session memory. A retried seq returns the
+        stored response without re-running the agents; any other unexpected
+        seq raises AnswerSequenceError.
+        """
+        lock = session_manager.turn_lock(session_id)
+        if lock is None:
+            return {"success": False, "error": "Session not found"}
+        with lock:
+            if session_manager.get_session(session_id) is None:
+                return {"success": False, "error": "Session not found"}
+            previous = session_manager.check_answer_seq(session_id, seq)
+            if previous is not None:
+                print(f"↩️  Answer seq {seq} already processed - returning stored response")
+                return previous
+            result = self.process_answer(session_id, user_answer, seq=seq)
+            if result.get("success"):
+                result["seq"] = seq
+                result["transcript_length"] = len(session_manager.get_transcript(session_id))
+                session_manager.record_answer_turn(session_id, seq, result)
+            return result
+    
+    def process_answer(self, session_id: str, user_answer: str, role: str = None,
+                      experience: str = None, difficulty: str = None, resume_text: str = None,
+                      conversation_history: list = None, seq: int = None) -> dict:
         
         print(f"\n📝 PROCESS_ANSWER called with session_id: {session_id}")
         session = session_manager.get_session(session_id)
@@ -76,134 +190,146 @@ class InterviewCrew:
         
         print(f"✅ Session found, current interactions: {session.get('total_interactions', 0)}")
         
+        # Session memory is authoritative; request fields only fill gaps
+        role = session["role"] or role
+        experience = session["experience"] or experience
+        difficulty = session["difficulty"] or difficulty
+        resume_text = session["resume_text"] or resume_text or ""
+        
         # Get current question
-        current_question = ""
-        if conversation_history:
+        current_question = session_manager.get_current_question(session_id)
+        current_topic = session_manager.get_current_question_topic(session_id)
+        if not current_question and conversation_history:
             for msg in reversed(conversation_history):
                 if msg.get("role") == "interviewer":
                     current_question = msg.get("content", "")
                     break
         
+        # In deferred mode scoring starts now, in parallel with the follow-up and next-question calls.
+        # The interaction is only stored once the next question exists, so a turn that fails leaves
+        # nothing behind for its retry to duplicate
+        scoring = None
+        if DEFERRED_SCORING:
+            # The copied context keeps the scoring call attributed to the endpoint that triggered it
+            scoring = self._scoring_pool.submit(contextvars.copy_context().run, self._score_in_background,
+                                                session_id, role, experience, current_question, user_answer,
+                                                resume_text)
+        
         asked_questions = session_manager.get_asked_questions_list(session_id)
+        resume_profile, resume_topics = session_manager.get_resume_artifacts(session_id)
+        if resume_profile is None:
+            resume_profile = skill_extractor.profile(resume_text)
         topics_covered = session_manager.get_topics_covered(session_id)
         
-        # Step 1: Follow-Up Agent evaluates
-        print("\n🔍 EVALUATING ANSWER...")
-        followup_crew = Crew(
-            agents=[self.followup.agent],
-            tasks=[
-                self.followup.create_evaluation_task(
-                    current_question=current_question,
-                    user_answer=user_answer,
-                    role=role,
-                    experience=experience,
-                    asked_questions=asked_questions,
-                    resume_text=resume_text
-                )
-            ],
-            verbose=True
-        )
-        
-        followup_result = followup_crew.kickoff()
-        followup_text = str(followup_result).strip()
-        
-        # Parse followup decision
-        try:
-            # Extract JSON from response
-            if "{" in followup_text and "}" in followup_text:
-                start = followup_text.index("{")
-                end = followup_text.rindex("}") + 1
-                followup_decision = json.loads(followup_text[start:end])
-            else:
+        budget_mode = token_ledger.budget_mode(session_id)
+        if budget_mode == ECONOMY:
+            # The session has spent its token budget: no follow-up evaluation, next question from the bank
+            print("💰 Session token budget spent - next question from the question bank")
+            followup_decision = {
+                "confidence": 0,
+                "decision": "different_question",
+                "reasoning": "Session token budget reached"
+            }
+            next_question = self._bank_question(role, resume_profile, resume_topics, asked_questions)
+        else:
+            # Step 1: Follow-Up Agent evaluates
+            print("\n🔍 EVALUATING ANSWER...")
+            followup_crew = Crew(
+                agents=[self.followup.agent],
+                tasks=[
+                    self.followup.create_evaluation_task(
+                        current_question=current_question,
+                        user_answer=user_answer,
+                        role=role,
+                        experience=experience,
+                        asked_questions=asked_questions,
+                        resume_text=resume_text,
+                        # Past part of the token budget the evaluator gets the resume digest instead
+                        # (only when the taxonomy found something to summarize)
+                        resume_digest=profile_digest(resume_profile)
+                        if budget_mode == DIGEST and has_profile(resume_profile) else None
+                    )
+                ],
+                verbose=True
+            )
+        
+            followup_result = llm_scheduler.kickoff(followup_crew, NEXT_QUESTION, session_id=session_id)
+            followup_text = str(followup_result).strip()
+        
+            # Parse followup decision
+            try:
+                # Extract JSON from response
+                if "{" in followup_text and "}" in followup_text:
+                    start = followup_text.index("{")
+                    end = followup_text.rindex("}") + 1
+                    followup_decision = json.loads(followup_text[start:end])
+                else:
+                    followup_decision = {
+                        "confidence": 50,
+                        "decision": "followup",
+                        "reasoning": "Could not parse response"
+                    }
+            except:
                 followup_decision = {
                     "confidence": 50,
                     "decision": "followup",
-                    "reasoning": "Could not parse response"
+                    "reasoning": "Error parsing response"
                 }
-        except:
-            followup_decision = {
-                "confidence": 50,
-                "decision": "followup",
-                "reasoning": "Error parsing response"
-            }
                 
-        next_question_crew = Crew(
-            agents=[self.interviewer.agent],
-            tasks=[
-                self.interviewer.create_question_task(
-                    role=role,
-                    experience=experience,
-                    difficulty=difficulty,
-                    resume_text=resume_text,
-                    asked_questions=asked_questions,
-                    topics_covered=topics_covered
-                )
-            ],
-            verbose=True
-        )
-        
-        next_question_result = next_question_crew.kickoff()
-        next_question = str(next_question_result).strip()
+            next_question_crew = Crew(
+                agents=[self.interviewer.agent],
+                tasks=[
+                    self.interviewer.create_question_task(
+                        role=role,
+                        experience=experience,
+                        difficulty=difficulty,
+                        resume_text=resume_text,
+                        asked_questions=asked_questions,
+                        topics_covered=topics_covered,
+                        resume_profile=resume_profile,
+                        resume_topics=resume_topics,
+                        # The opening prompt carried the full resume; later turns send its profile
+                        full_resume=False
+                    )
+                ],
+                verbose=True
+            )
+        
+            next_question_result = llm_scheduler.kickoff(next_question_crew, NEXT_QUESTION, session_id=session_id)
+            next_question = str(next_question_result).strip()
         
         # Track the question and topic
         topic = followup_decision.get("decision", "followup")
         session_manager.add_asked_question(session_id, next_question, topic, session["question_count"] + 1)
         session_manager.add_topic_covered(session_id, topic)
-        
-        # Step 3: Scoring Agent scores the interaction
-        scoring_crew = Crew(
-            agents=[self.scoring.agent],
-            tasks=[
-                self.scoring.create_scoring_task(
-                    role=role,
-                    experience=experience,
-                    main_question=current_question,
-                    answers=[user_answer]
-                )
-            ],
-            verbose=True
-        )
-        
-        scoring_result = scoring_crew.kickoff()
-        scoring_text = str(scoring_result).strip()
-        
-        # Parse scores
-        scores = None
-        try:
-            if "{" in scoring_text and "}" in scoring_text:
-                start = scoring_text.index("{")
-                end = scoring_text.rindex("}") + 1
-                json_str = scoring_text[start:end]
-                scores = json.loads(json_str)
-        except Exception as e:
-            print(f"❌ JSON parsing error: {e}")
-            print(f"Raw scoring text: {scoring_text[:200]}")
-        
-        # Fallback if parsing failed
-        if not scores or not isinstance(scores, dict):
-            # Extract feedback from raw text if JSON parsing failed
-            feedback_text = scoring_text[:300] if scoring_text else "Unable to generate feedback"
-            scores = {
-                "domain_knowledge": 75,
-                "communication": 75,
-                "confidence": 75,
-                "depth": 75,
-                "final_score": 75,
-                "feedback": feedback_text
+        session_manager.append_transcript(session_id, "user", user_answer)
+        session_manager.append_transcript(session_id, "interviewer", next_question)
+        
+        if scoring is not None:
+            pending_index = self._store_deferred(session_id, seq, current_question, user_answer,
+                                                 current_topic, scoring)
+            return {
+                "success": True,
+                "question": next_question,
+                "scoring_pending": True,
+                "interaction_index": pending_index,
+                "is_followup": followup_decision.get("decision") == "followup",
+                "confidence": followup_decision.get("confidence", 0),
+                "session_id": session_id
             }
         
-        # Ensure all required fields exist
-        scores.setdefault("domain_knowledge", 70)
-        scores.setdefault("communication", 70)
-        scores.setdefault("confidence", 70)
-        scores.setdefault("depth", 70)
-        scores.setdefault("final_score", 70)
-        scores.setdefault("feedback", "Feedback generated")
+        # Step 3: Scoring Agent scores the interaction
+        scores = self._score_answer(session_id, role, experience, current_question, user_answer, resume_text)
         
+        # Fold in pace/pause analysis if the client uploaded audio for this answer
+        audio_metrics = session_manager.pop_audio_metrics(session_id)
+        if audio_metrics:
+            scores = blend_audio_scores(scores, audio_metrics)
         
         # Store interaction block
         interaction_block = {
             "question": current_question,
+            "topic": current_topic,
             "answer": user_answer,
             "feedback": scores.get("feedback", ""),
             "score": scores.get("final_score", 0),
@@ -222,10 +348,250 @@ class InterviewCrew:
             "session_id": session_id
         }
     
+    def _store_deferred(self, session_id: str, seq: int, question: str, answer: str, topic: str,
+                        scoring: Future) -> int:
+        """Store the interaction unscored; its scores are attached when `scoring` finishes. Returns the block index"""
+        audio_metrics = session_manager.pop_audio_metrics(session_id)
+        index = session_manager.add_interaction_block(session_id, {
+            "question": question,
+            "topic": topic,
+            "answer": answer,
+            "feedback": "",
+            "score": None,
+            "scores": None,
+            "scoring": "pending"
+        })
+        # wait_for_scores waits on this one: it completes only once the scores are attached
+        delivered = Future()
+        with self._pending_lock:
+            self._pending_scores.setdefault(session_id, {})[index] = delivered
+        
+        def deliver(future: Future):
+            scores = future.result()
+            if audio_metrics:
+                scores = blend_audio_scores(scores, audio_metrics)
+            try:
+                self._deliver_scores(session_id, index, seq, scores)
+            finally:
+                self._forget_pending(session_id, index)
+                delivered.set_result(scores)
+        
+        # Runs right away if scoring already finished while the next question was generated
+        scoring.add_done_callback(deliver)
+        return index
+    
+    def _forget_pending(self, session_id: str, index: int):
+        with self._pending_lock:
+            pending = self._pending_scores.get(session_id)
+            if pending is not None:
+                pending.pop(index, None)
+                if not pending:
+                    del self._pending_scores[session_id]
+    
+    def _score_in_background(self, session_id: str, role: str, experience: str, question: str, answer: str,
+                             resume_text: str) -> dict:
+        """Score on the scoring pool; never raises, so the stored block always gets scores"""
+        try:
+            return self._score_answer(session_id, role, experience, question, answer, resume_text)
+        except Exception as e:
+            print(f"❌ Deferred scoring error: {e}")
+            scores = local_scorer.score(question, answer, resume_text)
+            scores["source"] = "local_fallback"
+            return scores
+    
+    def _deliver_scores(self, session_id: str, index: int, seq: int, scores: dict):
+        """Attach scores to the stored block and push them to open interview sockets"""
+        block = session_manager.attach_scores(session_id, index, scores)
+        if block is None:
+            return
+        print(f"✅ Deferred score attached to interaction {index}: {block['score']}")
+        channel_registry.publish(session_id, {
+            "type": "score",
+            "seq": seq,
+            "interaction_index": index,
+            "score": block["score"],
+            "feedback": block["feedback"]
+        })
+    
+    def wait_for_scores(self, session_id: str, timeout: float = SCORING_WAIT_TIMEOUT):
+        """Block until every deferred score of a session is attached
+        
+        Scores still missing after `timeout` are filled in by the local scorer,
+        so a report never has unscored interactions.
+        """
+        with self._pending_lock:
+            pending = dict(self._pending_scores.get(session_id, {}))
+        if pending:
+            print(f"⏳ Waiting for {len(pending)} deferred score(s)...")
+            wait(list(pending.values()), timeout=timeout)
+        session = session_manager.get_session(session_id) or {}
+        for index, block in enumerate(session_manager.get_interaction_blocks(session_id)):
+            if block.get("scoring") == "pending":
+                print(f"⚠️  Interaction {index} still unscored - using local scorer")
+                scores = local_scorer.score(block["question"], block["answer"], session.get("resume_text") or "")
+                scores["source"] = "local_fallback"
+                self._deliver_scores(session_id, index, None, scores)
+    
+    def _score_answer(self, session_id: str, role: str, experience: str, question: str,
+                      answer: str, resume_text: str) -> dict:
+        """Score an answer with the ScoringAgent, falling back to the local scorer"""
+        
+        # Empty answers and explicit non-answers do not need an LLM to be judged
+        if LOCAL_SCORING_GATE and local_scorer.is_trivial(answer):
+            print("⚡ Non-answer - scored locally, ScoringAgent skipped")
+            scores = local_scorer.score(question, answer, resume_text)
+            scores["source"] = "local"
+            return scores
+        
+        if token_ledger.budget_mode(session_id) == ECONOMY:
+            print("💰 Session token budget spent - scored locally, ScoringAgent skipped")
+            scores = local_scorer.score(question, answer, resume_text)
+            scores["source"] = "local_budget"
+            return scores
+        
+        scoring_text = ""
+        scores = None
+        try:
+            scoring_crew = Crew(
+                agents=[self.scoring.agent],
+                tasks=[
+                    self.scoring.create_scoring_task(
+                        role=role,
+                        experience=experience,
+                        main_question=question,
+                        answers=[answer]
+                    )
+                ],
+                verbose=True
+            )
+            
+            scoring_result = llm_scheduler.kickoff(scoring_crew, SCORING, session_id=session_id)
+            scoring_text = str(scoring_result).strip()
+            
+            if "{" in scoring_text and "}" in scoring_text:
+                start = scoring_text.index("{")
+                end = scoring_text.rindex("}") + 1
+                scores = json.loads(scoring_text[start:end])
+        except Exception as e:
+            print(f"❌ Scoring error: {e}")
+            print(f"Raw scoring text: {scoring_text[:200]}")
+        
+        # Fallback if the LLM failed or returned something unusable
+        if not scores or not isinstance(scores, dict):
+            print("⚠️  Falling back to local scorer")
+            scores = local_scorer.score(question, answer, resume_text)
+            scores["source"] = "local_fallback"
+            return scores
+        
+        # Fill any missing dimension from the local scorer, and never trust
+        # the model's arithmetic for the weighted average
+        local_scores = None
+        for dim in SCORE_DIMENSIONS:
+            try:
+                scores[dim] = max(0, min(100, int(round(float(scores[dim])))))
+            except (KeyError, TypeError, ValueError):
+                local_scores = local_scores or local_scorer.score(question, answer, resume_text)
+                scores[dim] = local_scores[dim]
+        scores["final_score"] = compute_final_score(scores)
+        scores.setdefault("feedback", "Feedback generated")
+        scores["source"] = "llm"
+        return scores
+    
+    def _summarize_chunks(self, session_summary: dict) -> list:
+        """Map step of the final report: one summary per chunk of interaction blocks
+        
+        Returns an empty list for interviews short enough to report on in one
+        prompt. Chunks are sized so a session needs at most REPORT_MAP_WORKERS
+        of them, all summarized at once, keeping report latency roughly flat as
+        interviews grow. A chunk whose summary fails or times out falls back to
+        a score-only summary. A chunk still queued for an LLM slot at the
+        deadline gives up, and the request itself is bounded by the chunk
+        agent's LLM timeout, so a timed-out chunk frees its report-map worker
+        soon after instead of holding it (future.cancel() cannot stop it).
+        """
+        blocks = session_summary.get("interaction_blocks", [])
+        if len(blocks) <= REPORT_CHUNK_SIZE:
+            return []
+        chunk_size = max(REPORT_CHUNK_SIZE, -(-len(blocks) // REPORT_MAP_WORKERS))
+        starts = range(0, len(blocks), chunk_size)
+        if session_summary.get("budget_mode") == ECONOMY:
+            print("💰 Session token budget spent - score-only chunk summaries")
+            return [self._score_only_summary(blocks[start:start + chunk_size], start) for start in starts]
+        print(f"🗂️  Summarizing {len(blocks)} interactions in {len(starts)} chunks...")
+        deadline = time.monotonic() + REPORT_MAP_TIMEOUT
+        futures = [
+            self._report_pool.submit(contextvars.copy_context().run, self._summarize_chunk,
+                                     session_summary["session_id"], session_summary["role"],
+                                     session_summary["difficulty"], blocks[start:start + chunk_size], start, deadline)
+            for start in starts
+        ]
+        wait(futures, timeout=REPORT_MAP_TIMEOUT)
+        summaries = []
+        for start, future in zip(starts, futures):
+            chunk = blocks[start:start + chunk_size]
+            summary = None
+            if future.done() and future.exception() is None:
+                summary = future.result()
+            else:
+                future.cancel()
+                print(f"⚠️  Chunk summary for Q{start + 1}-{start + len(chunk)} unavailable - using scores only")
+            summaries.append(summary or self._score_only_summary(chunk, start))
+        return summaries
+    
+    def _summarize_chunk(self, session_id: str, role: str, difficulty: str, blocks: list, start: int,
+                         deadline: float) -> str:
+        """Summarize one chunk with the FeedbackAgent; returns one line of prompt text
+        
+        Returns None without calling the LLM once `deadline` (time.monotonic())
+        has passed, e.g. when the chunk sat in the report-map pool's queue.
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        summary_crew = Crew(
+            agents=[self.feedback.chunk_agent],
+            tasks=[self.feedback.create_chunk_summary_task(role, difficulty, blocks, start)],
+            verbose=True
+        )
+        summary_text = str(llm_scheduler.kickoff(summary_crew, REPORT, session_id=session_id,
+                                                 timeout=remaining)).strip()
+        label = f"Q{start + 1}-{start + len(blocks)}"
+        try:
+            summary = json.loads(summary_text[summary_text.index("{"):summary_text.rindex("}") + 1])
+        except ValueError:
+            return f"{label}: {summary_text[:600]}" if summary_text else None
+        parts = [f"{label}: {summary.get('summary', '')}".strip()]
+        for key, title in (("strengths", "Strengths"), ("weaknesses", "Weaknesses"), ("notable", "Notable")):
+            if summary.get(key):
+                items = summary[key] if isinstance(summary[key], list) else [summary[key]]
+                parts.append(f"{title}: " + "; ".join(str(item) for item in items))
+        return " ".join(parts)
+    
+    def _bank_question(self, role: str, resume_profile: dict, resume_topics: list, asked_questions: list) -> str:
+        """Next question from the local question bank, grounded in the resume when there is one"""
+        seeds = select_questions(resume_profile, role, asked_questions, limit=1, topics=resume_topics)
+        if seeds:
+            return seeds[0]
+        bank = role_questions(role)
+        return bank[len(asked_questions) % len(bank)]
+    
+    def _score_only_summary(self, blocks: list, start: int) -> str:
+        scored = [(start + i, block["scores"]["final_score"]) for i, block in enumerate(blocks)
+                  if isinstance(block.get("scores"), dict)]
+        label = f"Q{start + 1}-{start + len(blocks)}"
+        if not scored:
+            return f"{label}: no scored answers."
+        best = max(scored, key=lambda item: item[1])
+        worst = min(scored, key=lambda item: item[1])
+        average = sum(score for _, score in scored) / len(scored)
+        return (f"{label}: average score {average:.1f}/100, strongest answer Q{best[0] + 1} ({best[1]}), "
+                f"weakest answer Q{worst[0] + 1} ({worst[1]}).")
+    
     def end_interview(self, session_id: str) -> dict:
         """End interview and generate final report + PDF"""
         
         print(f"\n🛑 END_INTERVIEW called with session_id: {session_id}")
+        self.wait_for_scores(session_id)
         session_summary = session_manager.get_session_summary(session_id)
         
         if not session_summary:
@@ -239,6 +605,12 @@ class InterviewCrew:
         print(f"   Topics covered: {session_summary.get('topics_covered', [])}")
         print(f"   Interaction blocks count: {len(session_summary.get('interaction_blocks', []))}")
         
+        # Rank the candidate against prior interviews for the same role and difficulty
+        try:
+            session_summary["percentiles"] = percentile_index.rank_session(session_summary)
+        except Exception as e:
+            print(f"❌ Error ranking session: {e}")
+        
         # Generate final report
         print("\n📊 GENERATING FINAL REPORT...")
         report_crew = Crew(
@@ -250,13 +622,15 @@ class InterviewCrew:
                     difficulty=session_summary["difficulty"],
                     interaction_blocks=session_summary["interaction_blocks"],
                     topics_covered=session_summary["topics_covered"],
-                    average_score=session_summary["average_score"]
+                    average_score=session_summary["average_score"],
+                    aggregates=session_summary["aggregates"],
+                    chunk_summaries=self._summarize_chunks(session_summary)
                 )
             ],
             verbose=True
         )
         
-        report_result = report_crew.kickoff()
+        report_result = llm_scheduler.kickoff(report_crew, REPORT, session_id=session_id)
         report_text = str(report_result).strip()
         
         # Parse report
@@ -290,22 +664,33 @@ class InterviewCrew:
                 "final_score": session_summary["average_score"]
             }
         
-        # Generate PDF Report
-        print("\n📄 GENERATING PDF REPORT...")
+        # The stored summary carries the whole interview's token usage, report included
+        session_summary["token_usage"] = session_manager.get_token_usage(session_id)
+        
+        # Persist the summary; the PDF is rendered lazily on first download
         pdf_filename = None
         try:
-            pdf_generator = PDFReportGenerator()
-            pdf_path = pdf_generator.generate_report(session_summary)
-            # Extract just the filename for the response
-            pdf_filename = os.path.basename(pdf_path)
-            print(f"✅ PDF Report saved: {pdf_path}")
-            print(f"✅ PDF filename: {pdf_filename}")
+            report_service.finish_interview(session_id, session_summary)
+            pdf_filename = report_filename(session_id)
+            print(f"✅ Report summary stored for session: {session_id}")
         except Exception as e:
-            print(f"❌ Error generating PDF: {e}")
+            print(f"❌ Error storing report summary: {e}")
             import traceback
             traceback.print_exc()
             pdf_filename = None
         
+        # Keep the score vectors for cohort analytics before the session is dropped. The
+        # percentile index takes the same scores; it is updated first so that its lazy seed
+        # from the store can never count this session twice
+        try:
+            percentile_index.add_session(session_summary)
+        except Exception as e:
+            print(f"❌ Error indexing session percentiles: {e}")
+        try:
+            analytics_store.record_session(session_summary)
+        except Exception as e:
+            print(f"❌ Error recording session analytics: {e}")
+        
         # Clean up session
         session_manager.delete_session(session_id)
         
@@ -314,10 +699,13 @@ class InterviewCrew:
             "success": True,
             "report": report,
             "pdf_filename": pdf_filename,
+            "report_id": session_id if pdf_filename else None,
             "summary": {
                 "total_questions": session_summary["total_questions"],
                 "total_interactions": session_summary["total_interactions"],
                 "average_score": session_summary["average_score"],
-                "topics_covered": session_summary["topics_covered"]
+                "topics_covered": session_summary["topics_covered"],
+                "percentiles": session_summary.get("percentiles"),
+                "token_usage": session_summary.get("token_usage")
             }
         }
@@ -1,8 +1,49 @@
 ﻿from crewai import Agent, Task
 import os
 
+from utils.skill_taxonomy import has_profile, profile_digest
+from utils.question_bank import select_questions
+
 GROQ_API_KEY = os.getenv('GROQ_API_KEY_1')
 
+# Later turns send the extracted profile instead of the resume; when the taxonomy
+# found nothing in it, this much of the resume text is sent instead
+RESUME_EXCERPT_CHARS = 1500
+
+# Prompts are laid out for prefix prompt caching: the static instructions come
+# first and are byte-identical for every candidate and turn, then the
+# per-session candidate details, then the few lines that change each turn
+RESUME_GUIDELINES = """IMPORTANT INSTRUCTIONS FOR RESUME-BASED QUESTIONS (when a resume or profile is provided):
+1. PRIORITIZE asking about specific skills, technologies, and projects mentioned in the resume
+2. Ask about their experience with specific tools/frameworks listed
+3. Ask about their past projects - what they built, challenges they faced, technologies used
+4. Ask about their work experience - responsibilities, achievements, technical contributions
+5. Ask follow-up questions about their resume items to understand depth and expertise
+6. Reference specific items from their resume to make questions personal and relevant
+7. If they mention a project or skill, dig deeper into it in follow-up questions
+8. Ask about how their resume experience relates to the position they are interviewing for"""
+
+QUESTION_RULES = f"""You are interviewing a candidate for the position in CANDIDATE DETAILS below.
+
+CRITICAL RULES:
+1. DO NOT repeat any previously asked questions
+2. DO NOT ask about topics already covered
+3. Ask about DIFFERENT aspects and areas each time
+4. If resume is provided, ALWAYS prioritize resume-based questions over generic ones
+5. Ask ONE clear, specific question
+6. Make the question relevant to their background and the role
+7. Return ONLY the question text, nothing else - no explanations or preamble
+
+{RESUME_GUIDELINES}"""
+
+OPENING_RULES = f"""You are preparing to interview the candidate in CANDIDATE DETAILS below.
+
+Write {{count}} DIFFERENT opening questions, each usable as the first question of the interview.
+Each must be ONE clear, specific question about a different part of the candidate's background.
+Return ONLY a JSON array of {{count}} question strings, nothing else.
+
+{RESUME_GUIDELINES}"""
+
 class InterviewerAgent:
     def __init__(self):
         self.agent = Agent(
@@ -14,10 +55,13 @@ class InterviewerAgent:
             llm='groq/llama-3.1-8b-instant'
         )
     
-    def create_question_task(self, role, experience, difficulty, resume_text, asked_questions, topics_covered):
-        asked_questions_str = '\n'.join([f'- {q}' for q in asked_questions[-5:]]) if asked_questions else 'None yet'
-        topics_str = ', '.join(topics_covered) if topics_covered else 'None yet'
+    def _candidate_section(self, role, experience, difficulty, resume_text, resume_profile=None,
+                           full_resume=True):
+        """Per-session part of a question prompt; without `full_resume` only the extracted profile is sent
         
+        A resume the taxonomy found nothing in (unusual stack, non-English) is
+        still a resume: its text is sent, cut to RESUME_EXCERPT_CHARS on later turns.
+        """
         is_valid_resume = (
             resume_text 
             and resume_text.strip() 
@@ -25,50 +69,69 @@ class InterviewerAgent:
             and len(resume_text.strip()) > 50
         )
         
-        resume_section = ""
-        if is_valid_resume:
-            resume_section = f"""
+        details = f"""CANDIDATE DETAILS:
+- Role: {role}
+- Experience Level: {experience}
+- Difficulty Level: {difficulty}
+"""
+        if not is_valid_resume:
+            return details + f"""
+NO RESUME PROVIDED - Ask generic role-based questions about {role} position.
+"""
+        found_profile = has_profile(resume_profile)
+        if full_resume or not found_profile:
+            text = resume_text if full_resume else resume_text.strip()[:RESUME_EXCERPT_CHARS]
+            resume_body = f"""
 CANDIDATE'S RESUME AND BACKGROUND:
-{resume_text}
-
-IMPORTANT INSTRUCTIONS FOR RESUME-BASED QUESTIONS:
-1. PRIORITIZE asking about specific skills, technologies, and projects mentioned in the resume
-2. Ask about their experience with specific tools/frameworks listed
-3. Ask about their past projects - what they built, challenges they faced, technologies used
-4. Ask about their work experience - responsibilities, achievements, technical contributions
-5. Ask follow-up questions about their resume items to understand depth and expertise
-6. Reference specific items from their resume to make questions personal and relevant
-7. If they mention a project or skill, dig deeper into it in follow-up questions
-8. Ask about how their resume experience relates to the {role} position"""
+{text}
+"""
         else:
-            resume_section = f"""
-NO RESUME PROVIDED - Ask generic role-based questions about {role} position."""
-        
+            resume_body = ""
+        profile_section = f"""
+EXTRACTED PROFILE:
+{profile_digest(resume_profile)}
+""" if found_profile else ""
+        return details + resume_body + profile_section
+    
+    def _question_ideas(self, role, asked_questions, resume_profile=None, resume_topics=None):
+        """Resume-grounded question seeds not asked yet; they change every turn, so they go last"""
+        if not has_profile(resume_profile):
+            return ""
+        seeds = '\n'.join(f'- {q}' for q in select_questions(resume_profile, role, asked_questions,
+                                                             topics=resume_topics))
+        return f"""
+QUESTION IDEAS FROM THE RESUME (adapt one, do not copy verbatim):
+{seeds}
+"""
+    
+    def create_opening_questions_task(self, role, experience, difficulty, resume_text, resume_profile=None,
+                                      resume_topics=None, count=3):
+        """Several alternative opening questions in one call, cached per resume and role"""
         task = Task(
-            description=f"""You are interviewing a candidate for a {role} position.
+            description=f"""{OPENING_RULES.format(count=count)}
 
-CANDIDATE DETAILS:
-- Role: {role}
-- Experience Level: {experience}
-- Difficulty Level: {difficulty}
+{self._candidate_section(role, experience, difficulty, resume_text, resume_profile)}{self._question_ideas(role, [], resume_profile, resume_topics)}
+Write the {count} opening questions for this candidate now:""",
+            expected_output=f'A JSON array of {count} interview questions',
+            agent=self.agent
+        )
+        return task
+    
+    def create_question_task(self, role, experience, difficulty, resume_text, asked_questions, topics_covered,
+                             resume_profile=None, resume_topics=None, full_resume=True):
+        asked_questions_str = '\n'.join([f'- {q}' for q in asked_questions[-5:]]) if asked_questions else 'None yet'
+        topics_str = ', '.join(topics_covered) if topics_covered else 'None yet'
+        
+        task = Task(
+            description=f"""{QUESTION_RULES}
 
+{self._candidate_section(role, experience, difficulty, resume_text, resume_profile, full_resume)}
 TOPICS ALREADY COVERED:
 {topics_str}
 
 PREVIOUSLY ASKED QUESTIONS (DO NOT REPEAT):
 {asked_questions_str}
-
-{resume_section}
-
-CRITICAL RULES:
-1. DO NOT repeat any previously asked questions
-2. DO NOT ask about topics already covered
-3. Ask about DIFFERENT aspects and areas each time
-4. If resume is provided, ALWAYS prioritize resume-based questions over generic ones
-5. Ask ONE clear, specific question
-6. Make the question relevant to their background and the {role} role
-7. Return ONLY the question text, nothing else - no explanations or preamble
-
+{self._question_ideas(role, asked_questions, resume_profile, resume_topics)}
 Generate the next interview question now:""",
             expected_output='A single, clear, specific interview question (nothing else)',
             agent=self.agent
@@ -0,0 +1,90 @@
+"""
+Benchmark: cohort analytics over the columnar store vs a pure-Python pass
+
+Records synthetic sessions (8 interactions each) into an AnalyticsStore in a
+temporary directory, then times append, cold reload from disk and each
+cohort query. The baseline computes the same cohort mean / percentiles by
+looping over the session summaries as stored dicts.
+
+Usage (from backend/):
+    python -m benchmarks.bench_analytics --interactions 300000
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.synthetic import make_session_summary
+from memory.analytics_store import AnalyticsStore
+
+
+def _timed(fn, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def _baseline_cohort(summaries, role):
+    values = [b["scores"]["final_score"] for s in summaries if s["role"] == role
+              for b in s["interaction_blocks"]]
+    quartiles = statistics.quantiles(values, n=4)
+    return statistics.fmean(values), quartiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interactions", type=int, default=300000)
+    parser.add_argument("--per-session", type=int, default=8)
+    args = parser.parse_args()
+
+    sessions = max(1, args.interactions // args.per_session)
+    rng = random.Random(11)
+    now = time.time()
+    summaries = [make_session_summary(f"bench-{i}", args.per_session, seed=i) for i in range(sessions)]
+    timestamps = [now - rng.uniform(0, 180 * 86400) for _ in range(sessions)]
+    role = summaries[0]["role"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = AnalyticsStore(tmp)
+        started = time.perf_counter()
+        for summary, ts in zip(summaries, timestamps):
+            store.record_session(summary, timestamp=ts)
+        record_s = time.perf_counter() - started
+        rows = len(store)
+
+        started = time.perf_counter()
+        reloaded = AnalyticsStore(tmp)
+        len(reloaded)
+        reload_ms = (time.perf_counter() - started) * 1000
+
+        print("=" * 60)
+        print(f"Rows: {rows:,} interactions from {sessions:,} sessions")
+        print(f"Record: {sessions / record_s:,.0f} sessions/s ({record_s / sessions * 1e6:.0f} µs/session, persisted)")
+        print(f"Cold reload: {reload_ms:.1f} ms")
+
+        queries = [
+            ("cohort (all)", lambda: store.cohort_stats()),
+            (f"cohort (role={role})", lambda: store.cohort_stats(role=role)),
+            ("correlations", lambda: store.correlations()),
+            ("trends (week)", lambda: store.trends("week")),
+            ("breakdown (difficulty)", lambda: store.breakdown("difficulty")),
+        ]
+        print(f"{'query':>28} {'ms':>9}")
+        for name, fn in queries:
+            ms, _ = _timed(fn)
+            print(f"{name:>28} {ms:>9.2f}")
+
+        baseline_ms, (mean, quartiles) = _timed(lambda: _baseline_cohort(summaries, role), repeat=3)
+        vector_ms, stats = _timed(lambda: store.cohort_stats(role=role))
+        final = stats["dimensions"]["final_score"]
+        print(f"\nPure-Python cohort (role={role}): {baseline_ms:.1f} ms -> vectorized {vector_ms:.2f} ms "
+              f"({baseline_ms / vector_ms:.0f}x)")
+        print(f"  mean {mean:.2f} vs {final['mean']:.2f}; median {quartiles[1]:.2f} vs {final['percentiles']['p50']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
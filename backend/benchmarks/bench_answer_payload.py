@@ -0,0 +1,79 @@
+"""
+Benchmark: legacy full-context answer requests vs delta answer requests
+
+For interviews of increasing length, builds the body the client sends for the
+last answer in each API style (`/crew-interview-answer` resends role, resume
+and the whole conversation; `/crew-interview-turn` sends session id, answer
+and seq) and measures payload size and request-model parse time, plus the
+total bytes uploaded over the whole interview.
+
+Usage (from backend/):
+    python -m benchmarks.bench_answer_payload --turns 5 10 20 40
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.synthetic import SAMPLE_ANSWERS
+from models.schemas import CrewInterviewAnswerRequest, CrewInterviewTurnRequest
+
+RESUME = ("Senior software engineer with 6 years of experience building Python and Go services, "
+          "FastAPI, PostgreSQL, Kafka, Kubernetes, AWS. Led migration of a monolith to microservices. ") * 12
+
+
+def _legacy_body(history, answer: str) -> str:
+    return json.dumps({
+        "session_id": "session_1700000000000",
+        "role": "Software Engineer",
+        "experience": "3-5",
+        "difficulty": "Medium",
+        "resume_text": RESUME,
+        "user_message": answer,
+        "conversation_history": history,
+    })
+
+
+def _delta_body(turn: int, answer: str) -> str:
+    return json.dumps({"session_id": "session_1700000000000", "answer": answer, "seq": turn})
+
+
+def _parse_us(model, body: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        model.model_validate_json(body)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, nargs="+", default=[5, 10, 20, 40])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    print("=" * 78)
+    print(f"{'turns':>6} {'legacy last':>12} {'delta last':>11} {'legacy total':>13} {'delta total':>12} "
+          f"{'parse legacy':>13} {'parse delta':>12}")
+    for turns in args.turns:
+        history = [{"role": "interviewer", "content": "Tell me about a system you designed end to end."}]
+        legacy_total = delta_total = 0
+        legacy_body = delta_body = ""
+        for turn in range(1, turns + 1):
+            answer = " ".join(rng.choice(SAMPLE_ANSWERS) for _ in range(3))
+            legacy_body = _legacy_body(history, answer)
+            delta_body = _delta_body(turn, answer)
+            legacy_total += len(legacy_body.encode())
+            delta_total += len(delta_body.encode())
+            history = history + [
+                {"role": "user", "content": answer},
+                {"role": "interviewer", "content": f"Follow-up {turn}: how did you measure the impact of that?"},
+            ]
+        legacy_us = _parse_us(CrewInterviewAnswerRequest, legacy_body, args.repeat)
+        delta_us = _parse_us(CrewInterviewTurnRequest, delta_body, args.repeat)
+        print(f"{turns:>6} {len(legacy_body):>10,} B {len(delta_body):>9,} B {legacy_total / 1024:>10.1f} KB "
+              f"{delta_total / 1024:>9.1f} KB {legacy_us:>10.1f} µs {delta_us:>9.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
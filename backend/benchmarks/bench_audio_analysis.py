@@ -0,0 +1,63 @@
+"""
+Benchmark: vectorized audio analysis throughput
+
+Synthesizes speech-like audio (syllable-rate amplitude modulation with pauses
+of varying length), writes it to a temporary WAV file and reports throughput
+in seconds of audio analyzed per CPU second.
+
+Usage (from backend/):
+    python -m benchmarks.bench_audio_analysis --minutes 1 10 60 --sample-rate 16000
+"""
+import argparse
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+from utils.audio_analysis import audio_analyzer
+
+
+def write_speech_like_wav(path: str, minutes: float, sample_rate: int, seed: int = 0):
+    """Write the signal in blocks so generating an hour of audio stays in bounded memory"""
+    rng = np.random.default_rng(seed)
+    remaining = int(minutes * 60 * sample_rate)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        while remaining > 0:
+            n = min(remaining, int(sample_rate * rng.uniform(0.8, 3.0)))
+            t = np.arange(n) / sample_rate
+            envelope = 0.5 * (1 + np.sin(2 * np.pi * 4.5 * t))
+            speech = 0.3 * envelope * np.sin(2 * np.pi * rng.uniform(120, 220) * t) + 0.01 * rng.standard_normal(n)
+            gap = int(sample_rate * rng.choice([0.1, 0.4, 0.8, 2.0]))
+            silence = 0.002 * rng.standard_normal(gap)
+            block = np.concatenate((speech, silence))[:remaining]
+            wav.writeframes((np.clip(block, -1, 1) * 32767).astype("<i2").tobytes())
+            remaining -= block.size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 10, 60])
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"{'audio min':>10} {'cpu s':>8} {'wall s':>8} {'audio s / cpu s':>16} {'segments':>9} {'wpm est':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for minutes in args.minutes:
+            path = f"{tmp}/bench_{minutes}.wav"
+            write_speech_like_wav(path, minutes, args.sample_rate)
+            cpu_started, wall_started = time.process_time(), time.perf_counter()
+            with open(path, "rb") as f:
+                result = audio_analyzer.analyze_file(f)
+            cpu = time.process_time() - cpu_started
+            wall = time.perf_counter() - wall_started
+            print(f"{minutes:>10.1f} {cpu:>8.2f} {wall:>8.2f} {minutes * 60 / cpu if cpu else float('inf'):>16,.0f} "
+                  f"{result['segments']:>9} {result['words_per_minute']:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark: light-endpoint latency while large reports are being rendered
+
+Starts one uvicorn worker with two endpoints: a light one (speech analysis of
+a short transcript, like /analyze-speech) and a heavy one that builds the PDF
+report of a long interview. --heavy-clients clients render reports back to
+back while one client times light requests at a steady rate. Run once with
+the reportlab build on a thread (how /download-report used to render) and
+once in the CPU process pool, and reports light p50 / p99 with and without
+the heavy load, plus report throughput.
+
+Usage (from backend/):
+    python -m benchmarks.bench_cpu_pool --heavy-clients 4 --seconds 10
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.synthetic import SAMPLE_ANSWERS, make_session_summary
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _serve(port: int, mode: str, interactions: int):
+    import uvicorn
+    from fastapi import FastAPI
+    from starlette.concurrency import run_in_threadpool
+    from utils.cpu_pool import cpu_pool
+    from utils.pdf_generator import PDFReportGenerator, render_report_job
+    from utils.speech_analysis import speech_analyzer
+
+    app = FastAPI()
+    summary = make_session_summary("bench_report", interactions)
+
+    @app.post("/light")
+    async def light(request: dict):
+        return speech_analyzer.analyze(request.get("transcript", ""), request.get("duration_seconds"))
+
+    @app.get("/heavy")
+    async def heavy():
+        if mode == "process":
+            pdf_bytes, _ = await cpu_pool.run(render_report_job, summary)
+        else:
+            pdf_bytes = await run_in_threadpool(PDFReportGenerator().render_report, summary)
+        return {"bytes": len(pdf_bytes)}
+
+    if mode == "process":
+        cpu_pool.start()
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+    cpu_pool.shutdown()
+
+
+def _request(conn: http.client.HTTPConnection, method: str, path: str, body: dict = None) -> float:
+    started = time.perf_counter()
+    payload = json.dumps(body) if body is not None else None
+    conn.request(method, path, body=payload, headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    response.read()
+    if response.status != 200:
+        raise RuntimeError(f"{method} {path} -> {response.status}")
+    return (time.perf_counter() - started) * 1000
+
+
+def _light_latencies(port: int, seconds: float, interval: float) -> list:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    body = {"transcript": SAMPLE_ANSWERS[0], "duration_seconds": 30}
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        latencies.append(_request(conn, "POST", "/light", body))
+        time.sleep(interval)
+    conn.close()
+    return latencies
+
+
+def _heavy_loop(port: int, stop: threading.Event, rendered: list):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=120)
+    while not stop.is_set():
+        _request(conn, "GET", "/heavy")
+        rendered.append(1)
+    conn.close()
+
+
+def _wait_until_up(port: int, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            _request(conn, "POST", "/light", {"transcript": "warm up"})
+            conn.close()
+            return
+        except (OSError, RuntimeError):
+            time.sleep(0.1)
+    raise RuntimeError("benchmark server did not start")
+
+
+def _run_mode(args, mode: str) -> dict:
+    server = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_cpu_pool", "--serve", "--mode", mode,
+                               "--port", str(args.port), "--interactions", str(args.interactions)],
+                              cwd=BACKEND_DIR, stdout=subprocess.DEVNULL)
+    try:
+        _wait_until_up(args.port)
+        # One render first so reportlab's imports and font setup are not part of the measurement
+        conn = http.client.HTTPConnection("127.0.0.1", args.port, timeout=120)
+        _request(conn, "GET", "/heavy")
+        conn.close()
+
+        idle = _light_latencies(args.port, args.seconds / 2, args.interval)
+
+        stop, rendered = threading.Event(), []
+        heavy = [threading.Thread(target=_heavy_loop, args=(args.port, stop, rendered))
+                 for _ in range(args.heavy_clients)]
+        for thread in heavy:
+            thread.start()
+        loaded = _light_latencies(args.port, args.seconds, args.interval)
+        stop.set()
+        for thread in heavy:
+            thread.join()
+    finally:
+        server.terminate()
+        server.wait()
+    return {"idle": idle, "loaded": loaded, "reports_per_s": len(rendered) / args.seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--heavy-clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--interactions", type=int, default=40, help="answers in each rendered report")
+    parser.add_argument("--interval", type=float, default=0.01, help="seconds between light requests")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--mode", choices=["thread", "process"], default="thread", help=argparse.SUPPRESS)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        _serve(args.port, args.mode, args.interactions)
+        return
+
+    results = {mode: _run_mode(args, mode) for mode in ("thread", "process")}
+    p = lambda xs, q: sorted(xs)[min(len(xs) - 1, int(q * len(xs)))]
+    print("=" * 72)
+    print(f"Light requests while {args.heavy_clients} clients render {args.interactions}-answer reports")
+    print(f"{'render on':>10} {'idle p50':>9} {'idle p99':>9} {'load p50':>9} {'load p99':>9} {'reports/s':>10}")
+    for mode, result in results.items():
+        idle, loaded = result["idle"], result["loaded"]
+        print(f"{mode:>10} {statistics.median(idle):>9.2f} {p(idle, 0.99):>9.2f} "
+              f"{statistics.median(loaded):>9.2f} {p(loaded, 0.99):>9.2f} {result['reports_per_s']:>10.1f}")
+    print("(latencies in ms)")
+
+
+if __name__ == "__main__":
+    main()
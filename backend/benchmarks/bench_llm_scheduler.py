@@ -0,0 +1,105 @@
+"""
+Benchmark: LLM queueing delay per priority class, FIFO vs the priority scheduler
+
+Simulates the agents' kickoffs against LLM_CONCURRENCY slots with a fixed
+per-call latency (no network): --interviews candidates each send an answer
+every --think seconds (two next-question calls plus one scoring call per
+turn), while report generations (--report-chunks chunk summaries and a final
+report) and prefetch calls arrive in the background. The same workload runs
+once with every call in one class (arrival order, how kickoffs were served
+before) and once with the real classes, and prints per-class p50 / p95 /
+max wait. Aging is what keeps the report and prefetch maxima bounded.
+
+Usage (from backend/):
+    python -m benchmarks.bench_llm_scheduler --interviews 12 --seconds 10
+"""
+import argparse
+import random
+import threading
+import time
+
+from utils.llm_scheduler import LlmScheduler, LLM_CLASSES, NEXT_QUESTION, SCORING, REPORT, PREFETCH
+
+
+def _call(scheduler: LlmScheduler, llm_class: str, mode: str, latency: float, rng: random.Random) -> float:
+    """One simulated kickoff; returns seconds spent waiting for a slot"""
+    queued = time.perf_counter()
+
+    def call():
+        waited = time.perf_counter() - queued
+        time.sleep(latency * rng.uniform(0.7, 1.3))
+        return waited
+
+    return scheduler.run(llm_class if mode == "priority" else NEXT_QUESTION, call)
+
+
+def _interview(scheduler, mode, args, stop, seed, waits):
+    rng = random.Random(seed)
+    time.sleep(rng.uniform(0, args.think))
+    while not stop.is_set():
+        for llm_class in (NEXT_QUESTION, NEXT_QUESTION, SCORING):
+            waits[llm_class].append(_call(scheduler, llm_class, mode, args.latency, rng))
+        time.sleep(args.think * rng.uniform(0.5, 1.5))
+
+
+def _background(scheduler, mode, args, stop, seed, waits, llm_class, calls, interval):
+    rng = random.Random(seed)
+    while not stop.is_set():
+        time.sleep(interval * rng.uniform(0.5, 1.5))
+        threads = []
+        for _ in range(calls):
+            def one():
+                waits[llm_class].append(_call(scheduler, llm_class, mode, args.latency, rng))
+            threads.append(threading.Thread(target=one))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+
+def _run_mode(args, mode: str) -> dict:
+    scheduler = LlmScheduler(concurrency=args.concurrency, aging_seconds=args.aging)
+    waits = {name: [] for name in LLM_CLASSES}
+    stop = threading.Event()
+    threads = [threading.Thread(target=_interview, args=(scheduler, mode, args, stop, i, waits))
+               for i in range(args.interviews)]
+    threads.append(threading.Thread(target=_background, args=(scheduler, mode, args, stop, 1000, waits,
+                                                              REPORT, args.report_chunks + 1, args.report_every)))
+    threads.append(threading.Thread(target=_background, args=(scheduler, mode, args, stop, 2000, waits,
+                                                              PREFETCH, 2, args.think)))
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return waits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interviews", type=int, default=12)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per simulated LLM call")
+    parser.add_argument("--think", type=float, default=1.0, help="seconds between a candidate's answers")
+    parser.add_argument("--report-chunks", type=int, default=4)
+    parser.add_argument("--report-every", type=float, default=1.5, help="seconds between report generations")
+    parser.add_argument("--aging", type=float, default=2.0, help="seconds of waiting per class promotion")
+    args = parser.parse_args()
+
+    p = lambda xs, q: sorted(xs)[min(len(xs) - 1, int(q * len(xs)))] * 1000 if xs else 0.0
+    print("=" * 72)
+    print(f"{args.interviews} interviews, {args.concurrency} LLM slots, {args.latency * 1000:.0f} ms per call")
+    print(f"{'mode':>9} {'class':>14} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for mode in ("fifo", "priority"):
+        waits = _run_mode(args, mode)
+        for name in LLM_CLASSES:
+            xs = waits[name]
+            print(f"{mode:>9} {name:>14} {len(xs):>6} {p(xs, 0.5):>8.0f} {p(xs, 0.95):>8.0f} "
+                  f"{max(xs, default=0) * 1000:>8.0f}")
+    print("(wait = time queued for an LLM slot)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark: local scorer throughput and agreement with ScoringAgent scores
+
+Throughput is measured on synthetic answers. Agreement compares local scores
+against LLM-produced scores, read either from a JSONL file of
+{"question", "answer", "scores"} records or from the interaction blocks of
+summaries in the report store (only blocks scored by the LLM are used).
+
+Usage (from backend/):
+    python -m benchmarks.bench_local_scorer --answers 20000
+    python -m benchmarks.bench_local_scorer --jsonl scored_answers.jsonl
+"""
+import argparse
+import json
+import math
+import random
+import time
+
+from benchmarks.synthetic import SAMPLE_ANSWERS
+from utils.local_scorer import LocalScorer, SCORE_DIMENSIONS
+from utils.report_store import ReportStore
+
+
+def _load_llm_samples(jsonl_path: str = None, reports_dir: str = None):
+    samples = []
+    if jsonl_path:
+        with open(jsonl_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    samples.append(json.loads(line))
+        return samples
+    store = ReportStore(reports_dir, sweep_interval=0)
+    for report_id in store.list_summary_ids():
+        summary = store.load_summary(report_id) or {}
+        for block in summary.get("interaction_blocks", []):
+            scores = block.get("scores") or {}
+            if scores.get("source", "llm") == "llm" and all(d in scores for d in SCORE_DIMENSIONS):
+                samples.append({"question": block.get("question", ""), "answer": block.get("answer", ""),
+                                "scores": scores})
+    return samples
+
+
+def _pearson(xs, ys):
+    n = len(xs)
+    if n < 2:
+        return float("nan")
+    mx, my = sum(xs) / n, sum(ys) / n
+    cov = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    vx = math.sqrt(sum((x - mx) ** 2 for x in xs))
+    vy = math.sqrt(sum((y - my) ** 2 for y in ys))
+    return cov / (vx * vy) if vx and vy else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=20000)
+    parser.add_argument("--jsonl", default=None)
+    parser.add_argument("--reports-dir", default=None)
+    args = parser.parse_args()
+
+    scorer = LocalScorer()
+    rng = random.Random(7)
+    question = "Describe a challenging technical problem you solved and how you approached it."
+    answers = [" ".join(rng.choice(SAMPLE_ANSWERS) for _ in range(rng.randint(1, 6))) for _ in range(args.answers)]
+
+    started = time.perf_counter()
+    for answer in answers:
+        scorer.score(question, answer, "Python FastAPI PostgreSQL Kafka machine learning")
+    elapsed = time.perf_counter() - started
+    print("=" * 60)
+    print(f"Throughput: {args.answers / elapsed:,.0f} answers/s ({elapsed / args.answers * 1e6:.1f} µs/answer)")
+
+    samples = _load_llm_samples(args.jsonl, args.reports_dir)
+    if not samples:
+        print("Agreement: no LLM-scored samples found (pass --jsonl or populate the report store)")
+        return
+    print(f"Agreement with LLM scores over {len(samples)} answers:")
+    print(f"{'dimension':>18} {'MAE':>7} {'pearson':>8} {'within 10':>10}")
+    for dim in SCORE_DIMENSIONS + ("final_score",):
+        local, llm = [], []
+        for sample in samples:
+            local.append(scorer.score(sample["question"], sample["answer"])[dim])
+            llm.append(float(sample["scores"].get(dim, 0)))
+        mae = sum(abs(a - b) for a, b in zip(local, llm)) / len(local)
+        within = sum(1 for a, b in zip(local, llm) if abs(a - b) <= 10) / len(local)
+        print(f"{dim:>18} {mae:>7.1f} {_pearson(local, llm):>8.2f} {within:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: how much of each agent prompt a prefix prompt cache could reuse
+
+Builds the prompts of --sessions synthetic interviews (--turns answers each,
+half of the candidates with a resume) exactly as the agents do, and replays
+them in arrival order against a simulated provider cache: a prompt's cached
+part is its longest common prefix with any earlier prompt to the same agent,
+rounded down to --block-tokens, and nothing below --min-tokens. Reports per
+agent the average prompt size and the cached-token ratio, i.e. the ratio the
+provider would report as cached_prompt_tokens / prompt_tokens (tracked live
+per agent in /token-usage-stats).
+
+Tokens are approximated as four characters. Needs the backend's environment
+(crewai) since it uses the real agent classes.
+
+Usage (from backend/):
+    python -m benchmarks.bench_prompt_prefix --sessions 20 --turns 6
+"""
+import argparse
+import random
+from collections import defaultdict
+
+from agents.followup_agent import FollowUpAgent
+from agents.interviewer_agent import InterviewerAgent
+from agents.scoring_agent import ScoringAgent
+from benchmarks.bench_skill_extractor import _aliases, make_resume
+from benchmarks.synthetic import ROLES, DIFFICULTIES, EXPERIENCES, SAMPLE_ANSWERS
+from utils.question_bank import rank_topics
+from utils.skill_taxonomy import skill_extractor
+from utils.token_usage import CHARS_PER_TOKEN
+
+
+def full_prompt(task) -> str:
+    """What reaches the model: the agent's persona (system prompt), then the task"""
+    agent = task.agent
+    return f"{agent.role}\n{agent.goal}\n{agent.backstory}\n\n{task.description}\n\n{task.expected_output}"
+
+
+def interview_prompts(rng: random.Random, skills, agents, turns: int) -> list:
+    """(agent name, prompt) for one synthetic interview, in call order"""
+    interviewer, followup, scoring = agents
+    role, difficulty, experience = rng.choice(ROLES), rng.choice(DIFFICULTIES), rng.choice(EXPERIENCES)
+    resume_text = make_resume(rng, skills)[0] if rng.random() < 0.5 else "No resume"
+    profile = skill_extractor.profile(resume_text)
+    topics = rank_topics(profile, role)
+    asked, covered, prompts = [], [], []
+
+    question = interviewer.create_question_task(role, experience, difficulty, resume_text, [], [], profile)
+    prompts.append(("interviewer", full_prompt(question)))
+    asked.append(f"Opening question for a {role}")
+    for turn in range(turns):
+        answer = rng.choice(SAMPLE_ANSWERS)
+        evaluation = followup.create_evaluation_task(asked[-1], answer, role, experience, asked, resume_text)
+        prompts.append(("followup", full_prompt(evaluation)))
+        question = interviewer.create_question_task(role, experience, difficulty, resume_text, asked, covered,
+                                                    profile, topics, full_resume=False)
+        prompts.append(("interviewer", full_prompt(question)))
+        prompts.append(("scoring", full_prompt(scoring.create_scoring_task(role, experience, asked[-1], [answer]))))
+        asked.append(f"Question {turn + 2} about {rng.choice(['design', 'debugging', 'testing', 'scaling'])}")
+        covered.append(rng.choice(["followup", "hard_followup", "different_question"]))
+    return prompts
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--block-tokens", type=int, default=128, help="cache granularity")
+    parser.add_argument("--min-tokens", type=int, default=0, help="shortest prefix a provider caches")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    skills = _aliases()
+    agents = (InterviewerAgent(), FollowUpAgent(), ScoringAgent())
+    sessions = [interview_prompts(rng, skills, agents, args.turns) for _ in range(args.sessions)]
+    # Interleave the sessions turn by turn, as concurrent interviews arrive
+    calls = [call for step in range(max(map(len, sessions))) for prompts in sessions
+             if step < len(prompts) for call in [prompts[step]]]
+
+    block = args.block_tokens * CHARS_PER_TOKEN
+    seen = defaultdict(list)
+    totals = defaultdict(lambda: {"prompts": 0, "tokens": 0, "cached": 0})
+    for agent, prompt in calls:
+        cached = max((_common_prefix(prompt, earlier) for earlier in seen[agent]), default=0)
+        cached = cached // block * block
+        if cached < args.min_tokens * CHARS_PER_TOKEN:
+            cached = 0
+        seen[agent].append(prompt)
+        totals[agent]["prompts"] += 1
+        totals[agent]["tokens"] += len(prompt) / CHARS_PER_TOKEN
+        totals[agent]["cached"] += cached / CHARS_PER_TOKEN
+
+    print("=" * 72)
+    print(f"{args.sessions} interviews x {args.turns} answers, {args.block_tokens}-token cache blocks")
+    print(f"{'agent':>12} {'prompts':>8} {'avg tokens':>11} {'cached ratio':>13}")
+    for agent, total in totals.items():
+        print(f"{agent:>12} {total['prompts']:>8} {total['tokens'] / total['prompts']:>11.0f} "
+              f"{total['cached'] / total['tokens']:>13.1%}")
+    tokens = sum(total["tokens"] for total in totals.values())
+    print(f"{'all':>12} {len(calls):>8} {tokens / len(calls):>11.0f} "
+          f"{sum(total['cached'] for total in totals.values()) / tokens:>13.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: eager vs lazy PDF report rendering
+
+Measures the CPU a reportlab build costs per interview (what end_interview used
+to pay unconditionally), the latency of the first download (render + cache) and
+of repeat downloads (cache hit).
+
+Usage (from backend/):
+    python -m benchmarks.bench_report_rendering --sessions 50 --download-ratio 0.3
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.synthetic import make_session_summary
+from utils.report_cache import ReportCache
+from utils.report_service import ReportService
+from utils.report_store import ReportStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--interactions", type=int, default=8)
+    parser.add_argument("--download-ratio", type=float, default=0.3,
+                        help="fraction of interviews whose report is downloaded")
+    parser.add_argument("--repeat-downloads", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        service = ReportService(store=ReportStore(tmp), cache=ReportCache(), prewarm=False)
+
+        end_latencies = []
+        for i in range(args.sessions):
+            summary = make_session_summary(f"bench_{i}", args.interactions, seed=i)
+            started = time.perf_counter()
+            service.finish_interview(summary["session_id"], summary)
+            end_latencies.append(time.perf_counter() - started)
+
+        first, repeat = [], []
+        for i in range(args.sessions):
+            if rng.random() >= args.download_ratio:
+                continue
+            started = time.perf_counter()
+            service.get_or_render(f"bench_{i}")
+            first.append(time.perf_counter() - started)
+            for _ in range(args.repeat_downloads):
+                started = time.perf_counter()
+                service.get_or_render(f"bench_{i}")
+                repeat.append(time.perf_counter() - started)
+
+        stats = service.stats()
+
+    print("=" * 60)
+    print(f"Sessions: {args.sessions}  downloaded: {len(first)}  interactions/session: {args.interactions}")
+    print(f"end_interview persist (lazy):   {statistics.mean(end_latencies) * 1000:8.2f} ms avg")
+    print(f"PDF render CPU per report:      {stats['avg_render_cpu_ms']:8.2f} ms")
+    if first:
+        print(f"First download (render):        {statistics.mean(first) * 1000:8.2f} ms avg")
+    if repeat:
+        print(f"Repeat download (cache hit):    {statistics.mean(repeat) * 1000:8.3f} ms avg")
+    print(f"Renders skipped:                {stats['renders_skipped']}")
+    print(f"CPU saved per interview:        {stats['cpu_saved_per_interview_ms']:8.2f} ms")
+    print(f"CPU saved total:                {stats['estimated_cpu_saved_seconds']:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: LLM calls saved by coalescing identical in-flight prompts
+
+Replays a start-interview load profile against the LLM scheduler with a
+simulated model (no network):
+  - interview starts arrive as a Poisson process at --rate per second
+  - role, difficulty and experience follow a skewed popularity (most
+    candidates pick the first few), so identical no-resume prompts overlap
+  - --no-resume of the candidates have no resume; the rest send a prompt
+    of their own
+  - --retry of the starts are sent twice within 300 ms (retries, double-clicks)
+Each model call takes about --latency seconds. The same arrival trace runs
+with coalescing off and on; the benchmark counts requests, LLM calls
+actually issued, coalesced calls and the start latency.
+
+Usage (from backend/):
+    python -m benchmarks.bench_singleflight --rate 3 --seconds 20
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+
+from benchmarks.synthetic import ROLES, DIFFICULTIES, EXPERIENCES
+from utils.llm_scheduler import LlmScheduler, NEXT_QUESTION
+from utils.singleflight import Singleflight, prompt_key
+
+AGENT = SimpleNamespace(llm="groq/llama-3.1-8b-instant", role="Expert Technical Interviewer",
+                        goal="Ask insightful interview questions", backstory="15+ years of interviewing")
+
+
+def _skewed(rng: random.Random, options):
+    return options[min(len(options) - 1, int(rng.expovariate(1.2)))]
+
+
+def make_trace(args) -> list:
+    """(send time, prompt, request id) for every request, retries included"""
+    rng = random.Random(args.seed)
+    trace, at, request_id = [], 0.0, 0
+    while True:
+        at += rng.expovariate(args.rate)
+        if at >= args.seconds:
+            break
+        role, difficulty, experience = _skewed(rng, ROLES), _skewed(rng, DIFFICULTIES), _skewed(rng, EXPERIENCES)
+        if rng.random() < args.no_resume:
+            prompt = f"Ask the first {difficulty} question for a {role} ({experience} years). NO RESUME PROVIDED"
+        else:
+            prompt = f"Ask the first {difficulty} question for a {role} ({experience} years). Resume #{request_id}"
+        trace.append((at, prompt, request_id))
+        if rng.random() < args.retry:
+            trace.append((at + rng.uniform(0.05, 0.3), prompt, request_id))
+        request_id += 1
+    return sorted(trace)
+
+
+def _run(args, trace: list, coalesce: bool) -> dict:
+    scheduler = LlmScheduler(concurrency=args.concurrency)
+    singleflight = Singleflight()
+    rng = random.Random(args.seed + 1)
+    rng_lock = threading.Lock()
+    issued, latencies = [0], []
+
+    def model_call(prompt):
+        with rng_lock:
+            issued[0] += 1
+            latency = args.latency * rng.lognormvariate(0, 0.3)
+        time.sleep(latency)
+        return f"Question for: {prompt}"
+
+    def request(prompt):
+        crew = SimpleNamespace(agents=[AGENT], tasks=[SimpleNamespace(description=prompt, expected_output="question")],
+                               kickoff=lambda: model_call(prompt))
+        started = time.perf_counter()
+        if coalesce:
+            singleflight.do(prompt_key(crew), lambda: scheduler.run(NEXT_QUESTION, crew.kickoff))
+        else:
+            scheduler.run(NEXT_QUESTION, crew.kickoff)
+        latencies.append(time.perf_counter() - started)
+
+    threads, began = [], time.perf_counter()
+    for at, prompt, _ in trace:
+        time.sleep(max(0.0, began + at - time.perf_counter()))
+        thread = threading.Thread(target=request, args=(prompt,))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    return {"requests": len(trace), "issued": issued[0], "coalesced": singleflight.stats()["coalesced"],
+            "latencies": latencies}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=3.0, help="interview starts per second")
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--no-resume", type=float, default=0.4, help="share of candidates without a resume")
+    parser.add_argument("--retry", type=float, default=0.05, help="share of starts sent twice")
+    parser.add_argument("--latency", type=float, default=1.5, help="seconds per simulated LLM call")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    trace = make_trace(args)
+    print("=" * 72)
+    print(f"{len(trace)} interview starts over {args.seconds:.0f} s, {args.no_resume:.0%} without a resume, "
+          f"{args.retry:.0%} retried")
+    print(f"{'coalescing':>10} {'requests':>9} {'LLM calls':>10} {'coalesced':>10} {'p50 s':>7} {'p95 s':>7}")
+    for coalesce in (False, True):
+        result = _run(args, trace, coalesce)
+        xs = sorted(result["latencies"])
+        print(f"{'on' if coalesce else 'off':>10} {result['requests']:>9} {result['issued']:>10} "
+              f"{result['coalesced']:>10} {statistics.median(xs):>7.2f} {xs[int(0.95 * (len(xs) - 1))]:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
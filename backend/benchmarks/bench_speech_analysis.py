@@ -0,0 +1,72 @@
+"""
+Benchmark: Aho-Corasick speech analysis on long transcripts
+
+Compares the automaton-based analyzer with the previous implementation (split
+and test each token against a Python list, which cannot match multi-word
+fillers) on transcripts of increasing length, and measures batch throughput.
+
+Usage (from backend/):
+    python -m benchmarks.bench_speech_analysis --words 1000 10000 100000
+"""
+import argparse
+import random
+import time
+
+from utils.speech_analysis import SpeechAnalyzer
+
+LEGACY_FILLERS = ["um", "uh", "like", "you know", "so", "actually", "basically", "right", "kind of"]
+
+VOCABULARY = (
+    "the service handles requests and we cache results in redis so latency stays low "
+    "i think the main challenge was consistency because writes arrive out of order "
+    "um you know we kind of added idempotency keys and uh basically retried safely "
+    "i'm not sure but maybe the queue was sort of the bottleneck i mean the the consumer lagged"
+).split()
+
+
+def legacy_analyze(transcript: str) -> int:
+    words = transcript.lower().split()
+    return sum(1 for word in words if word.strip(".,!?;:") in LEGACY_FILLERS)
+
+
+def make_transcript(n_words: int, rng: random.Random) -> str:
+    return " ".join(rng.choice(VOCABULARY) for _ in range(n_words))
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--batch", type=int, default=200, help="transcripts per batch")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    analyzer = SpeechAnalyzer()
+
+    print("=" * 72)
+    print(f"{'words':>8} {'legacy ms':>10} {'automaton ms':>13} {'Mwords/s':>9} {'legacy fillers':>15} {'fillers':>8}")
+    for n in args.words:
+        transcript = make_transcript(n, rng)
+        legacy_s = _time(lambda: legacy_analyze(transcript), args.repeat)
+        new_s = _time(lambda: analyzer.analyze(transcript), args.repeat)
+        result = analyzer.analyze(transcript)
+        print(f"{n:>8} {legacy_s * 1000:>10.2f} {new_s * 1000:>13.2f} {n / new_s / 1e6:>9.2f} "
+              f"{legacy_analyze(transcript):>15} {result['filler_words']:>8}")
+
+    batch = [make_transcript(300, rng) for _ in range(args.batch)]
+    batch_s = _time(lambda: [analyzer.analyze(t) for t in batch], args.repeat)
+    print(f"Batch of {args.batch} x 300-word transcripts: {batch_s * 1000:.1f} ms "
+          f"({args.batch / batch_s:,.0f} transcripts/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: API cold start, with an import-time profile
+
+Each run starts a fresh interpreter so nothing is cached in-process:
+  - import:        `import main` alone (what a dev reload or worker boot pays
+                   before the server can listen)
+  - import + warm: `import main` followed by the full warm-up run inline,
+                   i.e. roughly what the old eager import of the crew cost
+  - healthy/ready: a real uvicorn process, polled until /health and then
+                   /ready answer 200
+
+--profile prints the slowest modules of `python -X importtime -c "import main"`
+grouped by top-level package, which is where the deferred imports came from.
+Needs the backend's environment (.env / GROQ_API_KEY_*) like the API itself.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --runs 5 --profile
+"""
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_ONLY = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+IMPORT_AND_WARM = ("import time; t = time.perf_counter(); import main; "
+                   "main.warmup.run(main.warmup_steps()); print(time.perf_counter() - t)")
+
+
+def _python(code: str) -> float:
+    out = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1]) * 1000
+
+
+def _get_status(port: int, path: str) -> int:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+    try:
+        conn.request("GET", path)
+        return conn.getresponse().status
+    except OSError:
+        return 0
+    finally:
+        conn.close()
+
+
+def _serve_until_ready(port: int, timeout: float) -> tuple:
+    """ms from process start to the first 200 from /health and from /ready"""
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+                               "--log-level", "warning"],
+                              cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    healthy = ready = None
+    try:
+        while ready is None and time.perf_counter() - started < timeout:
+            if healthy is None and _get_status(port, "/health") == 200:
+                healthy = (time.perf_counter() - started) * 1000
+            if healthy is not None and _get_status(port, "/ready") == 200:
+                ready = (time.perf_counter() - started) * 1000
+            time.sleep(0.01)
+    finally:
+        server.terminate()
+        server.wait()
+    return healthy, ready
+
+
+def import_profile(top: int):
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                         cwd=BACKEND_DIR, capture_output=True, text=True, check=True)
+    self_us = defaultdict(int)
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        self_us[name.strip().split(".")[0]] += int(own)
+    total = sum(self_us.values())
+    print(f"Import-time profile of main ({total / 1000:.0f} ms), by top-level package:")
+    for package, us in sorted(self_us.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<28} {us / 1000:>8.1f} ms {us / total:>6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for /ready")
+    parser.add_argument("--profile", action="store_true", help="print the import-time profile")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    imports = [_python(IMPORT_ONLY) for _ in range(args.runs)]
+    warmed = [_python(IMPORT_AND_WARM) for _ in range(args.runs)]
+    served = [_serve_until_ready(args.port, args.timeout) for _ in range(args.runs)]
+    healthy = [h for h, _ in served if h is not None]
+    ready = [r for _, r in served if r is not None]
+
+    print("=" * 72)
+    print(f"{'':>16} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    for label, times in (("import", imports), ("import + warm", warmed),
+                         ("/health 200", healthy), ("/ready 200", ready)):
+        if times:
+            print(f"{label:>16} {statistics.median(times):>10.0f} {min(times):>8.0f} {max(times):>8.0f}")
+        else:
+            print(f"{label:>16} {'timed out':>10}")
+    print(f"Listening {statistics.median(warmed) - statistics.median(imports):.0f} ms sooner than with an eager warm-up")
+    if args.profile:
+        print("-" * 72)
+        import_profile(args.top)
+
+
+if __name__ == "__main__":
+    main()
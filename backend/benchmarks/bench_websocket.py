@@ -0,0 +1,158 @@
+"""
+Benchmark: interview WebSocket connections per worker
+
+Starts one uvicorn worker serving the interview channel with a stand-in crew
+(answers take --answer-ms in a worker thread, like an LLM call), opens
+--connections concurrent sockets against it, and reports:
+  - server RSS per open connection
+  - ping round-trip latency with every connection open
+  - answer -> question latency when every connection answers at once
+  - connections that fit one worker under --memory-budget-mb
+
+Usage (from backend/):
+    python -m benchmarks.bench_websocket --connections 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.synthetic import SAMPLE_ANSWERS
+
+
+class _BenchCrew:
+    """Crew stand-in: fixed-latency answers, no LLM"""
+
+    def __init__(self, answer_ms: float):
+        self.answer_ms = answer_ms
+
+    def answer_turn(self, session_id: str, answer: str, seq: int) -> dict:
+        time.sleep(self.answer_ms / 1000)
+        return {"success": True, "seq": seq, "score": 72, "feedback": "Add a concrete metric.",
+                "question": "How did you measure the impact of that change on latency and cost?",
+                "is_followup": True, "confidence": 70}
+
+    def end_interview(self, session_id: str) -> dict:
+        return {"success": True}
+
+
+def _serve(port: int, answer_ms: float):
+    import uvicorn
+    from fastapi import FastAPI, WebSocket
+    from utils.interview_channel import InterviewChannel
+
+    app = FastAPI()
+    crew = _BenchCrew(answer_ms)
+
+    @app.websocket("/ws/interview/{session_id}")
+    async def socket(websocket: WebSocket, session_id: str):
+        # Every simulated client connects from localhost; give each its own admission key
+        await InterviewChannel(websocket, session_id, f"bench:{session_id}").run(crew)
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    return hard
+
+
+async def _wait_for(ws, kind: str):
+    while True:
+        event = json.loads(await ws.recv())
+        if event["type"] == kind:
+            return event
+
+
+async def _client_run(args, server_pid: int):
+    import websockets
+
+    url = f"ws://127.0.0.1:{args.port}/ws/interview/"
+    baseline = _rss_mb(server_pid)
+
+    started = time.perf_counter()
+    sockets = []
+    for i in range(0, args.connections, 100):
+        batch = [websockets.connect(f"{url}bench-{n}", max_queue=None, ping_interval=None)
+                 for n in range(i, min(i + 100, args.connections))]
+        sockets.extend(await asyncio.gather(*batch))
+    await asyncio.gather(*[_wait_for(ws, "ready") for ws in sockets])
+    connect_s = time.perf_counter() - started
+    await asyncio.sleep(0.5)
+    loaded = _rss_mb(server_pid)
+
+    async def ping(ws):
+        sent = time.perf_counter()
+        await ws.send(json.dumps({"type": "ping"}))
+        await _wait_for(ws, "pong")
+        return (time.perf_counter() - sent) * 1000
+
+    pings = sorted(await asyncio.gather(*[ping(ws) for ws in sockets]))
+
+    async def answer(ws):
+        sent = time.perf_counter()
+        await ws.send(json.dumps({"type": "answer", "answer": SAMPLE_ANSWERS[0], "seq": 1}))
+        await _wait_for(ws, "question")
+        return (time.perf_counter() - sent) * 1000
+
+    started = time.perf_counter()
+    answers = sorted(await asyncio.gather(*[answer(ws) for ws in sockets]))
+    answer_s = time.perf_counter() - started
+
+    await asyncio.gather(*[ws.close() for ws in sockets])
+
+    per_conn_kb = (loaded - baseline) * 1024 / len(sockets)
+    p = lambda xs, q: xs[min(len(xs) - 1, int(q * len(xs)))]
+    print("=" * 60)
+    print(f"Connections: {len(sockets):,} opened in {connect_s:.2f}s")
+    print(f"Server RSS: {baseline:.1f} MB idle -> {loaded:.1f} MB ({per_conn_kb:.1f} KB/connection)")
+    print(f"Ping RTT (all open): p50 {statistics.median(pings):.1f} ms, p99 {p(pings, 0.99):.1f} ms")
+    print(f"Answer -> question ({args.answer_ms:.0f} ms crew): p50 {statistics.median(answers):.0f} ms, "
+          f"p99 {p(answers, 0.99):.0f} ms, {len(sockets) / answer_s:,.0f} answers/s")
+    if per_conn_kb > 0:
+        fit = int(args.memory_budget_mb * 1024 / per_conn_kb)
+        print(f"Connections per worker within {args.memory_budget_mb} MB: ~{fit:,} "
+              f"(fd limit {_raise_fd_limit():,})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--answer-ms", type=float, default=50.0)
+    parser.add_argument("--memory-budget-mb", type=int, default=512)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    _raise_fd_limit()
+    if args.serve:
+        _serve(args.port, args.answer_ms)
+        return
+
+    server = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_websocket", "--serve",
+                               "--port", str(args.port), "--answer-ms", str(args.answer_ms)],
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        time.sleep(2.0)
+        asyncio.run(_client_run(args, server.pid))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
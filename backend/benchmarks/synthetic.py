@@ -0,0 +1,66 @@
+"""
+Synthetic interview data shared by the benchmark scripts
+"""
+from typing import Dict, List
+import random
+
+ROLES = ["Software Engineer", "Data Scientist", "Product Manager", "DevOps Engineer"]
+DIFFICULTIES = ["Easy", "Medium", "Hard", "Expert"]
+EXPERIENCES = ["0-1", "1-2", "2-3", "3-5", "5+"]
+TOPICS = ["introduction", "followup", "hard_followup", "different_question"]
+
+SAMPLE_ANSWERS = [
+    "I built a REST API in Python with FastAPI and PostgreSQL, and um, I focused on caching to cut latency.",
+    "Basically I would, you know, first reproduce the bug, then add logging and bisect the commits.",
+    "In my last project we trained a gradient boosted model and tracked precision and recall on a holdout set.",
+    "I prioritise features using impact versus effort and talk to users every week to validate assumptions.",
+    "I'm not sure, maybe I would kind of restart the service and see if it works.",
+]
+
+
+def make_scores(rng: random.Random) -> Dict:
+    """Random but plausible per-dimension scores"""
+    base = rng.gauss(70, 12)
+    scores = {
+        dim: int(max(0, min(100, rng.gauss(base, 8))))
+        for dim in ("domain_knowledge", "communication", "confidence", "depth")
+    }
+    scores["final_score"] = round(
+        scores["domain_knowledge"] * 0.3 + scores["communication"] * 0.25
+        + scores["confidence"] * 0.2 + scores["depth"] * 0.25
+    )
+    scores["feedback"] = "Good structure; add a concrete metric to show impact."
+    return scores
+
+
+def make_interaction_blocks(n: int, rng: random.Random) -> List[Dict]:
+    """Interaction blocks shaped like the ones process_answer stores"""
+    blocks = []
+    for i in range(n):
+        scores = make_scores(rng)
+        blocks.append({
+            "question": f"Question {i + 1}: tell me about a challenging problem you solved.",
+            "answer": rng.choice(SAMPLE_ANSWERS),
+            "feedback": scores["feedback"],
+            "score": scores["final_score"],
+            "scores": scores,
+        })
+    return blocks
+
+
+def make_session_summary(session_id: str, n_interactions: int = 8, seed: int = 0) -> Dict:
+    """A session summary shaped like SessionMemoryManager.get_session_summary"""
+    rng = random.Random(seed)
+    blocks = make_interaction_blocks(n_interactions, rng)
+    average = sum(b["score"] for b in blocks) / len(blocks) if blocks else 0.0
+    return {
+        "session_id": session_id,
+        "role": rng.choice(ROLES),
+        "experience": rng.choice(EXPERIENCES),
+        "difficulty": rng.choice(DIFFICULTIES),
+        "total_questions": n_interactions + 1,
+        "total_interactions": n_interactions,
+        "topics_covered": sorted({rng.choice(TOPICS) for _ in range(n_interactions)}),
+        "average_score": average,
+        "interaction_blocks": blocks,
+    }
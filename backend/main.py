@@ -1,16 +1,56 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Response, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Union
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+import asyncio
+import importlib
 import os
 import json
+import threading
+import time
+
+from utils.speech_analysis import analyze_transcripts
+from utils.cpu_pool import cpu_pool, CpuPoolBusy
+from utils.admission import admission, admission_key, AdmissionRejected
+from utils.llm_scheduler import llm_scheduler
+from utils.singleflight import llm_singleflight
+from utils.token_usage import set_llm_endpoint
+from memory.token_ledger import token_ledger
+from utils.speech_stream import speech_stream_manager
+from utils.audio_analysis import audio_analyzer, AudioFormatError
+from utils.question_bank import role_questions
+from utils.skill_taxonomy import skill_extractor, profile_digest
+from memory.session_memory import session_manager, AnswerSequenceError
+from utils.warmup import warmup, WARMUP_IN_BACKGROUND
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI(title="Interview Practice Partner API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the agents and heavy dependencies up once the server is listening (see /ready)"""
+    task = asyncio.create_task(run_in_threadpool(warmup.run, warmup_steps()))
+    if not WARMUP_IN_BACKGROUND:
+        await task
+    yield
+    cpu_pool.shutdown()
+
+app = FastAPI(title="Interview Practice Partner API", lifespan=lifespan)
+
+@app.exception_handler(CpuPoolBusy)
+async def cpu_pool_busy_handler(request: Request, exc: CpuPoolBusy):
+    """Too much CPU-bound work queued: ask the client to retry rather than queueing without bound"""
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """Shed crew requests: 429 with the time the admission queue needs to drain"""
+    return JSONResponse(status_code=429, headers={"Retry-After": str(exc.retry_after)},
+                        content={"detail": str(exc), "reason": exc.reason, "retry_after": exc.retry_after})
 
 # Configure CORS
 app.add_middleware(
@@ -64,24 +104,30 @@ class LoginRequest(BaseModel):
     email: str
     password: str
 
-class CrewInterviewStartRequest(BaseModel):
+class CrewInterviewRequest(BaseModel):
     session_id: str
-    role: str
-    experience: str
-    difficulty: str
-    resume_text: Optional[str] = None
 
-class CrewInterviewAnswerRequest(BaseModel):
-    session_id: str
-    role: str
-    experience: str
-    difficulty: str
-    resume_text: Optional[str] = None
-    user_message: str
-    conversation_history: Optional[List[dict]] = None
+class SpeechChunk(BaseModel):
+    text: str
+    start: Optional[float] = None  # seconds since the answer started
+    end: Optional[float] = None
 
-class CrewInterviewRequest(BaseModel):
-    session_id: str
+class SpeechAnalysisRequest(BaseModel):
+    transcript: Optional[str] = ""
+    duration_seconds: Optional[float] = None
+
+class SpeechBatchRequest(BaseModel):
+    # Plain strings, or objects with a duration for words per minute
+    transcripts: List[Union[str, SpeechAnalysisRequest]]
+
+class SpeechStreamStartRequest(BaseModel):
+    session_id: Optional[str] = None
+
+class SpeechStreamChunkRequest(BaseModel):
+    text: Optional[str] = None
+    start: Optional[float] = None
+    end: Optional[float] = None
+    chunks: Optional[List[SpeechChunk]] = None
 
 # ==================== Session Storage ====================
 # In production, use a database. For now, in-memory storage.
@@ -109,42 +155,7 @@ def get_difficulty_level(experience: str) -> str:
 # Placeholder for removed functions
 def get_fallback_questions(role: str, experience: str, difficulty: str) -> List[str]:
     """Fallback questions if Gemini fails"""
-    
-    base_questions = {
-        "Software Engineer": [
-            "Tell me about yourself and your software development experience.",
-            "Describe your most challenging project and how you solved it.",
-            "How do you approach debugging a complex issue?",
-            "What design patterns are you familiar with?",
-            "How do you handle code reviews and feedback?",
-            "What's your experience with testing and CI/CD?"
-        ],
-        "Data Scientist": [
-            "Tell me about your experience with machine learning.",
-            "Walk me through a data science project you've worked on.",
-            "How do you handle missing data in a dataset?",
-            "Explain the difference between supervised and unsupervised learning.",
-            "What metrics do you use to evaluate model performance?",
-            "How do you prevent overfitting in your models?"
-        ],
-        "Product Manager": [
-            "Tell me about your product management experience.",
-            "Describe a product you've worked on and its impact.",
-            "How do you prioritize features?",
-            "What's your approach to user research?",
-            "How do you measure product success?",
-            "Tell me about a difficult stakeholder situation you handled."
-        ]
-    }
-    
-    return base_questions.get(role, [
-        "Tell me about yourself.",
-        "Why are you interested in this role?",
-        "Describe your greatest strength.",
-        "Tell me about a challenge you overcame.",
-        "Where do you see yourself in 5 years?",
-        "Why should we hire you?"
-    ])
+    return role_questions(role)
 
 def evaluate_answer(
     role: str,
@@ -213,7 +224,7 @@ Evaluate now:"""
 def parse_resume(resume_text: Optional[str]) -> dict:
     """
     Parse resume to extract skills, projects, and experience
-    Uses Gemini to intelligently extract key information
+    Uses the local skill taxonomy - no LLM call
     """
     if not resume_text or resume_text.lower() in ["no resume", "none", ""]:
         print("\n" + "="*80)
@@ -227,115 +238,24 @@ def parse_resume(resume_text: Optional[str]) -> dict:
             "summary": "No resume provided"
         }
     
-    if not GEMINI_API_KEY:
-        print("\n" + "="*80)
-        print("📄 RESUME EXTRACTION")
-        print("="*80)
-        print("⚠️  API key not configured - using fallback\n")
-        return {
-            "skills": [],
-            "projects": [],
-            "experience": [],
-            "summary": resume_text[:500]  # Return first 500 chars as fallback
-        }
-    
-    prompt = f"""Analyze this resume and extract key information in JSON format.
-
-RESUME:
-{resume_text}
-
-Extract and return ONLY a JSON object with these keys:
-{{
-    "skills": ["skill1", "skill2", "skill3", ...],  (top 10 technical skills)
-    "projects": ["project1: brief description", "project2: brief description", ...],  (top 5 projects/achievements)
-    "experience": ["role1: company, duration", "role2: company, duration", ...],  (top 5 roles)
-    "summary": "2-3 sentence summary of candidate's background"
-}}
-
-Focus on:
-- Technical skills and technologies
-- Significant projects and achievements
-- Relevant work experience
-- Key accomplishments
-
-Return ONLY the JSON, no other text."""
-
-    try:
-        print("\n" + "="*80)
-        print("📄 RESUME EXTRACTION")
-        print("="*80)
-        print(f"📥 Resume received ({len(resume_text)} characters)\n")
-        
-        model = genai.GenerativeModel("gemini-2.0-flash")
-        response = model.generate_content(prompt)
-        
-        response_text = response.text.strip()
-        
-        # Extract JSON
-        if "{" in response_text and "}" in response_text:
-            start = response_text.index("{")
-            end = response_text.rindex("}") + 1
-            json_str = response_text[start:end]
-            parsed = json.loads(json_str)
-            
-            # Print extracted content
-            print("✅ EXTRACTED CONTENT:\n")
-            
-            # Summary
-            print("📝 SUMMARY:")
-            print(f"   {parsed.get('summary', 'N/A')}\n")
-            
-            # Skills
-            print("🛠️  TOP SKILLS:")
-            skills = parsed.get('skills', [])
-            if skills:
-                for i, skill in enumerate(skills, 1):
-                    print(f"   {i}. {skill}")
-            else:
-                print("   (No skills extracted)")
-            print()
-            
-            # Projects
-            print("🚀 TOP PROJECTS:")
-            projects = parsed.get('projects', [])
-            if projects:
-                for i, project in enumerate(projects, 1):
-                    print(f"   {i}. {project}")
-            else:
-                print("   (No projects extracted)")
-            print()
-            
-            # Experience
-            print("💼 WORK EXPERIENCE:")
-            experience = parsed.get('experience', [])
-            if experience:
-                for i, exp in enumerate(experience, 1):
-                    print(f"   {i}. {exp}")
-            else:
-                print("   (No experience extracted)")
-            print()
-            
-            print("="*80)
-            print("✓ Resume extraction complete!\n")
-            
-            return parsed
-        else:
-            print("⚠️  Could not parse JSON response\n")
-            return {
-                "skills": [],
-                "projects": [],
-                "experience": [],
-                "summary": response_text[:500]
-            }
+    print("\n" + "="*80)
+    print("📄 RESUME EXTRACTION")
+    print("="*80)
+    print(f"📥 Resume received ({len(resume_text)} characters)\n")
     
-    except Exception as e:
-        print(f"\n❌ Error parsing resume: {e}\n")
-        return {
-            "skills": [],
-            "projects": [],
-            "experience": [],
-            "summary": resume_text[:500]
-        }
+    profile = skill_extractor.profile(resume_text)
+    parsed = {
+        "skills": [skill["name"] for skill in profile["skills"][:10]],
+        "projects": profile["projects"][:5],
+        "experience": profile["roles"][:5],
+        "years_experience": profile["years_experience"],
+        "summary": resume_text[:500]
+    }
+    print("✅ EXTRACTED CONTENT:\n")
+    print(profile_digest(profile))
+    print("="*80)
+    print("✓ Resume extraction complete!\n")
+    return parsed
 
 def conversational_interview(
     role: str,
@@ -688,34 +608,123 @@ async def set_difficulty(request: dict):
 #         print(f"Error: {e}")
 #         raise HTTPException(status_code=500, detail=str(e))
 
+MAX_SPEECH_BATCH = 500
+# Requests with more transcript text than this are analyzed in the CPU pool
+SPEECH_INLINE_MAX_CHARS = int(os.getenv("SPEECH_INLINE_MAX_CHARS", "20000"))
+
+async def _analyze_transcripts(items: List[tuple]) -> List[Dict]:
+    """Speech metrics for (transcript, duration_seconds) pairs, off the event loop when large"""
+    if sum(len(transcript) for transcript, _ in items) <= SPEECH_INLINE_MAX_CHARS:
+        return analyze_transcripts(items)
+    return await cpu_pool.run(analyze_transcripts, items)
+
 @app.post("/analyze-speech")
-async def analyze_speech(request: dict):
+async def analyze_speech(request: SpeechAnalysisRequest):
     """
-    Analyze speech quality (filler words, pace, clarity)
+    Analyze speech quality (filler words, hedges, repetitions, pace, clarity)
+    Pass `duration_seconds` to get a real words-per-minute figure
     """
-    transcript = request.get("transcript", "")
-    
-    # Simple analysis
-    filler_words = ["um", "uh", "like", "you know", "so", "actually", "basically", "right", "kind of"]
-    words = transcript.lower().split()
-    filler_count = sum(1 for word in words if word.strip(".,!?;:") in filler_words)
-    total_words = len(words)
-    
-    filler_ratio = (filler_count / total_words * 100) if total_words > 0 else 0
-    wpm = max(80, min(160, len(words) // 2))  # Estimate WPM
+    result = (await _analyze_transcripts([(request.transcript or "", request.duration_seconds)]))[0]
+    return {"success": True, **result}
+
+@app.post("/analyze-speech/batch")
+async def analyze_speech_batch(request: SpeechBatchRequest):
+    """
+    Analyze many transcripts in one request
+    Request: { "transcripts": ["...", {"transcript": "...", "duration_seconds": 42}] }
+    """
+    items = request.transcripts
+    if len(items) > MAX_SPEECH_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_SPEECH_BATCH} transcripts per batch")
     
-    clarity_score = 100 - min(filler_ratio * 2, 50)
-    confidence_score = 100 - min(filler_ratio, 30)
+    pairs = [
+        (item, None) if isinstance(item, str) else (item.transcript or "", item.duration_seconds)
+        for item in items
+    ]
+    results = await _analyze_transcripts(pairs)
     
+    total_words = sum(r["total_words"] for r in results)
+    total_fillers = sum(r["filler_words"] for r in results)
     return {
         "success": True,
-        "filler_words": filler_count,
-        "filler_ratio": filler_ratio,
-        "words_per_minute": wpm,
-        "clarity_score": clarity_score,
-        "confidence_score": confidence_score
+        "count": len(results),
+        "results": results,
+        "total_words": total_words,
+        "total_filler_words": total_fillers,
+        "filler_ratio": (total_fillers / total_words * 100) if total_words else 0
     }
 
+MAX_AUDIO_BYTES = int(os.getenv("MAX_AUDIO_BYTES", 100 * 1024 * 1024))
+
+@app.post("/analyze-audio")
+async def analyze_audio(
+    file: UploadFile = File(...),
+    session_id: Optional[str] = None,
+    sample_rate: Optional[int] = None,
+    channels: int = 1,
+    sample_width: int = 2,
+    word_count: Optional[int] = None
+):
+    """
+    Analyze answer audio (WAV, or raw little-endian PCM with sample_rate) for
+    pace, pauses and long silences. With a session_id, the result is blended
+    into the confidence and communication scores of the current answer.
+    """
+    if file.size is not None and file.size > MAX_AUDIO_BYTES:
+        raise HTTPException(status_code=413, detail="Audio file too large")
+    try:
+        # The upload is spooled to disk by Starlette; the analyzer reads it in chunks
+        metrics = await run_in_threadpool(
+            audio_analyzer.analyze_file, file.file, sample_rate, channels, sample_width, word_count
+        )
+    except AudioFormatError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    finally:
+        await file.close()
+    
+    if session_id:
+        session_manager.set_audio_metrics(session_id, metrics)
+    return {"success": True, **metrics}
+
+@app.post("/speech-stream/start")
+async def speech_stream_start(request: SpeechStreamStartRequest):
+    """Open a live speech-analytics stream for an answer"""
+    stream = speech_stream_manager.start(request.session_id)
+    return {"success": True, "stream_id": stream.stream_id}
+
+@app.post("/speech-stream/{stream_id}/chunk")
+async def speech_stream_chunk(stream_id: str, request: SpeechStreamChunkRequest):
+    """
+    Append transcript chunk(s) and return the updated live stats
+    Send either a single `text`/`start`/`end` chunk or a `chunks` list
+    """
+    chunks = [c.model_dump() for c in request.chunks] if request.chunks else []
+    if request.text is not None:
+        chunks.append({"text": request.text, "start": request.start, "end": request.end})
+    try:
+        stream = speech_stream_manager.add_chunks(stream_id, chunks)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Speech stream not found")
+    return {"success": True, **stream.stats()}
+
+@app.get("/speech-stream/{stream_id}")
+async def speech_stream_stats(stream_id: str):
+    """Live stats for a stream, without reprocessing the transcript"""
+    stream = speech_stream_manager.get(stream_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Speech stream not found")
+    return {"success": True, **stream.stats()}
+
+@app.post("/speech-stream/{stream_id}/end")
+async def speech_stream_end(stream_id: str):
+    """Close a stream and return its final stats"""
+    stats = speech_stream_manager.end(stream_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Speech stream not found")
+    return {"success": True, **stats}
+
 @app.post("/generate-report")
 async def generate_report(request: dict):
     """
@@ -764,119 +773,379 @@ Generate report:"""
 
 # ==================== CREW AI ORCHESTRATOR ====================
 
-from models.schemas import CrewInterviewRequest, CrewInterviewResponse
-from agents.interview_crew import InterviewCrew as CrewAIInterviewCrew
-
-# Initialize crew
-interview_crew = CrewAIInterviewCrew()
+from models.schemas import (
+    CrewInterviewRequest, CrewInterviewResponse,
+    CrewInterviewStartRequest, CrewInterviewAnswerRequest, CrewInterviewTurnRequest
+)
+from utils.report_cache import report_filename, session_id_from_filename
+from utils.report_service import report_service
+from utils.report_store import is_valid_report_id
+from memory.analytics_store import analytics_store
+from memory.resume_artifacts import resume_artifacts
+from utils.interview_channel import InterviewChannel, channel_registry, CLOSE_SESSION_NOT_FOUND
+from utils.resume_extractor import resume_extractor, ResumeFormatError, RESUME_MAX_BYTES, load_pdf_reader
+from utils.question_bank import select_questions
+from memory.percentile_index import percentile_index
+
+# The crew (crewai plus four agents) is built by the warm-up, not at import
+_interview_crew = None
+_interview_crew_lock = threading.Lock()
+
+def get_interview_crew():
+    """The CrewAI orchestrator, built on first use"""
+    global _interview_crew
+    if _interview_crew is None:
+        with _interview_crew_lock:
+            if _interview_crew is None:
+                from agents.interview_crew import InterviewCrew as CrewAIInterviewCrew
+                _interview_crew = CrewAIInterviewCrew()
+    return _interview_crew
+
+async def interview_crew():
+    """get_interview_crew for async endpoints; builds off the event loop if the warm-up has not yet"""
+    if _interview_crew is not None:
+        return _interview_crew
+    return await run_in_threadpool(get_interview_crew)
+
+def warmup_steps():
+    """What has to be loaded before this process reports ready"""
+    return [
+        ("interview_crew", get_interview_crew),
+        ("question_bank", lambda: select_questions(skill_extractor.profile("Python, SQL and Docker"), "Software Engineer")),
+        ("resume_artifacts", resume_artifacts.stats),
+        ("percentile_index", percentile_index.stats),
+        ("pdf_generator", lambda: importlib.import_module("utils.pdf_generator")),
+        ("pdf_reader", load_pdf_reader),
+        # After the imports above, so the workers preload every registered job module
+        ("cpu_pool", cpu_pool.start),
+    ]
 
 # Using CrewAI-based implementation above
 
+# ==================== RESUME UPLOAD ====================
+
+@app.post("/upload-resume")
+async def upload_resume(file: UploadFile = File(...)):
+    """
+    Upload a PDF, DOCX or text resume and extract its text server-side.
+    Returns a resume_id (the content hash) to pass to /crew-interview-start
+    instead of the text; re-uploading the same file is never parsed twice.
+    """
+    if file.size is not None and file.size > RESUME_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="Resume file too large")
+    try:
+        # The upload is spooled by Starlette; it is hashed in chunks and parsed on the resume pool
+        future, cached = await run_in_threadpool(resume_extractor.submit, file.file, file.filename or "")
+        entry = await asyncio.wrap_future(future)
+    except ResumeFormatError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    finally:
+        await file.close()
+    
+    return {
+        "success": True,
+        "resume_id": entry["resume_id"],
+        "format": entry["format"],
+        "pages": entry["pages"],
+        "chars": entry["chars"],
+        "size_bytes": entry["size_bytes"],
+        "cached": cached,
+        "preview": entry["text"][:500]
+    }
+
+def _resolve_resume_text(resume_id: Optional[str], resume_text: Optional[str]) -> str:
+    """Resume text for a request: the uploaded resume when an id is given, else the inline text"""
+    if resume_id:
+        text = resume_extractor.get_text(resume_id)
+        if text is None:
+            raise HTTPException(status_code=404, detail="Unknown resume_id - upload the resume again")
+        return text
+    return resume_text or ""
+
 # ==================== CREW ENDPOINTS ====================
 
 @app.post("/crew-interview-start")
-async def crew_interview_start(request: CrewInterviewStartRequest):
+async def crew_interview_start(request: CrewInterviewStartRequest, http_request: Request):
     """Start a new interview with the crew"""
-    try:
-        question = interview_crew.start_interview(
-            session_id=request.session_id,
-            role=request.role,
-            experience=request.experience,
-            difficulty=request.difficulty,
-            resume_text=request.resume_text or ""
-        )
-        
-        return CrewInterviewResponse(
-            success=True,
-            question=question,
-            session_id=request.session_id
-        ).model_dump()
+    resume_text = _resolve_resume_text(request.resume_id, request.resume_text)
+    set_llm_endpoint("/crew-interview-start")
+    crew = await interview_crew()
+    async with admission.admit(admission_key(http_request)):
+        try:
+            question = await run_in_threadpool(
+                crew.start_interview,
+                session_id=request.session_id,
+                role=request.role,
+                experience=request.experience,
+                difficulty=request.difficulty,
+                resume_text=resume_text
+            )
+        except Exception as e:
+            print(f"Error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
     
-    except Exception as e:
-        print(f"Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return CrewInterviewResponse(
+        success=True,
+        question=question,
+        session_id=request.session_id
+    ).model_dump()
 
 @app.post("/crew-interview-answer")
-async def crew_interview_answer(request: CrewInterviewAnswerRequest):
+async def crew_interview_answer(request: CrewInterviewAnswerRequest, http_request: Request):
     """Process user answer through the crew"""
-    try:
-        result = interview_crew.process_answer(
-            session_id=request.session_id,
-            user_answer=request.user_message,
-            role=request.role,
-            experience=request.experience,
-            difficulty=request.difficulty,
-            resume_text=request.resume_text or "",
-            conversation_history=request.conversation_history or []
-        )
-        
-        return result
+    set_llm_endpoint("/crew-interview-answer")
+    crew = await interview_crew()
+    async with admission.admit(admission_key(http_request)):
+        try:
+            return await run_in_threadpool(
+                crew.process_answer,
+                session_id=request.session_id,
+                user_answer=request.user_message,
+                role=request.role,
+                experience=request.experience,
+                difficulty=request.difficulty,
+                resume_text=request.resume_text or "",
+                conversation_history=request.conversation_history or []
+            )
+        except Exception as e:
+            print(f"Error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/crew-interview-turn")
+async def crew_interview_turn(request: CrewInterviewTurnRequest, http_request: Request):
+    """Process an answer sent as a delta; role, resume and history come from session memory"""
+    set_llm_endpoint("/crew-interview-turn")
+    crew = await interview_crew()
+    async with admission.admit(admission_key(http_request)):
+        try:
+            result = await run_in_threadpool(crew.answer_turn, request.session_id, request.answer, request.seq)
+        except AnswerSequenceError as e:
+            raise HTTPException(status_code=409, detail={
+                "error": str(e),
+                "expected_seq": e.expected,
+                "transcript_length": len(session_manager.get_transcript(request.session_id)),
+            })
+        except Exception as e:
+            print(f"Error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
     
-    except Exception as e:
-        print(f"Error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if not result.get("success") and result.get("error") == "Session not found":
+        raise HTTPException(status_code=404, detail="Session not found")
+    return result
+
+@app.get("/crew-interview-transcript/{session_id}")
+async def crew_interview_transcript(session_id: str, since: int = 0):
+    """Authoritative transcript, optionally only the turns from index `since`"""
+    session = session_manager.get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {
+        "success": True,
+        "session_id": session_id,
+        "answer_seq": session["answer_seq"],
+        "turns": session_manager.get_transcript(session_id, max(0, since)),
+    }
+
+@app.get("/crew-interview-usage/{session_id}")
+async def crew_interview_usage(session_id: str):
+    """Token usage and budget mode of a running interview"""
+    usage = session_manager.get_token_usage(session_id)
+    if usage is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"success": True, "session_id": session_id, "usage": usage,
+            "budget_mode": token_ledger.budget_mode(session_id)}
+
+@app.get("/crew-interview-scores/{session_id}")
+async def crew_interview_scores(session_id: str, since: int = 0):
+    """Scores of each interaction from index `since`; deferred ones show status "pending" until ready"""
+    if session_manager.get_session(session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    interactions = session_manager.get_interaction_scores(session_id, max(0, since))
+    return {
+        "success": True,
+        "session_id": session_id,
+        "pending": sum(1 for i in interactions if i["status"] == "pending"),
+        "interactions": interactions,
+    }
+
+@app.websocket("/ws/interview/{session_id}")
+async def interview_socket(websocket: WebSocket, session_id: str):
+    """Persistent interview channel: answers in; question tokens, scores, speech stats and the report out"""
+    if session_manager.get_session(session_id) is None:
+        await websocket.accept()
+        await websocket.close(code=CLOSE_SESSION_NOT_FOUND, reason="Session not found")
+        return
+    await InterviewChannel(websocket, session_id, admission_key(websocket)).run(await interview_crew())
+
+@app.get("/ws-stats")
+async def ws_stats():
+    """Open interview channels and dropped (backpressured) events"""
+    return {"success": True, "stats": channel_registry.stats()}
 
 @app.post("/crew-interview-end")
-async def crew_interview_end(request: CrewInterviewRequest):
+async def crew_interview_end(request: CrewInterviewRequest, http_request: Request):
     """End interview and get final report"""
-    try:
-        print(f"\n🛑 /crew-interview-end called with session_id: {request.session_id}")
-        result = interview_crew.end_interview(request.session_id)
-        print(f"✅ end_interview returned: {type(result)}")
-        print(f"   Keys: {result.keys() if isinstance(result, dict) else 'N/A'}")
-        print(f"   Success: {result.get('success', 'N/A')}")
-        print(f"   Has report: {bool(result.get('report'))}")
-        print(f"   Has summary: {bool(result.get('summary'))}")
-        print(f"   Has pdf_filename: {bool(result.get('pdf_filename'))}")
-        return result
-    
-    except Exception as e:
-        print(f"❌ Error in /crew-interview-end: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+    set_llm_endpoint("/crew-interview-end")
+    crew = await interview_crew()
+    async with admission.admit(admission_key(http_request)):
+        try:
+            print(f"\n🛑 /crew-interview-end called with session_id: {request.session_id}")
+            result = await run_in_threadpool(crew.end_interview, request.session_id)
+            print(f"✅ end_interview returned: {type(result)}")
+            print(f"   Keys: {result.keys() if isinstance(result, dict) else 'N/A'}")
+            print(f"   Success: {result.get('success', 'N/A')}")
+            print(f"   Has report: {bool(result.get('report'))}")
+            print(f"   Has summary: {bool(result.get('summary'))}")
+            print(f"   Has pdf_filename: {bool(result.get('pdf_filename'))}")
+            return result
+        
+        except Exception as e:
+            print(f"❌ Error in /crew-interview-end: {e}")
+            import traceback
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/admission-stats")
+async def admission_stats():
+    """Crew admission slots in use, queue depth, drain rate and shed counts"""
+    return {"success": True, "stats": admission.stats()}
+
+@app.get("/llm-scheduler-stats")
+async def llm_scheduler_stats():
+    """LLM slots in use, queueing delay per priority class, and coalesced identical prompts"""
+    return {"success": True, "stats": llm_scheduler.stats(), "coalescing": llm_singleflight.stats()}
+
+@app.get("/token-usage-stats")
+async def token_usage_stats():
+    """Tokens and estimated cost of every LLM call, by agent, endpoint and model"""
+    return {"success": True, "stats": token_ledger.stats()}
+
+REPORT_STREAM_CHUNK_SIZE = 64 * 1024
+
+def _stream_bytes(data: bytes, chunk_size: int = REPORT_STREAM_CHUNK_SIZE):
+    """Yield a cached report in chunks without copying it"""
+    view = memoryview(data)
+    for offset in range(0, len(view), chunk_size):
+        yield bytes(view[offset:offset + chunk_size])
 
 @app.get("/download-report")
-async def download_report(filepath: str = None):
-    """Download interview report PDF"""
+async def download_report(request: Request, report_id: str = None, filepath: str = None):
+    """Download interview report PDF (rendered on first request, then streamed from cache)"""
     try:
-        if not filepath:
-            raise HTTPException(status_code=400, detail="filepath parameter required")
+        if not report_id and not filepath:
+            raise HTTPException(status_code=400, detail="report_id or filepath parameter required")
         
-        # If filepath is just filename, look in reports directory
-        if not os.path.isabs(filepath):
-            report_dir = os.path.join(os.path.dirname(__file__), 'reports')
-            file_path = os.path.join(report_dir, filepath)
-        else:
-            file_path = filepath
+        # Older clients pass the report filename; only bare report filenames
+        # are accepted, never paths
+        if not report_id:
+            report_id = session_id_from_filename(filepath)
+            if not report_id or filepath != os.path.basename(filepath) or os.path.isabs(filepath):
+                raise HTTPException(status_code=400, detail="Invalid report filename")
         
-        # Security check: ensure file exists and is accessible
-        if not os.path.exists(file_path):
-            print(f"❌ File not found: {file_path}")
-            raise HTTPException(status_code=404, detail=f"Report not found: {file_path}")
+        if not is_valid_report_id(report_id):
+            raise HTTPException(status_code=400, detail="Invalid report id")
         
-        # Get just the filename for the download
-        filename = os.path.basename(file_path)
+        cached = await run_in_threadpool(report_service.get_or_render, report_id)
+        if cached is None:
+            print(f"❌ Report not found: {report_id or filepath}")
+            raise HTTPException(status_code=404, detail="Report not found")
         
-        print(f"✅ Downloading report: {file_path}")
+        digest, pdf_bytes = cached
+        etag = f'"{digest}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, max-age=3600",
+        }
+        
+        # Conditional GET: the client already has this exact report
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+        
+        headers["Content-Length"] = str(len(pdf_bytes))
+        headers["Content-Disposition"] = f'attachment; filename="{report_filename(report_id)}"'
+        
+        print(f"✅ Streaming report: {report_id} ({len(pdf_bytes)} bytes)")
         
-        return FileResponse(
-            path=file_path,
-            filename=filename,
-            media_type="application/pdf"
+        return StreamingResponse(
+            _stream_bytes(pdf_bytes),
+            media_type="application/pdf",
+            headers=headers
         )
     
-    except HTTPException:
+    except (HTTPException, CpuPoolBusy):
         raise
     except Exception as e:
         print(f"❌ Error downloading report: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/report-stats")
+async def report_stats():
+    """Lazy report rendering counters (CPU saved, first vs repeat download latency)"""
+    return {"success": True, "stats": report_service.stats()}
+
+@app.get("/cpu-pool-stats")
+async def cpu_pool_stats():
+    """CPU worker pool occupancy and job counters"""
+    return {"success": True, "stats": cpu_pool.stats()}
+
+@app.get("/resume-stats")
+async def resume_stats():
+    """Resume extraction and cross-session artifact cache counters"""
+    return {"success": True, "stats": resume_extractor.stats(), "artifacts": resume_artifacts.stats()}
+
+# ==================== Cohort Analytics ====================
+
+def _analytics_filters(role: Optional[str], difficulty: Optional[str], experience: Optional[str],
+                       days: Optional[int]) -> dict:
+    since = time.time() - days * 86400 if days else None
+    return {"role": role, "difficulty": difficulty, "experience": experience, "since": since}
+
+@app.get("/analytics/cohort")
+async def analytics_cohort(role: Optional[str] = None, difficulty: Optional[str] = None,
+                           experience: Optional[str] = None, days: Optional[int] = None):
+    """Score distributions, percentiles and dimension correlations for a cohort of finished interviews"""
+    filters = _analytics_filters(role, difficulty, experience, days)
+    stats = await run_in_threadpool(analytics_store.cohort_stats, **filters)
+    correlations = await run_in_threadpool(analytics_store.correlations, **filters)
+    return {"success": True, "filters": filters, "cohort": stats, "correlations": correlations}
+
+@app.get("/analytics/trends")
+async def analytics_trends(bucket: str = "week", dimension: str = "final_score", role: Optional[str] = None,
+                           difficulty: Optional[str] = None, experience: Optional[str] = None,
+                           days: Optional[int] = None):
+    """Mean score per day / week / month"""
+    filters = _analytics_filters(role, difficulty, experience, days)
+    try:
+        trends = await run_in_threadpool(analytics_store.trends, bucket, dimension, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, "filters": filters, "trends": trends}
+
+@app.get("/analytics/breakdown")
+async def analytics_breakdown(by: str = "role", role: Optional[str] = None, difficulty: Optional[str] = None,
+                              experience: Optional[str] = None, days: Optional[int] = None):
+    """Mean of every score dimension per role, difficulty or experience level"""
+    filters = _analytics_filters(role, difficulty, experience, days)
+    try:
+        breakdown = await run_in_threadpool(analytics_store.breakdown, by, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"success": True, "filters": filters, "breakdown": breakdown, "categories": analytics_store.categories()}
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "Interview Practice Partner API"}
 
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """Readiness: 200 once the startup warm-up has finished, 503 before (or if it failed)"""
+    status = warmup.status()
+    if not status["ready"]:
+        response.status_code = 503
+    return status
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
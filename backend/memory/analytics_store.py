@@ -0,0 +1,304 @@
+"""
+Analytics Store - Columnar, NumPy-backed history of scored interactions
+Finished sessions are kept as one contiguous NumPy array per column (one
+row per interaction block). Cohort statistics, percentiles, correlations and
+trends are computed with vectorized masks and reductions over the columns.
+
+On disk the rows live in an append-only binary file of fixed-size records
+(np.tofile) and the categorical dictionaries (roles, difficulties, experience
+levels) in a small JSON sidecar, so recording a session costs
+O(interactions), not O(history). Roles are free text from the client, so
+they are stored as taxonomy roles ("other" for the rest) and every
+dictionary is capped, which keeps the sidecar small and the int16 codes in
+range.
+"""
+from typing import Dict, List, Optional
+from datetime import datetime
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from utils.skill_taxonomy import skill_extractor
+
+DIMENSIONS = ("domain_knowledge", "communication", "confidence", "depth", "final_score")
+
+ROW_DTYPE = np.dtype([
+    ("ts", "<f8"),
+    ("session", "<i4"),
+    ("seq", "<i2"),
+    ("role", "<i2"),
+    ("difficulty", "<i2"),
+    ("experience", "<i2"),
+    ("domain_knowledge", "<f4"),
+    ("communication", "<f4"),
+    ("confidence", "<f4"),
+    ("depth", "<f4"),
+    ("final_score", "<f4"),
+])
+
+CATEGORIES = ("role", "difficulty", "experience")
+OTHER_CATEGORY = "other"
+MAX_CATEGORY_VALUES = 64  # per category; new values past the cap share OTHER_CATEGORY
+
+DEFAULT_ANALYTICS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'analytics')
+
+PERCENTILES = (10, 25, 50, 75, 90)
+SCORE_RESOLUTION = 10  # scores are stored rounded to 0.1, so 1001 exact counting bins cover 0-100
+BUCKET_SECONDS = {"day": 86400, "week": 7 * 86400, "month": 30 * 86400}
+
+
+def _percentiles(counts: np.ndarray, grid: np.ndarray, percentiles=PERCENTILES) -> List[float]:
+    """Linear-interpolated percentiles (same as np.percentile) from a counting histogram"""
+    cumulative = np.cumsum(counts)
+    ranks = np.asarray(percentiles, dtype=np.float64) / 100 * (cumulative[-1] - 1)
+    lower = grid[np.searchsorted(cumulative, np.floor(ranks), side="right")]
+    upper = grid[np.searchsorted(cumulative, np.ceil(ranks), side="right")]
+    return (lower + (upper - lower) * (ranks - np.floor(ranks))).tolist()
+
+
+def category_label(name: str, value: Optional[str]) -> str:
+    """Stored label of a categorical value ("backend developer" -> "Backend Engineer", "Chef" -> "other")"""
+    if not value:
+        return "unknown"
+    if name == "role":
+        return skill_extractor.canonical_role(value) or OTHER_CATEGORY
+    return value
+
+
+def scored_values(session_summary: Dict) -> Dict[str, List[float]]:
+    """Per-dimension scores of a session's scored blocks, clamped and rounded as they are stored"""
+    scored = [b["scores"] for b in session_summary.get("interaction_blocks", []) if isinstance(b.get("scores"), dict)]
+    return {dim: [round(min(100.0, max(0.0, float(s.get(dim, 0) or 0))), 1) for s in scored] for dim in DIMENSIONS}
+
+
+class AnalyticsStore:
+    """Append-only columnar store of per-interaction scores with vectorized queries"""
+
+    def __init__(self, base_dir: str = None, persist: bool = True):
+        self.base_dir = os.path.abspath(base_dir or os.getenv("ANALYTICS_DIR", DEFAULT_ANALYTICS_DIR))
+        self.persist = persist
+        self._rows_path = os.path.join(self.base_dir, "interactions.bin")
+        self._meta_path = os.path.join(self.base_dir, "categories.json")
+        self._capacity = 1024
+        self._columns = {name: np.zeros(self._capacity, dtype=ROW_DTYPE[name]) for name in ROW_DTYPE.names}
+        self._size = 0
+        self._sessions = 0
+        self._categories: Dict[str, List[str]] = {name: [] for name in CATEGORIES}
+        self._category_ids: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORIES}
+        self._lock = threading.Lock()
+        self._loaded = not persist
+
+    # ==================== Storage ====================
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if os.path.exists(self._meta_path):
+                with open(self._meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                for name in CATEGORIES:
+                    self._categories[name] = meta.get(name, [])
+                    self._category_ids[name] = {v: i for i, v in enumerate(self._categories[name])}
+            if os.path.exists(self._rows_path):
+                # Ignore a torn trailing record from an interrupted append
+                usable = os.path.getsize(self._rows_path) // ROW_DTYPE.itemsize
+                rows = np.fromfile(self._rows_path, dtype=ROW_DTYPE, count=usable)
+                self._append_rows(rows)
+                self._sessions = int(rows["session"].max()) + 1 if rows.size else 0
+            self._loaded = True
+
+    def _append_rows(self, rows: np.ndarray):
+        needed = self._size + rows.size
+        if needed > self._capacity:
+            while self._capacity < needed:
+                self._capacity *= 2
+            for name, column in self._columns.items():
+                grown = np.zeros(self._capacity, dtype=column.dtype)
+                grown[:self._size] = column[:self._size]
+                self._columns[name] = grown
+        for name, column in self._columns.items():
+            column[self._size:needed] = rows[name]
+        self._size = needed
+
+    def _category_id(self, name: str, value: str) -> int:
+        """Code for a categorical value; new labels are appended and persisted"""
+        label = category_label(name, value)
+        ids = self._category_ids[name]
+        if label not in ids and len(self._categories[name]) >= MAX_CATEGORY_VALUES - 1:
+            label = OTHER_CATEGORY
+        if label not in ids:
+            ids[label] = len(self._categories[name])
+            self._categories[name].append(label)
+            if self.persist:
+                self._write_meta()
+        return ids[label]
+
+    def _write_meta(self):
+        os.makedirs(self.base_dir, exist_ok=True)
+        tmp_path = f"{self._meta_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._categories, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def record_session(self, session_summary: Dict, timestamp: float = None) -> int:
+        """Append a finished session's interaction scores; returns rows added"""
+        self._ensure_loaded()
+        values = scored_values(session_summary)
+        count = len(values[DIMENSIONS[0]])
+        if not count:
+            return 0
+        ts = timestamp if timestamp is not None else time.time()
+        with self._lock:
+            rows = np.zeros(count, dtype=ROW_DTYPE)
+            rows["ts"] = ts
+            rows["session"] = self._sessions
+            rows["seq"] = np.arange(count)
+            for name in CATEGORIES:
+                rows[name] = self._category_id(name, session_summary.get(name))
+            for dim in DIMENSIONS:
+                rows[dim] = values[dim]
+            self._sessions += 1
+            self._append_rows(rows)
+            if self.persist:
+                with open(self._rows_path, "ab") as f:
+                    rows.tofile(f)
+        return rows.size
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Read-only views of every column over the rows recorded so far"""
+        self._ensure_loaded()
+        with self._lock:
+            size = self._size
+            views = {name: column[:size] for name, column in self._columns.items()}
+        for view in views.values():
+            view.flags.writeable = False
+        return views
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return self._size
+
+    def categories(self) -> Dict[str, List[str]]:
+        self._ensure_loaded()
+        return {name: list(values) for name, values in self._categories.items()}
+
+    # ==================== Queries ====================
+
+    def _select(self, role: str = None, difficulty: str = None, experience: str = None,
+                since: float = None, until: float = None, fields=DIMENSIONS) -> Dict[str, np.ndarray]:
+        """Columns restricted to the rows matching every filter"""
+        cols = self.columns()
+        mask = None
+        for name, value in (("role", role), ("difficulty", difficulty), ("experience", experience)):
+            if value:
+                cid = self._category_ids[name].get(category_label(name, value))
+                cond = cols[name] == cid if cid is not None else np.zeros(cols[name].size, dtype=bool)
+                mask = cond if mask is None else mask & cond
+        if since is not None:
+            cond = cols["ts"] >= since
+            mask = cond if mask is None else mask & cond
+        if until is not None:
+            cond = cols["ts"] < until
+            mask = cond if mask is None else mask & cond
+        if mask is None:
+            return {name: cols[name] for name in fields}
+        return {name: cols[name][mask] for name in fields}
+
+    def cohort_stats(self, **filters) -> Dict:
+        """Distribution of every dimension for the filtered cohort"""
+        selected = self._select(fields=DIMENSIONS + ("session",), **filters)
+        sessions = selected["session"]
+        count = sessions.size
+        result = {
+            "interactions": int(count),
+            # Rows are appended session by session, so distinct sessions are run boundaries
+            "sessions": int(np.count_nonzero(np.diff(sessions)) + 1) if count else 0,
+            "dimensions": {},
+        }
+        if not count:
+            return result
+        grid = np.arange(100 * SCORE_RESOLUTION + 1) / SCORE_RESOLUTION
+        edges = np.linspace(0, 100, 11)
+        for dim in DIMENSIONS:
+            # One O(n) counting pass replaces the sorts behind percentile/histogram
+            counts = np.bincount(np.rint(selected[dim] * SCORE_RESOLUTION).astype(np.int64),
+                                 minlength=grid.size)
+            mean = float(counts @ grid) / count
+            std = float(np.sqrt(max(0.0, float(counts @ (grid * grid)) / count - mean * mean)))
+            present = np.flatnonzero(counts)
+            deciles = np.add.reduceat(counts[:-1], np.arange(0, grid.size - 1, 10 * SCORE_RESOLUTION))
+            deciles[-1] += counts[-1]
+            result["dimensions"][dim] = {
+                "mean": round(mean, 2),
+                "std": round(std, 2),
+                "min": float(grid[present[0]]),
+                "max": float(grid[present[-1]]),
+                "percentiles": {f"p{p}": round(v, 2) for p, v in zip(PERCENTILES, _percentiles(counts, grid))},
+                "histogram": {"edges": edges.tolist(), "counts": deciles.tolist()},
+            }
+        return result
+
+    def correlations(self, **filters) -> Dict:
+        """Pearson correlation matrix between the score dimensions"""
+        selected = self._select(**filters)
+        if selected[DIMENSIONS[0]].size < 2:
+            return {"dimensions": list(DIMENSIONS), "matrix": None}
+        matrix = np.corrcoef(np.vstack([selected[dim] for dim in DIMENSIONS]))
+        matrix = np.nan_to_num(matrix, nan=0.0)
+        return {"dimensions": list(DIMENSIONS), "matrix": np.round(matrix, 3).tolist()}
+
+    def trends(self, bucket: str = "week", dimension: str = "final_score", **filters) -> Dict:
+        """Mean score and volume per time bucket"""
+        if bucket not in BUCKET_SECONDS:
+            raise ValueError(f"bucket must be one of {sorted(BUCKET_SECONDS)}")
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"dimension must be one of {list(DIMENSIONS)}")
+        selected = self._select(fields=("ts", dimension), **filters)
+        if not selected["ts"].size:
+            return {"bucket": bucket, "dimension": dimension, "points": []}
+        keys = (selected["ts"] // BUCKET_SECONDS[bucket]).astype(np.int64)
+        first = int(keys.min())
+        # Buckets are dense small integers, so bincount replaces a sort-based group-by
+        keys -= first
+        counts = np.bincount(keys)
+        sums = np.bincount(keys, weights=selected[dimension])
+        points = [
+            {
+                "start": datetime.fromtimestamp((first + int(k)) * BUCKET_SECONDS[bucket]).date().isoformat(),
+                "interactions": int(counts[k]),
+                "mean": round(float(sums[k] / counts[k]), 2),
+            }
+            for k in np.flatnonzero(counts)
+        ]
+        return {"bucket": bucket, "dimension": dimension, "points": points}
+
+    def breakdown(self, by: str = "role", **filters) -> Dict:
+        """Mean of every dimension per role / difficulty / experience level"""
+        if by not in CATEGORIES:
+            raise ValueError(f"by must be one of {list(CATEGORIES)}")
+        selected = self._select(fields=DIMENSIONS + (by,), **filters)
+        labels = self._categories[by]
+        groups = {}
+        if selected[by].size:
+            ids = selected[by].astype(np.int64)
+            counts = np.bincount(ids, minlength=len(labels))
+            means = {
+                dim: np.bincount(ids, weights=selected[dim], minlength=len(labels)) / np.maximum(counts, 1)
+                for dim in DIMENSIONS
+            }
+            for cid in np.flatnonzero(counts):
+                groups[labels[cid]] = {
+                    "interactions": int(counts[cid]),
+                    **{dim: round(float(means[dim][cid]), 2) for dim in DIMENSIONS},
+                }
+        return {"by": by, "groups": groups}
+
+
+# Global analytics store
+analytics_store = AnalyticsStore()
@@ -0,0 +1,170 @@
+"""
+Percentile Index - Incremental per-cohort distributions of interview scores
+Keeps one fixed-bucket histogram per (role, difficulty, dimension) holding
+one value per finished interview: that interview's mean score on the
+dimension. Each histogram is a Fenwick tree over 0.1-point buckets, so adding
+an interview and ranking a score are both O(log buckets), independent of how
+many interviews have been recorded.
+
+The index is seeded once from the analytics store and then updated by
+end_interview with the same scores it records there, so it only ever holds
+finished interviews and is rebuilt identically after a restart.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+import os
+import threading
+
+import numpy as np
+
+from memory.analytics_store import (AnalyticsStore, analytics_store, category_label, scored_values, DIMENSIONS,
+                                    SCORE_RESOLUTION)
+
+BUCKETS = 100 * SCORE_RESOLUTION + 1
+
+# Below this many prior interviews in a cohort a percentile is not meaningful
+PERCENTILE_MIN_COHORT = int(os.getenv("PERCENTILE_MIN_COHORT", "20"))
+
+
+def score_bucket(score: float) -> int:
+    return int(round(max(0.0, min(100.0, float(score))) * SCORE_RESOLUTION))
+
+
+def session_means(session_summary: Dict) -> Dict[str, float]:
+    """Mean of each dimension over the session's scored answers (dimensions without scores are left out)"""
+    return {dim: sum(values) / len(values) for dim, values in scored_values(session_summary).items() if values}
+
+
+class FenwickTree:
+    """Binary indexed tree over bucket counts"""
+
+    def __init__(self, size: int, counts: Optional[Iterable[int]] = None):
+        self.size = size
+        self.total = 0
+        self._tree = [0] * (size + 1)
+        if counts is not None:
+            # O(n) construction: push each node's sum to its parent
+            for i, count in enumerate(counts, 1):
+                self._tree[i] += int(count)
+                self.total += int(count)
+                parent = i + (i & -i)
+                if parent <= size:
+                    self._tree[parent] += self._tree[i]
+
+    def add(self, index: int, delta: int = 1):
+        self.total += delta
+        i = index + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix(self, index: int) -> int:
+        """Sum of counts in buckets [0, index)"""
+        total = 0
+        i = index
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+
+class PercentileIndex:
+    """Mid-rank percentiles of interview mean scores within a role/difficulty cohort"""
+
+    def __init__(self, store: AnalyticsStore = None):
+        self.store = store if store is not None else analytics_store
+        self._trees: Dict[Tuple[str, str, str], FenwickTree] = {}
+        self._lock = threading.Lock()
+        self._seeded = False
+
+    def _ensure_seeded(self):
+        if self._seeded:
+            return
+        with self._lock:
+            if self._seeded:
+                return
+            try:
+                self._seed()
+            except Exception as e:
+                print(f"❌ Error seeding percentile index: {e}")
+            self._seeded = True
+
+    def _seed(self):
+        """Build every cohort histogram from the analytics history in one vectorized pass per dimension"""
+        cols = self.store.columns()
+        if not cols["role"].size:
+            return
+        categories = self.store.categories()
+        # Rows are per answer; reduce them to one row per recorded interview
+        sessions, first_row, inverse = np.unique(cols["session"], return_index=True, return_inverse=True)
+        answers = np.bincount(inverse, minlength=sessions.size)
+        n_difficulties = max(1, len(categories["difficulty"]))
+        cohort = cols["role"][first_row].astype(np.int64) * n_difficulties + cols["difficulty"][first_row]
+        cohorts = np.unique(cohort)
+        dense = np.searchsorted(cohorts, cohort)
+        for dim in DIMENSIONS:
+            means = np.bincount(inverse, weights=cols[dim].astype(np.float64), minlength=sessions.size) / answers
+            buckets = np.rint(np.clip(means, 0.0, 100.0) * SCORE_RESOLUTION).astype(np.int64)
+            counts = np.bincount(dense * BUCKETS + buckets, minlength=cohorts.size * BUCKETS)
+            for i, code in enumerate(cohorts):
+                role = categories["role"][code // n_difficulties]
+                difficulty = categories["difficulty"][code % n_difficulties]
+                self._trees[(role, difficulty, dim)] = FenwickTree(
+                    BUCKETS, counts[i * BUCKETS:(i + 1) * BUCKETS].tolist())
+
+    def _tree(self, role: str, difficulty: str, dim: str) -> FenwickTree:
+        key = (category_label("role", role), category_label("difficulty", difficulty), dim)
+        tree = self._trees.get(key)
+        if tree is None:
+            tree = self._trees[key] = FenwickTree(BUCKETS)
+        return tree
+
+    def add_session(self, session_summary: Dict):
+        """Record a finished interview's per-dimension means in its cohort"""
+        self._ensure_seeded()
+        means = session_means(session_summary)
+        with self._lock:
+            for dim, mean in means.items():
+                self._tree(session_summary.get("role"), session_summary.get("difficulty"), dim).add(
+                    score_bucket(mean))
+
+    def rank(self, role: str, difficulty: str, dim: str, score: float) -> Tuple[Optional[float], int]:
+        """Percentile of `score` among the cohort's interviews; returns (percentile, cohort size)"""
+        self._ensure_seeded()
+        bucket = score_bucket(score)
+        with self._lock:
+            tree = self._trees.get((category_label("role", role), category_label("difficulty", difficulty), dim))
+            if tree is None:
+                return None, 0
+            below = tree.prefix(bucket)
+            equal = tree.prefix(bucket + 1) - below
+            size = tree.total
+        if size < PERCENTILE_MIN_COHORT:
+            return None, size
+        return round((below + 0.5 * equal) / size * 100, 1), size
+
+    def rank_session(self, session_summary: Dict) -> Dict:
+        """Per-dimension percentile of a session's mean scores against prior interviews in its cohort
+
+        Call before add_session, so the session is not compared with itself.
+        """
+        role = session_summary.get("role")
+        difficulty = session_summary.get("difficulty")
+        result = {"role": role, "difficulty": difficulty, "cohort_size": 0, "dimensions": {}}
+        for dim, mean in session_means(session_summary).items():
+            percentile, size = self.rank(role, difficulty, dim, mean)
+            result["dimensions"][dim] = {"score": round(mean, 1), "percentile": percentile}
+            result["cohort_size"] = max(result["cohort_size"], size)
+        return result
+
+    def stats(self) -> Dict:
+        self._ensure_seeded()
+        with self._lock:
+            cohorts = {(role, difficulty) for role, difficulty, _ in self._trees}
+            return {
+                "cohorts": len(cohorts),
+                "indexed_interviews": sum(t.total for (_, _, dim), t in self._trees.items() if dim == "final_score"),
+            }
+
+
+# Global percentile index
+percentile_index = PercentileIndex()
@@ -0,0 +1,164 @@
+"""
+Resume Artifacts - Cross-session cache of what an interview derives from a resume
+Keyed by the SHA-256 of the normalized resume text plus the interview role.
+Each entry holds the local skill profile, the pre-ranked resume topics to
+probe and a few LLM-written opening questions. A repeat interview with the
+same resume and role starts from the cache with no LLM call, rotating
+through the stored openings so practice runs do not all begin alike.
+
+Entries are small JSON files (one per key) written atomically; an in-memory
+LRU index over them evicts the least recently used entry, file included,
+beyond RESUME_ARTIFACTS_MAX_ENTRIES.
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_ARTIFACTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'resume_artifacts')
+
+RESUME_ARTIFACTS_MAX_ENTRIES = int(os.getenv("RESUME_ARTIFACTS_MAX_ENTRIES", "1000"))
+OPENING_QUESTIONS = int(os.getenv("RESUME_OPENING_QUESTIONS", "3"))
+
+
+def artifact_key(resume_text: str, role: str) -> str:
+    """Content hash of the resume (whitespace-insensitive) combined with the role"""
+    normalized = " ".join((resume_text or "").split())
+    digest = hashlib.sha256(normalized.encode("utf-8"))
+    digest.update(b"\0" + (role or "").strip().lower().encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResumeArtifactCache:
+    """Persistent LRU of per-(resume, role) profiles, topics and opening questions"""
+
+    def __init__(self, base_dir: str = None, max_entries: int = RESUME_ARTIFACTS_MAX_ENTRIES,
+                 persist: bool = True):
+        self.base_dir = os.path.abspath(base_dir or os.getenv("RESUME_ARTIFACTS_DIR", DEFAULT_ARTIFACTS_DIR))
+        self.max_entries = max_entries
+        self.persist = persist
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+        self._loaded = not persist
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ==================== Storage ====================
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.base_dir, f"{key}.json")
+
+    def _ensure_loaded(self):
+        """Read every entry once, oldest use first"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            os.makedirs(self.base_dir, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.base_dir):
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(self.base_dir, name), "r", encoding="utf-8") as f:
+                        entries.append(json.load(f))
+                except (OSError, ValueError) as e:
+                    print(f"⚠️  Skipping unreadable resume artifact {name}: {e}")
+            for entry in sorted(entries, key=lambda e: e.get("last_used", 0)):
+                self._entries[entry["key"]] = entry
+            self._evict()
+            self._loaded = True
+
+    def _write(self, entry: Dict):
+        if not self.persist:
+            return
+        path = self._path(entry["key"])
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            key, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            if self.persist:
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+
+    # ==================== Public API ====================
+
+    def take_opening(self, resume_text: str, role: str) -> Optional[Dict]:
+        """The cached artifacts with the next opening question to use, or None on a miss
+
+        Returns a copy with "opening_question" set; the rotation position is persisted.
+        """
+        self._ensure_loaded()
+        key = artifact_key(resume_text, role)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry["opening_questions"]:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            openings = entry["opening_questions"]
+            question = openings[entry["uses"] % len(openings)]
+            entry["uses"] += 1
+            entry["last_used"] = time.time()
+            try:
+                self._write(entry)
+            except OSError as e:
+                print(f"⚠️  Could not persist resume artifact usage: {e}")
+            return {**entry, "opening_question": question}
+
+    def store(self, resume_text: str, role: str, profile: Dict, topics: List[Dict],
+              opening_questions: List[str], uses: int = 1) -> Dict:
+        """Cache the artifacts of a freshly started interview (its first opening already used)"""
+        self._ensure_loaded()
+        now = time.time()
+        entry = {
+            "key": artifact_key(resume_text, role),
+            "role": role,
+            "profile": profile,
+            "topics": topics,
+            "opening_questions": opening_questions[:OPENING_QUESTIONS],
+            "uses": uses,
+            "created_at": now,
+            "last_used": now,
+        }
+        with self._lock:
+            self._entries[entry["key"]] = entry
+            self._entries.move_to_end(entry["key"])
+            try:
+                self._write(entry)
+            except OSError as e:
+                print(f"⚠️  Could not persist resume artifact: {e}")
+            self._evict()
+        return entry
+
+    def stats(self) -> Dict:
+        self._ensure_loaded()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                # Every hit is an interview started without the opening-question LLM call
+                "llm_calls_saved": self.hits,
+            }
+
+
+# Global resume artifact cache
+resume_artifacts = ResumeArtifactCache()
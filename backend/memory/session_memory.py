@@ -1,12 +1,27 @@
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import json
+import threading
+
+from utils.score_aggregates import ScoreAggregates
+from utils.token_usage import new_usage_totals, add_usage
+
+class AnswerSequenceError(ValueError):
+    """Raised when an answer's sequence number is not the one the session expects"""
+    
+    def __init__(self, expected: int, received: int):
+        super().__init__(f"Expected answer seq {expected}, got {received}")
+        self.expected = expected
+        self.received = received
 
 class SessionMemoryManager:
     
     def __init__(self):
         self.sessions: Dict = {}
         self.session_timeout = 3600  # 1 hour
+        self._turn_locks: Dict[str, threading.Lock] = {}
+        self._scores_lock = threading.Lock()
+        self._usage_lock = threading.Lock()
     
     def create_session(self, session_id: str, role: str, experience: str, difficulty: str, resume_text: str) -> Dict:
         """Create a new session"""
@@ -23,8 +38,18 @@ class SessionMemoryManager:
             "interaction_blocks": [],
             "total_interactions": 0,
             "total_score": 0.0,
-            "question_count": 0
+            "scored_interactions": 0,
+            "aggregates": ScoreAggregates(),
+            "question_count": 0,
+            "transcript": [],
+            "answer_seq": 0,
+            "last_turn": None,
+            "resume_profile": None,
+            "resume_topics": None,
+            "token_usage": new_usage_totals(),
+            "budget_mode": "full"
         }
+        self._turn_locks[session_id] = threading.Lock()
         return self.sessions[session_id]
     
     def get_session(self, session_id: str) -> Optional[Dict]:
@@ -42,6 +67,72 @@ class SessionMemoryManager:
             })
             self.sessions[session_id]["question_count"] += 1
     
+    def append_transcript(self, session_id: str, speaker: str, content: str):
+        """Append a turn ("interviewer" or "user") to the authoritative transcript"""
+        if session_id in self.sessions:
+            transcript = self.sessions[session_id]["transcript"]
+            transcript.append({
+                "index": len(transcript),
+                "role": speaker,
+                "content": content,
+                "timestamp": datetime.now().isoformat()
+            })
+    
+    def get_transcript(self, session_id: str, since: int = 0) -> List[Dict]:
+        """Transcript turns from index `since` onwards"""
+        if session_id in self.sessions:
+            return self.sessions[session_id]["transcript"][since:]
+        return []
+    
+    def get_current_question(self, session_id: str) -> str:
+        """The question the candidate is currently answering"""
+        if session_id in self.sessions and self.sessions[session_id]["asked_questions"]:
+            return self.sessions[session_id]["asked_questions"][-1]["question"]
+        return ""
+    
+    def set_resume_artifacts(self, session_id: str, profile: Dict, topics: List[Dict]):
+        """Keep the resume profile and ranked topics for the session's question prompts"""
+        if session_id in self.sessions:
+            self.sessions[session_id]["resume_profile"] = profile
+            self.sessions[session_id]["resume_topics"] = topics
+    
+    def get_resume_artifacts(self, session_id: str):
+        """(profile, ranked topics) of the session's resume, (None, None) if unknown"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return None, None
+        return session["resume_profile"], session["resume_topics"]
+    
+    def get_current_question_topic(self, session_id: str) -> Optional[str]:
+        """Topic label of the question currently being answered"""
+        if session_id in self.sessions and self.sessions[session_id]["asked_questions"]:
+            return self.sessions[session_id]["asked_questions"][-1]["topic"]
+        return None
+    
+    def turn_lock(self, session_id: str) -> Optional[threading.Lock]:
+        """Lock serializing answers within one session"""
+        return self._turn_locks.get(session_id)
+    
+    def check_answer_seq(self, session_id: str, seq: int) -> Optional[Dict]:
+        """Validate an answer's seq; returns the stored response if it was already processed
+        
+        Raises AnswerSequenceError for anything other than the next seq or a retry of the last one.
+        """
+        session = self.sessions[session_id]
+        last_turn = session["last_turn"]
+        if last_turn and seq == last_turn["seq"]:
+            return last_turn["response"]
+        expected = session["answer_seq"] + 1
+        if seq != expected:
+            raise AnswerSequenceError(expected, seq)
+        return None
+    
+    def record_answer_turn(self, session_id: str, seq: int, response: Dict):
+        """Remember the response to answer `seq` so a retried request gets the same result"""
+        if session_id in self.sessions:
+            self.sessions[session_id]["answer_seq"] = seq
+            self.sessions[session_id]["last_turn"] = {"seq": seq, "response": response}
+    
     def add_topic_covered(self, session_id: str, topic: str):
         """Add a topic to covered topics"""
         if session_id in self.sessions:
@@ -53,22 +144,110 @@ class SessionMemoryManager:
         if session_id in self.sessions:
             self.sessions[session_id]["current_topic"] = topic
     
-    def add_interaction_block(self, session_id: str, block: Dict):
-        """Add a completed interaction block"""
+    def add_interaction_block(self, session_id: str, block: Dict) -> int:
+        """Add a completed interaction block; returns its index
+        
+        Blocks may be added before they are scored (scores=None) and get
+        their scores later through attach_scores.
+        """
         if session_id in self.sessions:
-            self.sessions[session_id]["interaction_blocks"].append(block)
-            self.sessions[session_id]["total_interactions"] += 1
+            with self._scores_lock:
+                session = self.sessions[session_id]
+                session["interaction_blocks"].append(block)
+                session["total_interactions"] += 1
+                index = len(session["interaction_blocks"]) - 1
+                if isinstance(block.get("scores"), dict):
+                    self._apply_scores(session, index, block)
+                return index
+        return -1
+    
+    def attach_scores(self, session_id: str, index: int, scores: Dict) -> Optional[Dict]:
+        """Fill in the scores of a block that was added unscored; returns the block
+        
+        Only the first result for a block is kept; later ones return None.
+        """
+        if session_id not in self.sessions:
+            return None
+        with self._scores_lock:
+            session = self.sessions[session_id]
+            block = session["interaction_blocks"][index]
+            if block.get("scoring") != "pending":
+                return None
+            block["scores"] = scores
+            block["score"] = scores.get("final_score", 0)
+            block["feedback"] = scores.get("feedback", "")
+            block["scoring"] = "done"
+            self._apply_scores(session, index, block)
+            return block
+    
+    def _apply_scores(self, session: Dict, index: int, block: Dict):
+        scores = block["scores"]
+        
+        # Per-dimension sums, extremes, trend and topic totals for the report
+        session["aggregates"].add(scores, index, block.get("topic"))
+        
+        # Update total score
+        if "final_score" in scores:
+            session["scored_interactions"] += 1
+            current_total = session["total_score"]
+            new_score = scores["final_score"]
+            scored = session["scored_interactions"]
             
-            # Update total score
-            if "scores" in block and "final_score" in block["scores"]:
-                current_total = self.sessions[session_id]["total_score"]
-                new_score = block["scores"]["final_score"]
-                total_interactions = self.sessions[session_id]["total_interactions"]
-                
-                # Calculate running average
-                self.sessions[session_id]["total_score"] = (
-                    (current_total * (total_interactions - 1) + new_score) / total_interactions
-                )
+            # Calculate running average over the scored interactions
+            session["total_score"] = (current_total * (scored - 1) + new_score) / scored
+    
+    def get_interaction_scores(self, session_id: str, since: int = 0) -> List[Dict]:
+        """Scoring status of each interaction from index `since`"""
+        if session_id not in self.sessions:
+            return []
+        blocks = self.sessions[session_id]["interaction_blocks"]
+        return [
+            {
+                "index": i,
+                "status": block.get("scoring", "done"),
+                "score": block.get("score"),
+                "feedback": block.get("feedback", ""),
+                "scores": block.get("scores"),
+            }
+            for i, block in enumerate(blocks[since:], since)
+        ]
+    
+    def add_token_usage(self, session_id: str, agent: str, endpoint: str, usage: Dict) -> Optional[Dict]:
+        """Add one LLM call's tokens and cost to the session; returns the session totals"""
+        if session_id not in self.sessions:
+            return None
+        with self._usage_lock:
+            totals = self.sessions[session_id]["token_usage"]
+            add_usage(totals, usage)
+            add_usage(totals["by_agent"].setdefault(agent, new_usage_totals(breakdown=False)), usage)
+            add_usage(totals["by_endpoint"].setdefault(endpoint, new_usage_totals(breakdown=False)), usage)
+            return dict(totals)
+    
+    def get_token_usage(self, session_id: str) -> Optional[Dict]:
+        """Token and cost totals of a session, overall and by agent / endpoint"""
+        if session_id not in self.sessions:
+            return None
+        with self._usage_lock:
+            return json.loads(json.dumps(self.sessions[session_id]["token_usage"]))
+    
+    def set_budget_mode(self, session_id: str, mode: str):
+        if session_id in self.sessions:
+            self.sessions[session_id]["budget_mode"] = mode
+    
+    def get_budget_mode(self, session_id: str) -> str:
+        session = self.sessions.get(session_id)
+        return session["budget_mode"] if session else "full"
+    
+    def set_audio_metrics(self, session_id: str, metrics: Dict):
+        """Attach audio analysis for the answer currently being given"""
+        if session_id in self.sessions:
+            self.sessions[session_id]["pending_audio"] = metrics
+    
+    def pop_audio_metrics(self, session_id: str) -> Optional[Dict]:
+        """Take (and clear) the audio analysis for the current answer"""
+        if session_id in self.sessions:
+            return self.sessions[session_id].pop("pending_audio", None)
+        return None
     
     def get_asked_questions_list(self, session_id: str) -> List[str]:
         """Get list of all asked questions"""
@@ -94,6 +273,12 @@ class SessionMemoryManager:
             return self.sessions[session_id]["interaction_blocks"]
         return []
     
+    def get_aggregates(self, session_id: str) -> Dict:
+        """Snapshot of the running per-dimension and per-topic aggregates"""
+        if session_id in self.sessions:
+            return self.sessions[session_id]["aggregates"].snapshot()
+        return {}
+    
     def get_total_score(self, session_id: str) -> float:
         """Get running total score"""
         if session_id in self.sessions:
@@ -113,7 +298,11 @@ class SessionMemoryManager:
                 "total_interactions": session["total_interactions"],
                 "topics_covered": session["topics_covered"],
                 "average_score": session["total_score"],
-                "interaction_blocks": session["interaction_blocks"]
+                "aggregates": session["aggregates"].snapshot(),
+                "interaction_blocks": session["interaction_blocks"],
+                "transcript": session["transcript"],
+                "token_usage": self.get_token_usage(session_id),
+                "budget_mode": session["budget_mode"]
             }
         return {}
     
@@ -121,6 +310,7 @@ class SessionMemoryManager:
         """Delete a session"""
         if session_id in self.sessions:
             del self.sessions[session_id]
+        self._turn_locks.pop(session_id, None)
     
     def cleanup_old_sessions(self):
         """Remove sessions older than timeout"""
@@ -0,0 +1,91 @@
+"""
+Token Ledger - Token and cost accounting for every LLM call, with session budgets
+The LLM scheduler records each kickoff here. A call is attributed to its
+session (stored with the session and kept in its report summary), to the
+agent that made it and to the endpoint that triggered it, and is added to
+process-wide totals by agent, endpoint and model.
+
+SESSION_TOKEN_BUDGET caps the tokens one interview may spend (0 = no cap).
+As a session approaches it, InterviewCrew switches to cheaper modes:
+
+  full     every stage uses the LLM with its normal prompt
+  digest   past SESSION_DIGEST_AT of the budget, the follow-up evaluation
+           gets the resume digest instead of the full resume text
+  economy  past the budget, next questions come from the question bank,
+           answers are scored locally and the report skips chunk summaries
+"""
+from typing import Dict, Optional
+import json
+import os
+import threading
+
+from memory.session_memory import session_manager
+from utils.token_usage import add_usage, call_usage, crew_agent, crew_model, current_endpoint, new_usage_totals
+
+SESSION_TOKEN_BUDGET = int(os.getenv("SESSION_TOKEN_BUDGET", "0"))
+SESSION_DIGEST_AT = float(os.getenv("SESSION_DIGEST_AT", "0.5"))
+
+BUDGET_MODES = ("full", "digest", "economy")
+FULL, DIGEST, ECONOMY = BUDGET_MODES
+
+
+class TokenLedger:
+    """Process-wide token totals plus per-session attribution and budget modes"""
+
+    def __init__(self, session_budget: int = SESSION_TOKEN_BUDGET, digest_at: float = SESSION_DIGEST_AT):
+        self.session_budget = session_budget
+        self.digest_at = digest_at
+        self._lock = threading.Lock()
+        self._totals = new_usage_totals()
+        self._by_model: Dict[str, Dict] = {}
+        self._mode_switches = {DIGEST: 0, ECONOMY: 0}
+
+    def record(self, crew, result, session_id: Optional[str] = None) -> Dict:
+        """Account for one kickoff of `crew`; returns its usage"""
+        usage = call_usage(crew, result)
+        agent, endpoint, model = crew_agent(crew), current_endpoint(), crew_model(crew)
+        with self._lock:
+            add_usage(self._totals, usage)
+            add_usage(self._totals["by_agent"].setdefault(agent, new_usage_totals(breakdown=False)), usage)
+            add_usage(self._totals["by_endpoint"].setdefault(endpoint, new_usage_totals(breakdown=False)), usage)
+            add_usage(self._by_model.setdefault(model, new_usage_totals(breakdown=False)), usage)
+        if session_id:
+            session_totals = session_manager.add_token_usage(session_id, agent, endpoint, usage)
+            if session_totals is not None:
+                self._update_mode(session_id, session_totals["total_tokens"])
+        return usage
+
+    def budget_mode(self, session_id: str) -> str:
+        """How much LLM work the session may still do: full, digest or economy"""
+        return session_manager.get_budget_mode(session_id)
+
+    def _update_mode(self, session_id: str, spent: int):
+        if self.session_budget <= 0:
+            return
+        if spent >= self.session_budget:
+            mode = ECONOMY
+        elif spent >= self.session_budget * self.digest_at:
+            mode = DIGEST
+        else:
+            mode = FULL
+        previous = session_manager.get_budget_mode(session_id)
+        if BUDGET_MODES.index(mode) <= BUDGET_MODES.index(previous):
+            return
+        session_manager.set_budget_mode(session_id, mode)
+        with self._lock:
+            self._mode_switches[mode] += 1
+        print(f"⚠️  Session {session_id} has used {spent}/{self.session_budget} tokens - switching to {mode} mode")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return json.loads(json.dumps({
+                "session_budget": self.session_budget,
+                "digest_at": self.digest_at,
+                **self._totals,
+                "by_model": self._by_model,
+                "mode_switches": self._mode_switches,
+            }))
+
+
+# Global token ledger
+token_ledger = TokenLedger()
@@ -58,3 +58,28 @@ class CrewInterviewResponse(BaseModel):
     is_followup: bool = False
     session_id: str
     error: Optional[str] = None
+
+class CrewInterviewStartRequest(BaseModel):
+    """Request to start a crew interview"""
+    session_id: str
+    role: str
+    experience: str
+    difficulty: str
+    resume_text: Optional[str] = None
+    resume_id: Optional[str] = None  # from /upload-resume; takes precedence over resume_text
+
+class CrewInterviewAnswerRequest(BaseModel):
+    """Legacy answer request carrying the full client-side context"""
+    session_id: str
+    role: str
+    experience: str
+    difficulty: str
+    resume_text: Optional[str] = None
+    user_message: str
+    conversation_history: Optional[List[dict]] = None
+
+class CrewInterviewTurnRequest(BaseModel):
+    """Delta answer request; everything else comes from session memory"""
+    session_id: str
+    answer: str
+    seq: int  # 1 for the first answer, incremented per answer; resend the same seq to retry
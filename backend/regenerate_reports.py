@@ -0,0 +1,179 @@
+"""
+Batch PDF report regeneration
+
+Re-renders stored interview reports from their session summaries across a
+process pool, e.g. after a change to the report layout or scoring rules.
+Work is handed out in chunks, finished chunks are appended to a progress file
+so an interrupted run can be resumed, and throughput is reported at the end.
+
+Usage (from backend/):
+    python regenerate_reports.py                      # all stored reports
+    python regenerate_reports.py --workers 8 --chunk-size 32
+    python regenerate_reports.py --resume             # skip reports done by a previous run
+    python regenerate_reports.py --scaling --limit 200  # throughput vs core count, no writes
+
+The CLI never writes the report index and never evicts: it opens the store
+read-only, writes PDF files and queues their ids for the server, which
+registers them (and applies its size budget) on its next retention sweep
+(REPORTS_SWEEP_INTERVAL) or start, dropping its cached copies. Until then a
+running server keeps serving the PDFs it had.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Tuple
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+from utils.report_store import ReportStore
+
+PROGRESS_FILENAME = "regen_progress.log"
+
+# Per-process state, built once by the pool initializer
+_worker_generator = None
+_worker_store = None
+
+
+def _init_worker(base_dir: str):
+    global _worker_generator, _worker_store
+    from utils.pdf_generator import PDFReportGenerator
+    _worker_generator = PDFReportGenerator()
+    _worker_store = ReportStore(base_dir, sweep_interval=0, read_only=True)
+
+
+def _render_chunk(report_ids: List[str], dry_run: bool) -> List[Tuple[str, int, str, str]]:
+    """Render one chunk; returns (report_id, size, digest, error) per report"""
+    results = []
+    for report_id in report_ids:
+        try:
+            summary = _worker_store.load_summary(report_id)
+            if summary is None:
+                results.append((report_id, 0, "", "summary not found"))
+                continue
+            pdf_bytes = _worker_generator.render_report(summary)
+            if not dry_run:
+                _worker_store.write_pdf_file(report_id, pdf_bytes)
+            results.append((report_id, len(pdf_bytes), hashlib.sha256(pdf_bytes).hexdigest(), ""))
+        except Exception as e:
+            results.append((report_id, 0, "", str(e)))
+    return results
+
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _load_progress(path: str) -> set:
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def regenerate(store: ReportStore, report_ids: List[str], workers: int, chunk_size: int,
+               progress_path: str = None, dry_run: bool = False, quiet: bool = False) -> Dict:
+    """Regenerate the given reports on a pool of `workers` processes"""
+    started = time.perf_counter()
+    done, failed = 0, 0
+    progress = open(progress_path, "a", encoding="utf-8") if progress_path else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(store.base_dir,)) as pool:
+            futures = [pool.submit(_render_chunk, chunk, dry_run) for chunk in _chunks(report_ids, chunk_size)]
+            for future in as_completed(futures):
+                written = []
+                for report_id, _, _, error in future.result():
+                    if error:
+                        failed += 1
+                        print(f"❌ {report_id}: {error}")
+                        continue
+                    done += 1
+                    written.append(report_id)
+                    if progress:
+                        progress.write(report_id + "\n")
+                if not dry_run:
+                    store.queue_pdfs(written)
+                if progress:
+                    progress.flush()
+                if not quiet:
+                    print(f"   {done + failed}/{len(report_ids)} reports processed", end="\r")
+    finally:
+        if progress:
+            progress.close()
+    elapsed = time.perf_counter() - started
+    if not quiet:
+        print()
+    return {
+        "workers": workers,
+        "reports": done,
+        "failed": failed,
+        "seconds": elapsed,
+        "reports_per_second": done / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def run_scaling(store: ReportStore, report_ids: List[str], chunk_size: int, max_workers: int):
+    """Render the same sample with 1, 2, 4 ... workers and compare throughput"""
+    counts = []
+    n = 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    counts.append(max_workers)
+
+    print(f"Throughput vs core count ({len(report_ids)} reports, chunk size {chunk_size}, {os.cpu_count()} CPUs)")
+    print(f"{'workers':>8} {'seconds':>9} {'reports/s':>10} {'speedup':>8} {'efficiency':>11}")
+    baseline = None
+    for workers in counts:
+        result = regenerate(store, report_ids, workers, chunk_size, dry_run=True, quiet=True)
+        rate = result["reports_per_second"]
+        baseline = baseline or rate
+        speedup = rate / baseline if baseline else 0.0
+        print(f"{workers:>8} {result['seconds']:>9.2f} {rate:>10.1f} {speedup:>7.2f}x {speedup / workers:>10.0%}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports-dir", default=None, help="report store directory (default: REPORTS_DIR or backend/reports)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--limit", type=int, default=None, help="only process the first N reports")
+    parser.add_argument("--ids", nargs="*", default=None, help="only these report ids")
+    parser.add_argument("--resume", action="store_true", help="skip reports recorded in the progress file")
+    parser.add_argument("--progress-file", default=None)
+    parser.add_argument("--dry-run", action="store_true", help="render but do not write PDFs")
+    parser.add_argument("--scaling", action="store_true", help="benchmark throughput vs worker count (implies --dry-run)")
+    args = parser.parse_args(argv)
+
+    store = ReportStore(args.reports_dir, sweep_interval=0, read_only=True)
+    report_ids = args.ids if args.ids else store.list_summary_ids()
+    if args.limit is not None:
+        report_ids = report_ids[:args.limit]
+
+    if args.scaling:
+        run_scaling(store, report_ids, args.chunk_size, args.workers)
+        return 0
+
+    progress_path = args.progress_file or os.path.join(store.base_dir, PROGRESS_FILENAME)
+    if args.resume:
+        finished = _load_progress(progress_path)
+        report_ids = [rid for rid in report_ids if rid not in finished]
+    elif os.path.exists(progress_path) and not args.dry_run:
+        os.remove(progress_path)
+
+    if not report_ids:
+        print("Nothing to regenerate")
+        return 0
+
+    print(f"📄 Regenerating {len(report_ids)} report(s) with {args.workers} worker(s), chunk size {args.chunk_size}")
+    result = regenerate(store, report_ids, args.workers, args.chunk_size,
+                        progress_path=None if args.dry_run else progress_path, dry_run=args.dry_run)
+    print(f"✅ {result['reports']} regenerated, {result['failed']} failed in {result['seconds']:.2f}s "
+          f"({result['reports_per_second']:.1f} reports/s)")
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""
+Shared pytest setup: run from backend/ with the repo's modules importable and
+every on-disk store pointed at a throwaway directory
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+_DATA_DIR = tempfile.mkdtemp(prefix="interview_tests_")
+os.environ.setdefault("ANALYTICS_DIR", os.path.join(_DATA_DIR, "analytics"))
+os.environ.setdefault("REPORTS_DIR", os.path.join(_DATA_DIR, "reports"))
+os.environ.setdefault("RESUME_ARTIFACTS_DIR", os.path.join(_DATA_DIR, "resume_artifacts"))
+os.environ.setdefault("CPU_POOL_WORKERS", "0")
+# The agents are built with (unused) Groq keys; no test reaches the network
+for _n in range(1, 5):
+    os.environ.setdefault(f"GROQ_API_KEY_{_n}", "test-key")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
@@ -0,0 +1,110 @@
+"""
+Admission control: round-robin fairness, shedding, Retry-After and the admission key
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from starlette.authentication import SimpleUser, UnauthenticatedUser
+
+from utils.admission import AdmissionController, AdmissionRejected, admission_key
+
+
+def _controller(**overrides):
+    settings = dict(max_active=1, max_active_per_user=1, queue_size=8, max_queued_per_user=4, queue_timeout=5.0)
+    settings.update(overrides)
+    return AdmissionController(**settings)
+
+
+def test_freed_slots_go_round_robin_across_users():
+    async def scenario():
+        controller = _controller()
+        served = []
+
+        async def request(user, tag):
+            async with controller.admit(user):
+                served.append(tag)
+                await asyncio.sleep(0.01)
+
+        async with controller.admit("a"):
+            tasks = [asyncio.create_task(request(user, tag)) for user, tag in (("a", "a2"), ("a", "a3"), ("b", "b1"))]
+            await asyncio.sleep(0.01)
+            assert controller.stats()["queue_depth"] == 3
+        await asyncio.gather(*tasks)
+        return served, controller.stats()
+
+    served, stats = asyncio.run(scenario())
+    # b1 arrived last but is served before a's second queued request
+    assert served == ["a2", "b1", "a3"]
+    assert stats["active"] == 0 and stats["queue_depth"] == 0 and stats["admitted"] == 4
+
+
+@pytest.mark.parametrize("overrides, user, reason", [
+    ({"queue_size": 1}, "c", "queue_full"),
+    ({"max_queued_per_user": 1}, "b", "user_queue_full"),
+])
+def test_full_queues_shed_immediately(overrides, user, reason):
+    async def scenario():
+        controller = _controller(**overrides)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire(user)
+        waiting.cancel()
+        return controller, rejected.value
+
+    controller, rejected = asyncio.run(scenario())
+    assert rejected.reason == reason
+    assert rejected.retry_after >= 1
+    assert controller.stats()["shed"][reason] == 1
+    assert controller.stats()["queue_depth"] == 0
+
+
+def test_request_past_its_deadline_is_shed_and_leaves_the_queue():
+    async def scenario():
+        controller = _controller(queue_timeout=0.05)
+        await controller.acquire("a")
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("b")
+        return controller, rejected.value
+
+    controller, rejected = asyncio.run(scenario())
+    assert rejected.reason == "deadline"
+    assert controller.stats()["queue_depth"] == 0 and controller.stats()["waiting_users"] == 0
+
+
+def test_retry_after_is_the_queue_drain_time_at_the_recent_rate():
+    async def scenario():
+        controller = _controller(queue_timeout=30.0)
+        await controller.acquire("a")
+        waiters = [asyncio.create_task(controller.acquire(user)) for user in ("b", "c", "d")]
+        await asyncio.sleep(0)
+        # One release per second over the last four seconds
+        now = time.monotonic()
+        controller._releases.extend(now - seconds for seconds in (4, 3, 2, 1, 0))
+        retry_after = controller.retry_after()
+        # A fifth request would wait for four more releases: longer than its deadline at this rate
+        controller.queue_timeout = 3.0
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("e")
+        for waiter in waiters:
+            waiter.cancel()
+        return retry_after, rejected.value
+
+    retry_after, rejected = asyncio.run(scenario())
+    assert retry_after == 4
+    assert rejected.reason == "predicted_timeout" and rejected.retry_after == 4
+
+
+def _connection(user=None, headers=None, host="10.0.0.7"):
+    return SimpleNamespace(scope={"user": user} if user is not None else {}, headers=headers or {},
+                           client=SimpleNamespace(host=host) if host else None)
+
+
+def test_admission_key_ignores_client_supplied_ids():
+    assert admission_key(_connection(headers={"x-user-id": "someone-else"})) == "ip:10.0.0.7"
+    assert admission_key(_connection(UnauthenticatedUser())) == "ip:10.0.0.7"
+    assert admission_key(_connection(SimpleUser("ada"))) == "user:ada"
+    assert admission_key(_connection(host=None)) == "ip:unknown"
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_session_summary
+from memory.analytics_store import AnalyticsStore, DIMENSIONS, MAX_CATEGORY_VALUES, OTHER_CATEGORY
+
+
+def _summary(session_id, role="Software Engineer", difficulty="Medium", scores=(60, 70, 80)):
+    return {
+        "session_id": session_id,
+        "role": role,
+        "difficulty": difficulty,
+        "experience": "2-3",
+        "interaction_blocks": [{"scores": {dim: score for dim in DIMENSIONS}} for score in scores],
+    }
+
+
+def test_record_session_appends_one_row_per_scored_block(tmp_path):
+    store = AnalyticsStore(str(tmp_path))
+    summary = _summary("a")
+    summary["interaction_blocks"].append({"scores": None})
+    assert store.record_session(summary) == 3
+    assert len(store) == 3
+    assert store.columns()["session"].tolist() == [0, 0, 0]
+
+
+def test_rows_and_categories_survive_a_restart(tmp_path):
+    store = AnalyticsStore(str(tmp_path))
+    store.record_session(_summary("a"))
+    store.record_session(_summary("b", role="Data Scientist", scores=(90,)))
+
+    reopened = AnalyticsStore(str(tmp_path))
+    assert len(reopened) == 4
+    assert reopened.categories()["role"] == ["Software Engineer", "Data Scientist"]
+    assert reopened.columns()["session"].tolist() == [0, 0, 0, 1]
+    reopened.record_session(_summary("c"))
+    assert reopened.columns()["session"][-1] == 2
+
+
+def test_free_text_roles_are_stored_as_taxonomy_roles(tmp_path):
+    store = AnalyticsStore(str(tmp_path))
+    store.record_session(_summary("a", role="backend developer"))
+    store.record_session(_summary("b", role="Underwater Basket Weaver"))
+    store.record_session(_summary("c", role="Pastry Chef"))
+
+    assert store.categories()["role"] == ["Backend Engineer", OTHER_CATEGORY]
+    assert store.cohort_stats(role="Back-end Developer")["sessions"] == 1
+    assert store.cohort_stats(role="Florist")["sessions"] == 2
+    assert AnalyticsStore(str(tmp_path)).categories()["role"] == ["Backend Engineer", OTHER_CATEGORY]
+
+
+def test_category_dictionaries_are_capped(tmp_path):
+    store = AnalyticsStore(str(tmp_path))
+    for i in range(MAX_CATEGORY_VALUES * 3):
+        summary = _summary(f"s{i}", scores=(50,))
+        summary["difficulty"] = f"level {i}"
+        store.record_session(summary)
+
+    difficulties = store.categories()["difficulty"]
+    assert len(difficulties) == MAX_CATEGORY_VALUES
+    assert difficulties[-1] == OTHER_CATEGORY
+    assert store.columns()["difficulty"].max() == MAX_CATEGORY_VALUES - 1
+
+
+def test_cohort_stats_match_numpy(tmp_path):
+    store = AnalyticsStore(str(tmp_path), persist=False)
+    for i in range(30):
+        store.record_session(make_session_summary(f"s{i}", n_interactions=5, seed=i))
+    values = store.columns()["final_score"]
+    stats = store.cohort_stats()["dimensions"]["final_score"]
+    assert stats["mean"] == pytest.approx(values.mean(), abs=0.01)
+    assert stats["percentiles"]["p50"] == pytest.approx(np.percentile(values, 50), abs=0.01)
+    assert stats["percentiles"]["p90"] == pytest.approx(np.percentile(values, 90), abs=0.01)
+
+
+def test_breakdown_groups_by_category(tmp_path):
+    store = AnalyticsStore(str(tmp_path), persist=False)
+    store.record_session(_summary("a", role="Software Engineer", scores=(60, 80)))
+    store.record_session(_summary("b", role="Data Scientist", scores=(90,)))
+    groups = store.breakdown(by="role")["groups"]
+    assert groups["Software Engineer"]["final_score"] == 70
+    assert groups["Data Scientist"]["interactions"] == 1
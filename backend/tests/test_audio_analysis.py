@@ -0,0 +1,161 @@
+"""
+Audio analysis on synthetic PCM: tone segments are speech, zero samples are silence
+"""
+import asyncio
+import io
+import wave
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import UploadFile
+
+from main import analyze_audio
+from utils.audio_analysis import (AudioAnalyzer, AudioFormatError, FrameEnergyAccumulator, blend_audio_scores,
+                                  MIN_PAUSE_SECONDS, MIN_VOICED_SECONDS)
+from utils.local_scorer import compute_final_score
+
+RATE = 16000
+
+
+def _signal(segments, level_db=-12.0):
+    """Concatenate ("tone" | "silence", seconds) segments into float samples in [-1, 1]"""
+    amplitude = 10 ** (level_db / 20) * np.sqrt(2)  # sine RMS is amplitude / sqrt(2)
+    parts = []
+    for kind, seconds in segments:
+        t = np.arange(int(round(seconds * RATE))) / RATE
+        parts.append(amplitude * np.sin(2 * np.pi * 220 * t) if kind == "tone" else np.zeros(t.size))
+    return np.concatenate(parts)
+
+
+def _pcm16(signal, channels=1):
+    samples = np.round(signal * 32767).astype("<i2")
+    return np.repeat(samples, channels).tobytes()
+
+
+def _pcm8(signal, channels=1):
+    samples = np.clip(np.round(signal * 127 + 128), 0, 255).astype(np.uint8)
+    return np.repeat(samples, channels).tobytes()
+
+
+def _wav(data, channels, sample_width):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(RATE)
+        wav.writeframes(data)
+    buffer.seek(0)
+    return buffer
+
+
+SPEECH = [("tone", 1.0), ("silence", 0.5), ("tone", 1.0), ("silence", 2.0), ("tone", 1.0)]
+
+
+def test_pauses_and_long_silences_of_tone_segments():
+    metrics = AudioAnalyzer().analyze_file(io.BytesIO(_pcm16(_signal(SPEECH))), sample_rate=RATE)
+    assert metrics["duration_seconds"] == 5.5
+    assert metrics["segments"] == 3
+    assert metrics["speaking_seconds"] == 3.0
+    assert metrics["pause_count"] == 2
+    assert metrics["total_pause_seconds"] == 2.5
+    assert metrics["long_silences"] == [{"start": 2.5, "duration": 2.0}]
+
+
+@pytest.mark.parametrize("encode,channels,sample_width", [
+    (_pcm8, 1, 1),
+    (_pcm8, 2, 1),
+    (_pcm16, 2, 2),
+])
+def test_wav_encodings_match_mono_16_bit(encode, channels, sample_width):
+    analyzer = AudioAnalyzer()
+    signal = _signal(SPEECH)
+    expected = analyzer.analyze_file(io.BytesIO(_pcm16(signal)), sample_rate=RATE)
+    metrics = analyzer.analyze_file(_wav(encode(signal, channels), channels, sample_width))
+    for key in ("duration_seconds", "segments", "pause_count", "total_pause_seconds", "long_silences"):
+        assert metrics[key] == expected[key]
+
+
+def test_8_bit_silence_is_the_unsigned_midpoint():
+    acc = FrameEnergyAccumulator(RATE, 1, 1)
+    acc.feed(bytes([128]) * RATE)
+    assert acc.energies().max() == 0.0
+
+
+def test_stereo_channels_are_averaged():
+    left = np.round(_signal([("tone", 0.2)]) * 32767).astype("<i2")
+    opposite = FrameEnergyAccumulator(RATE, 2, 2)
+    opposite.feed(np.column_stack((left, -left)).tobytes())
+    assert opposite.energies().max() == 0.0
+
+    mono, stereo = FrameEnergyAccumulator(RATE, 1, 2), FrameEnergyAccumulator(RATE, 2, 2)
+    mono.feed(left.tobytes())
+    stereo.feed(np.column_stack((left, left)).tobytes())
+    np.testing.assert_allclose(stereo.energies(), mono.energies())
+
+
+def test_partial_samples_and_frames_carry_over_between_feeds():
+    data = _pcm16(_signal(SPEECH), channels=2)
+    whole, pieces = FrameEnergyAccumulator(RATE, 2, 2), FrameEnergyAccumulator(RATE, 2, 2)
+    whole.feed(data)
+    for offset in range(0, len(data), 1001):  # odd sizes split samples and frames
+        pieces.feed(data[offset:offset + 1001])
+    assert pieces.samples == whole.samples == len(data) // 4
+    np.testing.assert_array_equal(pieces.energies(), whole.energies())
+
+
+def test_vad_ignores_tones_below_the_absolute_floor():
+    analyzer = AudioAnalyzer()
+    quiet = analyzer.analyze_file(io.BytesIO(_pcm16(_signal(SPEECH, level_db=-60))), sample_rate=RATE)
+    assert quiet["segments"] == 0 and quiet["pace_source"] == "none"
+    loud = analyzer.analyze_file(io.BytesIO(_pcm16(_signal(SPEECH, level_db=-30))), sample_rate=RATE)
+    assert loud["segments"] == 3
+
+
+def test_short_gaps_merge_and_clicks_are_dropped():
+    gap, click = 0.1, 0.04  # whole 20 ms frames, below MIN_PAUSE_SECONDS / MIN_VOICED_SECONDS
+    assert gap < MIN_PAUSE_SECONDS and click < MIN_VOICED_SECONDS
+    segments = [("tone", 1.0), ("silence", gap), ("tone", 1.0),
+                ("silence", 1.0), ("tone", click), ("silence", 1.0)]
+    metrics = AudioAnalyzer().analyze_file(io.BytesIO(_pcm16(_signal(segments))), sample_rate=RATE)
+    assert metrics["segments"] == 1
+    assert metrics["pause_count"] == 0
+    assert metrics["speech_span_seconds"] == pytest.approx(2.0 + gap)
+
+
+def test_unsupported_sample_width_is_rejected():
+    with pytest.raises(AudioFormatError):
+        FrameEnergyAccumulator(RATE, 1, 3)
+    with pytest.raises(AudioFormatError):
+        AudioAnalyzer().analyze_file(_wav(b"\x00" * 3 * RATE, 1, 3))
+
+
+@pytest.mark.parametrize("body,params", [
+    (b"\x00" * 3 * RATE, {"sample_rate": RATE, "sample_width": 3}),
+    (_wav(b"\x00" * 3 * RATE, 1, 3).read(), {}),
+    (b"\x00" * 100, {}),
+])
+def test_analyze_audio_returns_415_for_undecodable_audio(body, params):
+    upload = UploadFile(io.BytesIO(body), size=len(body), filename="answer.wav")
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(analyze_audio(file=upload, session_id=None, sample_rate=params.get("sample_rate"),
+                                  channels=1, sample_width=params.get("sample_width", 2), word_count=None))
+    assert exc.value.status_code == 415
+
+
+def test_blend_mixes_audio_into_confidence_and_communication():
+    scores = {"domain_knowledge": 80, "communication": 60, "confidence": 40, "depth": 70}
+    audio = {"segments": 3, "words_per_minute": 130.0, "pause_ratio": 0.2, "long_silence_count": 0,
+             "communication_score": 100, "confidence_score": 80}
+    blended = blend_audio_scores(dict(scores), audio, weight=0.5)
+    assert blended["communication"] == 80
+    assert blended["confidence"] == 60
+    assert blended["domain_knowledge"] == 80
+    assert blended["final_score"] == compute_final_score(blended)
+    assert blended["audio"]["confidence_score"] == 80
+
+
+def test_blend_keeps_scores_without_detected_speech():
+    scores = {"communication": 60, "confidence": 40, "final_score": 55}
+    assert blend_audio_scores(dict(scores), AudioAnalyzer._empty(3.0)) == scores
+    assert blend_audio_scores(dict(scores), {}) == scores
@@ -0,0 +1,109 @@
+"""
+CpuPool: registration, bounded queueing, cancellation and restart after a worker dies
+Uses real spawned worker processes; each test starts its own small pool.
+"""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from utils.cpu_pool import CpuPool, CpuPoolBusy, cpu_job
+
+
+@cpu_job
+def square(x: int) -> int:
+    return x * x
+
+
+@cpu_job
+def nap(seconds: float) -> int:
+    time.sleep(seconds)
+    return os.getpid()
+
+
+@cpu_job
+def die() -> None:
+    os._exit(1)
+
+
+@pytest.fixture
+def pool():
+    pool = CpuPool(workers=1, max_pending=4)
+    yield pool
+    pool.shutdown()
+
+
+def test_unregistered_functions_are_refused(pool):
+    with pytest.raises(ValueError):
+        pool.submit(pow, 2, 3)
+    with pytest.raises(ValueError):
+        cpu_job(lambda: None)
+
+
+def test_inline_pool_runs_jobs_on_the_calling_thread():
+    pool = CpuPool(workers=0)
+    assert pool.call(square, 7) == 49
+    assert pool.stats()["completed"] == 1 and not pool.stats()["started"]
+
+
+def test_full_pool_rejects_instead_of_queueing(pool):
+    pool.max_pending = 1
+    running = pool.submit(nap, 0.3)
+    with pytest.raises(CpuPoolBusy):
+        pool.submit(square, 2)
+    assert running.result(10) > 0
+    stats = pool.stats()
+    assert stats["rejected"] == 1 and stats["pending"] == 0
+    assert pool.call(square, 3) == 9
+
+
+def test_timed_out_queued_job_is_cancelled(pool):
+    # One worker busy, the executor's call queue full: the next job waits in the pool's own queue
+    blockers = [pool.submit(nap, 0.3) for _ in range(3)]
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(square, 5, timeout=0.05)
+
+    asyncio.run(scenario())
+    for blocker in blockers:
+        blocker.result(10)
+    stats = pool.stats()
+    assert stats["cancelled"] == 1 and stats["completed"] == 3 and stats["pending"] == 0
+
+
+def test_pool_restarts_after_a_worker_dies(pool):
+    pool.start()
+    with pytest.raises(Exception):
+        pool.call(die, timeout=10)
+    deadline = time.monotonic() + 5
+    while pool.stats()["restarts"] == 0:
+        assert time.monotonic() < deadline, "broken pool was never dropped"
+        time.sleep(0.01)
+    assert pool.call(square, 6, timeout=30) == 36
+    assert pool.stats()["failed"] == 1
+
+
+def test_cold_pool_is_started_off_the_event_loop(pool, monkeypatch):
+    submit_threads = []
+    submit = pool.submit
+
+    def recording_submit(job, *args):
+        submit_threads.append(threading.current_thread())
+        return submit(job, *args)
+
+    monkeypatch.setattr(pool, "submit", recording_submit)
+
+    async def scenario():
+        loop_thread = threading.current_thread()
+        first = await pool.run(square, 4, timeout=30)
+        second = await pool.run(square, 5, timeout=30)
+        return loop_thread, first, second
+
+    loop_thread, first, second = asyncio.run(scenario())
+    assert (first, second) == (16, 25)
+    assert submit_threads[0] is not loop_thread
+    # Once started, jobs are submitted directly
+    assert submit_threads[1] is loop_thread
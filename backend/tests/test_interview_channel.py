@@ -0,0 +1,31 @@
+"""
+InterviewChannel message handling without a live socket: events are read off the send queue
+"""
+import asyncio
+
+from utils.interview_channel import InterviewChannel
+from utils.speech_stream import speech_stream_manager
+
+
+def _events(channel):
+    events = []
+    while not channel.queue.empty():
+        events.append(channel.queue.get_nowait())
+    return events
+
+
+def test_malformed_speech_chunks_get_an_error_and_keep_the_stream_usable():
+    async def scenario():
+        channel = InterviewChannel(None, "channel_test", "ip:test")
+        for message in ({"type": "speech_chunk", "text": 5},
+                        {"type": "speech_chunk", "text": "so", "start": "0", "end": "1"}):
+            await channel._dispatch(message, crew=None)
+        rejected = _events(channel)
+        assert channel._stream_id is None
+        await channel._dispatch({"type": "speech_chunk", "text": "we cached it", "start": 0, "end": 1.5}, crew=None)
+        return channel, rejected, _events(channel)
+
+    channel, rejected, accepted = asyncio.run(scenario())
+    assert [event["type"] for event in rejected] == ["error", "error"]
+    assert accepted[0]["type"] == "speech" and accepted[0]["chunks"] == 1
+    speech_stream_manager.end(channel._stream_id)
@@ -0,0 +1,124 @@
+"""
+InterviewCrew turn handling with the LLM replaced by canned agent replies
+"""
+import itertools
+import json
+import time
+
+import pytest
+
+import agents.interview_crew as crew_module
+from agents.interview_crew import InterviewCrew
+from memory.session_memory import AnswerSequenceError, session_manager
+
+SCORES = {"domain_knowledge": 70, "communication": 60, "confidence": 80, "depth": 50, "feedback": "Solid"}
+
+_session_ids = itertools.count()
+
+
+class FakeLlm:
+    """Stands in for llm_scheduler.kickoff; answers by agent role and counts calls"""
+
+    def __init__(self):
+        self.calls = []
+        self.timeouts = []
+        self.fail_next_question = 0
+
+    def kickoff(self, crew, llm_class, coalesce=True, session_id=None, timeout=None):
+        role = crew.agents[0].role
+        self.calls.append(role)
+        self.timeouts.append(timeout)
+        if role == "Answer Evaluator":
+            return json.dumps({"decision": "followup", "confidence": 80, "reasoning": "ok"})
+        if role == "Interview Scorer":
+            return json.dumps(SCORES)
+        if role == "Interview Report Generator":
+            return json.dumps({"summary": "Did well", "strengths": ["indexes"], "weaknesses": [], "notable": []})
+        if self.fail_next_question and len(self.calls) > 1:
+            self.fail_next_question -= 1
+            raise RuntimeError("LLM unavailable")
+        return f"Question {self.calls.count(role)}?"
+
+
+@pytest.fixture(scope="module")
+def crew():
+    return InterviewCrew()
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = FakeLlm()
+    monkeypatch.setattr(crew_module.llm_scheduler, "kickoff", fake.kickoff)
+    return fake
+
+
+def _start(crew) -> str:
+    session_id = f"crew_test_{next(_session_ids)}"
+    crew.start_interview(session_id, "Software Engineer", "2-3", "Medium", "")
+    return session_id
+
+
+def test_retried_seq_returns_the_stored_response(crew, llm):
+    session_id = _start(crew)
+    first = crew.answer_turn(session_id, "I would add an index", 1)
+    calls = len(llm.calls)
+
+    again = crew.answer_turn(session_id, "I would add an index", 1)
+    assert again == first
+    assert len(llm.calls) == calls
+    assert len(session_manager.get_interaction_blocks(session_id)) == 1
+
+
+def test_unexpected_seq_is_rejected(crew, llm):
+    session_id = _start(crew)
+    crew.answer_turn(session_id, "First answer", 1)
+    with pytest.raises(AnswerSequenceError) as error:
+        crew.answer_turn(session_id, "Skipped ahead", 3)
+    assert error.value.expected == 2
+    assert len(session_manager.get_interaction_blocks(session_id)) == 1
+
+
+@pytest.mark.parametrize("deferred", [False, True])
+def test_retry_after_a_failed_turn_scores_the_answer_once(crew, llm, monkeypatch, deferred):
+    monkeypatch.setattr(crew_module, "DEFERRED_SCORING", deferred)
+    session_id = _start(crew)
+    llm.fail_next_question = 1
+
+    with pytest.raises(RuntimeError):
+        crew.answer_turn(session_id, "Use a read replica for reporting queries", 1)
+    result = crew.answer_turn(session_id, "Use a read replica for reporting queries", 1)
+    assert result["success"]
+    crew.wait_for_scores(session_id)
+
+    session = session_manager.get_session(session_id)
+    blocks = session_manager.get_interaction_blocks(session_id)
+    assert len(blocks) == 1
+    assert blocks[0]["scores"]["domain_knowledge"] == 70
+    assert session["scored_interactions"] == 1
+    assert session["aggregates"].count == 1
+    assert session["total_interactions"] == 1
+
+
+def test_chunk_summary_bounds_its_slot_wait_by_the_deadline(crew, llm):
+    blocks = [{"question": "Q?", "answer": "A", "scores": SCORES}]
+    summary = crew._summarize_chunk("s", "Software Engineer", "Medium", blocks, 0, time.monotonic() + 5)
+    assert summary.startswith("Q1-1: Did well")
+    assert 0 < llm.timeouts[-1] <= 5
+    # The chunk agent's own request is bounded too, so a worker is never held indefinitely
+    assert crew.feedback.chunk_agent.llm.timeout > 0
+
+
+def test_chunk_past_its_deadline_skips_the_llm(crew, llm):
+    blocks = [{"question": "Q?", "answer": "A", "scores": SCORES}]
+    assert crew._summarize_chunk("s", "Software Engineer", "Medium", blocks, 0, time.monotonic() - 1) is None
+    assert llm.calls == []
+
+
+def test_resume_the_taxonomy_finds_nothing_in_is_still_sent(crew):
+    resume = "Pastry chef for eight years; ran a bakery kitchen of twelve and cut waste by a third. " * 3
+    profile = crew_module.skill_extractor.profile(resume)
+    task = crew.interviewer.create_question_task("Software Engineer", "2-3", "Medium", resume, ["Q1?"], [],
+                                                 resume_profile=profile, resume_topics=[], full_resume=False)
+    assert "NO RESUME PROVIDED" not in task.description
+    assert "Pastry chef for eight years" in task.description
+    assert "EXTRACTED PROFILE" not in task.description
@@ -0,0 +1,83 @@
+"""
+LlmScheduler slot handling: priority classes, aging and bounded slot waits
+"""
+import threading
+import time
+
+import pytest
+
+from utils.llm_scheduler import LlmScheduler, NEXT_QUESTION, PREFETCH, REPORT, SCORING
+
+
+def test_queued_call_times_out_and_leaves_the_queue():
+    scheduler = LlmScheduler(concurrency=1, aging_seconds=0)
+    scheduler.acquire(NEXT_QUESTION)
+    with pytest.raises(TimeoutError):
+        scheduler.acquire(REPORT, timeout=0.05)
+    stats = scheduler.stats()
+    assert stats["waiting"] == 0
+    assert stats["classes"][REPORT]["timed_out"] == 1
+    # The timed-out call never took a slot: once the held one is released the scheduler is idle
+    scheduler.release()
+    assert scheduler.stats()["active"] == 0
+    scheduler.run(SCORING, lambda: None, timeout=0.05)
+    assert scheduler.stats()["active"] == 0
+
+
+def _hold_and_queue(scheduler, classes):
+    """Hold the only slot, queue one call per class in order, release; returns the order they ran in"""
+    served = []
+    scheduler.acquire(NEXT_QUESTION)
+    threads = []
+    for llm_class in classes:
+        thread = threading.Thread(target=scheduler.run, args=(llm_class, lambda c=llm_class: served.append(c)))
+        thread.start()
+        threads.append(thread)
+        _wait_for_waiters(scheduler, len(threads))
+    return served, threads
+
+
+def _wait_for_waiters(scheduler, count):
+    deadline = time.monotonic() + 2
+    while scheduler.stats()["waiting"] < count:
+        assert time.monotonic() < deadline, "calls never queued"
+        time.sleep(0.005)
+
+
+def _drain(scheduler, threads):
+    scheduler.release()
+    for thread in threads:
+        thread.join(2)
+    assert scheduler.stats()["active"] == 0
+
+
+def test_waiting_calls_are_served_by_class_then_arrival():
+    scheduler = LlmScheduler(concurrency=1, aging_seconds=0)
+    served, threads = _hold_and_queue(scheduler, [PREFETCH, REPORT, SCORING, NEXT_QUESTION, SCORING])
+    _drain(scheduler, threads)
+    assert served == [NEXT_QUESTION, SCORING, SCORING, REPORT, PREFETCH]
+    assert scheduler.stats()["classes"][REPORT]["aged"] == 0
+
+
+def test_aging_promotes_a_long_waiting_call_past_newer_higher_classes():
+    scheduler = LlmScheduler(concurrency=1, aging_seconds=0.05)
+    served, threads = _hold_and_queue(scheduler, [REPORT])
+    # Two classes' worth of aging: the report now outranks a fresh next_question call
+    time.sleep(0.15)
+    more_threads = []
+    for llm_class in (NEXT_QUESTION, SCORING):
+        thread = threading.Thread(target=scheduler.run, args=(llm_class, lambda c=llm_class: served.append(c)))
+        thread.start()
+        more_threads.append(thread)
+        _wait_for_waiters(scheduler, 1 + len(more_threads))
+    _drain(scheduler, threads + more_threads)
+    assert served[0] == REPORT
+    assert scheduler.stats()["classes"][REPORT]["aged"] == 1
+
+
+def test_free_slots_are_taken_without_queueing():
+    scheduler = LlmScheduler(concurrency=2, aging_seconds=0)
+    assert scheduler.run(PREFETCH, lambda: "done") == "done"
+    stats = scheduler.stats()
+    assert stats["classes"][PREFETCH]["calls"] == 1 and stats["classes"][PREFETCH]["queued"] == 0
+    assert stats["active"] == 0
@@ -0,0 +1,31 @@
+import pytest
+
+from utils.local_scorer import SCORE_DIMENSIONS, compute_final_score, local_scorer
+
+
+@pytest.mark.parametrize("answer", ["", "   ", "idk", "I don't know.", "Pass", "skip", "N/A"])
+def test_empty_and_exact_non_answers_are_trivial(answer):
+    assert local_scorer.is_trivial(answer)
+
+
+@pytest.mark.parametrize("answer", ["O(n log n)", "Use a mutex", "Binary search", "Python", "Yes.", "no",
+                                    "I don't know the exact number, but roughly 40 ms"])
+def test_short_real_answers_are_not_trivial(answer):
+    assert not local_scorer.is_trivial(answer)
+
+
+def test_trivial_answer_scores_low_without_features():
+    scores = local_scorer.score("Explain CAP theorem", "idk")
+    assert all(scores[dim] <= 10 for dim in SCORE_DIMENSIONS)
+    assert scores["final_score"] == compute_final_score(scores)
+
+
+def test_short_answer_is_scored_on_its_features():
+    scores = local_scorer.score("What is the complexity of merge sort?", "O(n log n)")
+    assert set(SCORE_DIMENSIONS) <= set(scores)
+    assert scores["feedback"].startswith("To improve")
+
+
+def test_final_score_uses_the_rubric_weights():
+    assert compute_final_score({"domain_knowledge": 100, "communication": 0, "confidence": 0, "depth": 0}) == 30
+    assert compute_final_score({dim: 80 for dim in SCORE_DIMENSIONS}) == 80
@@ -0,0 +1,65 @@
+import io
+
+import pytest
+from pypdf import PdfReader
+
+from benchmarks.synthetic import make_session_summary
+from utils.pdf_generator import PDFReportGenerator, ordinal
+
+
+def _pdf_text(pdf_bytes: bytes) -> str:
+    return "\n".join(page.extract_text() for page in PdfReader(io.BytesIO(pdf_bytes)).pages)
+
+
+def test_generator_reuses_sample_body_text_style():
+    generator = PDFReportGenerator()
+    body_text = generator.styles['BodyText']
+    assert body_text.fontSize == 11
+    # A second generator must not try to redefine the style either
+    PDFReportGenerator()
+
+
+def test_render_report_returns_a_readable_pdf():
+    summary = make_session_summary("pdf_test", n_interactions=3, seed=1)
+    pdf_bytes = PDFReportGenerator().render_report(summary)
+
+    assert pdf_bytes.startswith(b"%PDF")
+    text = _pdf_text(pdf_bytes)
+    assert "Interview Performance Report" in text
+    assert "Question 1" in text
+
+
+def test_render_report_without_interactions():
+    summary = make_session_summary("pdf_empty", n_interactions=0)
+    assert PDFReportGenerator().render_report(summary).startswith(b"%PDF")
+
+
+@pytest.mark.parametrize("n, label", [(1, "1st"), (2, "2nd"), (3, "3rd"), (4, "4th"), (11, "11th"), (12, "12th"),
+                                      (13, "13th"), (21, "21st"), (22, "22nd"), (50, "50th"), (99, "99th"),
+                                      (101, "101st"), (111, "111th")])
+def test_ordinal_suffixes(n, label):
+    assert ordinal(n) == label
+
+
+def test_percentile_table_uses_ordinals_and_counts_interviews():
+    summary = make_session_summary("pdf_rank", n_interactions=2, seed=2)
+    summary["percentiles"] = {
+        "role": summary["role"], "difficulty": summary["difficulty"], "cohort_size": 42,
+        "dimensions": {"final_score": {"score": 71.0, "percentile": 22.4},
+                       "depth": {"score": 64.0, "percentile": 2.6}},
+    }
+    text = _pdf_text(PDFReportGenerator().render_report(summary))
+    assert "Compared with 42 previous interviews" in text
+    assert "22nd" in text and "3rd" in text
+    assert "22th" not in text
+
+
+def test_recommendations_do_not_name_question_types_as_subjects():
+    summary = make_session_summary("pdf_types", n_interactions=4, seed=3)
+    for i, block in enumerate(summary["interaction_blocks"]):
+        block["topic"] = "different_question" if i % 2 else "followup"
+        block["scores"]["final_score"] = 40 if i % 2 else 80
+    summary.pop("aggregates", None)
+    text = _pdf_text(PDFReportGenerator().render_report(summary))
+    assert "Focus practice on" not in text
+    assert "different question questions" not in text
@@ -0,0 +1,107 @@
+import random
+
+import pytest
+
+import memory.percentile_index as percentile_module
+from memory.analytics_store import AnalyticsStore, DIMENSIONS
+from memory.percentile_index import BUCKETS, FenwickTree, PercentileIndex, session_means
+
+
+def _summary(scores, role="Software Engineer", difficulty="Medium"):
+    return {
+        "role": role,
+        "difficulty": difficulty,
+        "experience": "2-3",
+        "interaction_blocks": [{"scores": {dim: score for dim in DIMENSIONS}} for score in scores],
+    }
+
+
+@pytest.fixture
+def min_cohort(monkeypatch):
+    monkeypatch.setattr(percentile_module, "PERCENTILE_MIN_COHORT", 1)
+
+
+def test_fenwick_prefix_sums_match_a_plain_list():
+    rng = random.Random(3)
+    counts = [rng.randint(0, 3) for _ in range(50)]
+    built = FenwickTree(50, counts)
+    incremental = FenwickTree(50)
+    for index, count in enumerate(counts):
+        if count:
+            incremental.add(index, count)
+    for index in range(51):
+        assert built.prefix(index) == incremental.prefix(index) == sum(counts[:index])
+    assert built.total == incremental.total == sum(counts)
+
+
+def test_sessions_are_ranked_against_interview_means(tmp_path, min_cohort):
+    index = PercentileIndex(AnalyticsStore(str(tmp_path), persist=False))
+    # Prior interviews all average 50, although their single answers spread from 0 to 100
+    for _ in range(10):
+        index.add_session(_summary([0, 100]))
+
+    ranking = index.rank_session(_summary([55, 65]))
+    assert ranking["cohort_size"] == 10
+    assert ranking["dimensions"]["final_score"] == {"score": 60.0, "percentile": 100.0}
+    assert index.rank_session(_summary([50]))["dimensions"]["final_score"]["percentile"] == 50.0
+
+
+def test_small_cohorts_get_no_percentile(tmp_path):
+    index = PercentileIndex(AnalyticsStore(str(tmp_path), persist=False))
+    index.add_session(_summary([70]))
+    ranking = index.rank_session(_summary([80]))
+    assert ranking["dimensions"]["final_score"]["percentile"] is None
+    assert ranking["cohort_size"] == 1
+
+
+def test_seed_from_the_store_matches_incremental_updates(tmp_path, min_cohort):
+    store = AnalyticsStore(str(tmp_path))
+    live = PercentileIndex(AnalyticsStore(str(tmp_path / "other"), persist=False))
+    rng = random.Random(8)
+    for _ in range(40):
+        summary = _summary([rng.uniform(20, 95) for _ in range(rng.randint(1, 6))],
+                           role=rng.choice(["Software Engineer", "Data Scientist"]),
+                           difficulty=rng.choice(["Easy", "Hard"]))
+        live.add_session(summary)
+        store.record_session(summary)
+
+    restarted = PercentileIndex(AnalyticsStore(str(tmp_path)))
+    assert restarted.stats() == live.stats() == {"cohorts": 4, "indexed_interviews": 40}
+    for role in ("Software Engineer", "Data Scientist"):
+        for dim in DIMENSIONS:
+            for score in (25, 50, 72.5, 90):
+                assert restarted.rank(role, "Hard", dim, score) == live.rank(role, "Hard", dim, score)
+
+
+def test_unfinished_sessions_never_reach_the_index():
+    from memory.session_memory import SessionMemoryManager
+
+    manager = SessionMemoryManager()
+    before = percentile_module.percentile_index.stats()["indexed_interviews"]
+    manager.create_session("live", "Software Engineer", "2-3", "Medium", "")
+    scores = {dim: 70 for dim in DIMENSIONS}
+    manager.add_interaction_block("live", {"question": "Q1", "answers": ["A1"], "scores": scores})
+    manager.add_interaction_block("live", {"question": "Q2", "answers": ["A2"], "scores": None})
+    manager.attach_scores("live", 1, scores)
+    assert percentile_module.percentile_index.stats()["indexed_interviews"] == before
+
+
+def test_session_means_skip_unscored_blocks():
+    summary = _summary([60, 80])
+    summary["interaction_blocks"].append({"scores": None, "scoring": "pending"})
+    assert session_means(summary)["final_score"] == 70
+    assert session_means({"interaction_blocks": []}) == {}
+    assert BUCKETS == 1001
+
+
+def test_free_text_roles_share_the_stored_cohort_across_restarts(tmp_path, min_cohort):
+    store = AnalyticsStore(str(tmp_path))
+    live = PercentileIndex(AnalyticsStore(str(tmp_path / "other"), persist=False))
+    for role, score in (("software developer", 40), ("SWE", 60), ("Pastry Chef", 70), ("Florist", 30)):
+        live.add_session(_summary([score], role=role))
+        store.record_session(_summary([score], role=role))
+
+    restarted = PercentileIndex(AnalyticsStore(str(tmp_path)))
+    assert restarted.stats() == live.stats() == {"cohorts": 2, "indexed_interviews": 4}
+    assert restarted.rank("Software Engineer", "Medium", "final_score", 50) == (50.0, 2)
+    assert live.rank("Tree Surgeon", "Medium", "final_score", 50) == (50.0, 2)
@@ -0,0 +1,39 @@
+"""
+Resume-grounded question seeds
+"""
+from utils.question_bank import SKILL_TEMPLATES, rank_topics, role_questions, select_questions
+
+
+def _topic(name, category="language", score=1.0):
+    return {"kind": "skill", "name": name, "category": category, "score": score}
+
+
+def test_asked_topics_match_whole_tokens_only():
+    topics = [_topic("Go", score=3), _topic("C", score=2), _topic("R", score=1)]
+    asked = ["How do you approach concurrency in Go?"]
+    seeds = select_questions(None, "Software Engineer", asked, limit=2, topics=topics)
+    assert seeds == [SKILL_TEMPLATES["language"].format(skill="C"), SKILL_TEMPLATES["language"].format(skill="R")]
+
+
+def test_names_do_not_match_across_questions():
+    topics = [{"kind": "project", "name": "Payment Service", "category": "project", "score": 5}]
+    asked = ["Which payment", "service mesh did you use?"]
+    seeds = select_questions(None, "Software Engineer", asked, limit=1, topics=topics)
+    assert "Payment Service" in seeds[0]
+
+
+def test_asked_project_is_skipped_and_role_questions_top_up():
+    topics = [{"kind": "project", "name": "Payment Service", "category": "project", "score": 5}]
+    asked = ["Walk me through the payment service you built"]
+    seeds = select_questions(None, "Software Engineer", asked, limit=2, topics=topics)
+    assert seeds == role_questions("Software Engineer")[:2]
+
+
+def test_projects_rank_first_and_role_focus_boosts_skills():
+    profile = {
+        "projects": ["Ledger"],
+        "skills": [{"name": "React", "category": "frontend", "mentions": 2},
+                   {"name": "PostgreSQL", "category": "database", "mentions": 2}],
+    }
+    names = [topic["name"] for topic in rank_topics(profile, "Backend Engineer")]
+    assert names == ["Ledger", "PostgreSQL", "React"]
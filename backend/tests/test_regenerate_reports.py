@@ -0,0 +1,25 @@
+"""
+Batch regeneration CLI against a store a server may be using
+"""
+import os
+
+from benchmarks.synthetic import make_session_summary
+from regenerate_reports import regenerate
+from utils.report_store import ReportStore
+
+
+def test_regeneration_writes_pdfs_and_leaves_the_index_to_the_server(tmp_path):
+    server = ReportStore(str(tmp_path), sweep_interval=0)
+    for i in range(3):
+        server.save_summary(f"r{i}", make_session_summary(f"r{i}", n_interactions=2, seed=i))
+    journal = os.path.join(str(tmp_path), "index.jsonl")
+    journal_size = os.path.getsize(journal)
+
+    cli = ReportStore(str(tmp_path), sweep_interval=0, read_only=True)
+    result = regenerate(cli, cli.list_summary_ids(), workers=1, chunk_size=2, quiet=True)
+
+    assert result["reports"] == 3 and result["failed"] == 0
+    assert os.path.getsize(journal) == journal_size
+    assert server.get_entry("r0").get("pdf_bytes") is None
+    assert server.apply_pending_pdfs() == 3
+    assert server.load_pdf("r0").startswith(b"%PDF")
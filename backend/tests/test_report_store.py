@@ -0,0 +1,148 @@
+import os
+import time
+
+import pytest
+
+from benchmarks.synthetic import make_session_summary
+from utils.report_cache import ReportCache
+from utils.report_service import ReportService
+from utils.report_store import ReportStore, is_valid_report_id
+
+
+def _store(tmp_path, **kwargs) -> ReportStore:
+    kwargs.setdefault("sweep_interval", 0)
+    return ReportStore(str(tmp_path), **kwargs)
+
+
+def test_report_ids_are_restricted_to_a_safe_alphabet():
+    assert is_valid_report_id("session_1.2-a")
+    for report_id in ("", ".", "..", "../etc/passwd", "a/b", "x" * 129):
+        assert not is_valid_report_id(report_id)
+
+
+def test_journal_replay_restores_the_index(tmp_path):
+    store = _store(tmp_path)
+    store.save_summary("a", {"session_id": "a"})
+    store.save_summary("b", {"session_id": "b"})
+    store.save_pdf("a", b"%PDF-a")
+    store.delete("b")
+
+    reopened = _store(tmp_path)
+    assert reopened.list_report_ids() == ["a"]
+    assert reopened.load_summary("a") == {"session_id": "a"}
+    assert reopened.load_pdf("a") == b"%PDF-a"
+    assert reopened.load_summary("b") is None
+    assert reopened.stats()["total_bytes"] == store.stats()["total_bytes"]
+
+
+def test_journal_replay_skips_a_torn_last_line(tmp_path):
+    store = _store(tmp_path)
+    store.save_summary("a", {"session_id": "a"})
+    with open(os.path.join(str(tmp_path), "index.jsonl"), "a", encoding="utf-8") as f:
+        f.write('{"op":"put","id":"b","ent')
+
+    assert _store(tmp_path).list_report_ids() == ["a"]
+
+
+def test_sweep_evicts_expired_reports(tmp_path):
+    store = _store(tmp_path, max_age_seconds=60)
+    store.save_summary("old", {"session_id": "old"})
+    store._index["old"]["created_at"] = time.time() - 120
+    store.save_summary("new", {"session_id": "new"})
+
+    assert store.sweep() == 1
+    assert store.list_report_ids() == ["new"]
+    assert store.load_summary("old") is None
+
+
+def test_size_budget_evicts_oldest_first(tmp_path):
+    store = _store(tmp_path, max_bytes=2500)
+    for i in range(3):
+        store.save_summary(f"r{i}", {"session_id": f"r{i}"})
+        store.save_pdf(f"r{i}", b"x" * 1000)
+
+    assert store.list_report_ids() == ["r1", "r2"]
+    assert store.stats()["evicted"] == 1
+
+
+def test_size_budget_evicts_least_recently_used_first(tmp_path):
+    store = _store(tmp_path, max_bytes=2500)
+    for i in range(2):
+        store.save_summary(f"r{i}", {"session_id": f"r{i}"})
+        store.save_pdf(f"r{i}", b"x" * 1000)
+    assert store.load_pdf("r0") is not None
+    store.save_summary("r2", {"session_id": "r2"})
+    store.save_pdf("r2", b"x" * 1000)
+
+    assert store.list_report_ids() == ["r0", "r2"]
+
+
+def test_lazily_rendered_old_report_survives_its_own_registration(tmp_path):
+    store = _store(tmp_path, max_bytes=3000)
+    store.save_summary("old", {"session_id": "old"})
+    store.save_summary("new", {"session_id": "new"})
+    store.save_pdf("new", b"y" * 500)
+    store._index["old"]["created_at"] = store._index["old"]["last_used"] = time.time() - 3600
+
+    store.save_pdf("old", b"x" * 2900)
+
+    assert store.get_entry("old") is not None
+    assert store.load_pdf("old") == b"x" * 2900
+    assert store.load_pdf("old") == b"x" * 2900
+    # The budget was met by evicting the other report instead
+    assert store.get_entry("new") is None
+
+
+def test_deleted_report_is_no_longer_served_from_the_cache(tmp_path):
+    store = _store(tmp_path, max_age_seconds=60)
+    service = ReportService(store=store, cache=ReportCache(), prewarm=False)
+    service.finish_interview("gone", make_session_summary("gone", n_interactions=2))
+    assert service.get_or_render("gone") is not None
+
+    store._index["gone"]["created_at"] = time.time() - 120
+    store.sweep()
+
+    assert not service.has_report("gone")
+    assert service.get_or_render("gone") is None
+    assert service.cache.stats()["entries"] == 0
+
+
+def test_read_only_store_never_writes_the_index(tmp_path):
+    store = _store(tmp_path)
+    store.save_summary("a", {"session_id": "a"})
+    journal = os.path.join(str(tmp_path), "index.jsonl")
+    with open(journal, "rb") as f:
+        before = f.read()
+
+    reader = _store(tmp_path, read_only=True)
+    assert reader.load_summary("a") == {"session_id": "a"}
+    with pytest.raises(RuntimeError):
+        reader.save_pdf("a", b"%PDF-a")
+    with pytest.raises(RuntimeError):
+        reader.delete("a")
+    with open(journal, "rb") as f:
+        assert f.read() == before
+
+
+def test_server_registers_pdfs_written_by_another_process(tmp_path):
+    server = _store(tmp_path)
+    service = ReportService(store=server, cache=ReportCache(), prewarm=False)
+    for report_id in ("a", "b"):
+        service.finish_interview(report_id, make_session_summary(report_id, n_interactions=2))
+    old_digest, _ = service.get_or_render("a")
+
+    cli = _store(tmp_path, read_only=True)
+    cli.write_pdf_file("a", b"%PDF-regenerated")
+    cli.write_pdf_file("b", b"%PDF-new")
+    cli.queue_pdfs(["a", "b"])
+    server.delete("b")  # evicted while the CLI was running
+
+    assert server.sweep() == 0
+    entry = server.get_entry("a")
+    assert entry["pdf_bytes"] == len(b"%PDF-regenerated")
+    assert entry["digest"] != old_digest
+    assert service.get_or_render("a")[1] == b"%PDF-regenerated"
+    assert not os.path.exists(server.pdf_path("b"))
+    assert os.listdir(os.path.join(str(tmp_path), "pending")) == []
+    # The registration went through the server's journal
+    assert _store(tmp_path).get_entry("a")["digest"] == entry["digest"]
@@ -0,0 +1,69 @@
+"""
+Running score aggregates: means, extremes, trend and per-question-type totals
+"""
+import pytest
+
+from utils.local_scorer import SCORE_DIMENSIONS
+from utils.score_aggregates import ScoreAggregates, summary_aggregates
+
+
+def _scores(value):
+    return {**{dim: value for dim in SCORE_DIMENSIONS}, "final_score": value}
+
+
+def test_mean_extremes_and_last_value():
+    aggregates = ScoreAggregates()
+    for index, value in enumerate((60, 80, 70)):
+        aggregates.add(_scores(value), index)
+    final = aggregates.snapshot()["dimensions"]["final_score"]
+    assert aggregates.snapshot()["count"] == 3
+    assert (final["mean"], final["min"], final["max"], final["last"]) == (70.0, 60.0, 80.0, 70.0)
+
+
+@pytest.mark.parametrize("values, trend", [
+    ((50, 60, 70, 80), 10.0),   # +10 points per answer
+    ((80, 70, 60), -10.0),
+    ((65, 65, 65), 0.0),
+    ((72,), 0.0),               # a single answer has no trend
+])
+def test_trend_is_the_least_squares_slope_per_answer(values, trend):
+    aggregates = ScoreAggregates()
+    for index, value in enumerate(values):
+        aggregates.add(_scores(value), index)
+    assert aggregates.snapshot()["dimensions"]["final_score"]["trend"] == pytest.approx(trend)
+
+
+def test_trend_of_noisy_scores_matches_a_direct_fit():
+    values = [55, 71, 62, 80, 77, 90]
+    aggregates = ScoreAggregates()
+    for index, value in enumerate(values):
+        aggregates.add(_scores(value), index)
+    n = len(values)
+    mean_x, mean_y = (n - 1) / 2, sum(values) / n
+    slope = (sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+             / sum((x - mean_x) ** 2 for x in range(n)))
+    assert aggregates.snapshot()["dimensions"]["final_score"]["trend"] == round(slope, 2)
+
+
+def test_per_type_totals_average_only_their_own_answers():
+    aggregates = ScoreAggregates()
+    aggregates.add(_scores(40), 0, "introduction")
+    aggregates.add(_scores(60), 1, "followup")
+    aggregates.add(_scores(80), 2, "followup")
+    aggregates.add(_scores(90), 3)  # no topic: counted overall only
+    topics = aggregates.snapshot()["topics"]
+    assert topics == {
+        "introduction": {"count": 1, **_scores(40.0)},
+        "followup": {"count": 2, **_scores(70.0)},
+    }
+    assert aggregates.snapshot()["count"] == 4
+
+
+def test_summary_aggregates_rebuilds_from_blocks_when_missing():
+    blocks = [{"scores": _scores(50), "topic": "introduction"}, {"question": "unscored"},
+              {"scores": _scores(70), "topic": "followup"}]
+    rebuilt = summary_aggregates({"interaction_blocks": blocks})
+    assert rebuilt["count"] == 2
+    assert rebuilt["dimensions"]["final_score"]["mean"] == 60.0
+    stored = {"count": 9, "dimensions": {}, "topics": {}}
+    assert summary_aggregates({"aggregates": stored, "interaction_blocks": blocks}) is stored
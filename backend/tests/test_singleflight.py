@@ -0,0 +1,83 @@
+"""
+Singleflight coalescing of identical in-flight calls, and the prompt key
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from utils.singleflight import Singleflight, prompt_key
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 2
+    while not condition():
+        assert time.monotonic() < deadline, "condition never met"
+        time.sleep(0.005)
+
+
+def _leader_and_followers(singleflight, call, followers=3):
+    """Start one call and `followers` identical ones while it is in flight; returns their futures"""
+    pool = ThreadPoolExecutor(max_workers=followers + 1)
+    futures = [pool.submit(singleflight.do, "key", call)]
+    _wait_for(lambda: singleflight.stats()["in_flight"] == 1)
+    futures += [pool.submit(singleflight.do, "key", call) for _ in range(followers)]
+    _wait_for(lambda: singleflight.stats()["coalesced"] == followers)
+    pool.shutdown(wait=False)
+    return futures
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    singleflight, release, executions = Singleflight(), threading.Event(), []
+
+    def call():
+        executions.append(1)
+        release.wait(2)
+        return {"question": "Why?"}
+
+    futures = _leader_and_followers(singleflight, call)
+    release.set()
+    results = [future.result(2) for future in futures]
+    assert len(executions) == 1
+    assert all(result is results[0] for result in results)
+    stats = singleflight.stats()
+    assert stats["executed"] == 1 and stats["coalesced"] == 3 and stats["in_flight"] == 0
+
+
+def test_failure_reaches_every_caller_and_is_not_remembered():
+    singleflight, release = Singleflight(), threading.Event()
+
+    def failing():
+        release.wait(2)
+        raise RuntimeError("rate limited")
+
+    futures = _leader_and_followers(singleflight, failing, followers=2)
+    release.set()
+    for future in futures:
+        with pytest.raises(RuntimeError, match="rate limited"):
+            future.result(2)
+    assert singleflight.stats()["failed"] == 1 and singleflight.stats()["in_flight"] == 0
+    # The key was dropped: the next call runs on its own
+    assert singleflight.do("key", lambda: "fresh") == "fresh"
+
+
+def test_sequential_calls_are_not_cached():
+    singleflight = Singleflight()
+    assert [singleflight.do("key", lambda n=n: n) for n in range(3)] == [0, 1, 2]
+    assert singleflight.stats()["executed"] == 3 and singleflight.stats()["coalesced"] == 0
+
+
+def _crew(description, llm="groq/llama-3.1-8b-instant"):
+    agent = SimpleNamespace(llm=llm, role="Interviewer", goal="Ask", backstory="Expert")
+    return SimpleNamespace(agents=[agent], tasks=[SimpleNamespace(description=description, expected_output="Q")])
+
+
+def test_prompt_key_covers_model_and_prompt_text():
+    assert prompt_key(_crew("Ask about Go")) == prompt_key(_crew("Ask about Go"))
+    assert prompt_key(_crew("Ask about Go")) != prompt_key(_crew("Ask about Rust"))
+    assert prompt_key(_crew("Ask about Go")) != prompt_key(_crew("Ask about Go", llm="groq/other-model"))
+    # An LLM object keys by its model name, like the plain string
+    llm_object = SimpleNamespace(model="groq/llama-3.1-8b-instant", timeout=30)
+    assert prompt_key(_crew("Ask about Go", llm=llm_object)) == prompt_key(_crew("Ask about Go"))
@@ -0,0 +1,55 @@
+"""
+Skill taxonomy matching (word-level Aho-Corasick automaton) and resume profiles
+"""
+import random
+
+from utils.skill_taxonomy import SkillExtractor, has_profile, skill_extractor, tech_tokenize
+
+
+def test_automaton_finds_every_occurrence_a_naive_scan_finds():
+    matcher = skill_extractor.matcher
+    patterns = [phrase.split() for phrase, _, _ in matcher.patterns]
+    vocabulary = sorted(matcher.vocabulary) + ["the", "and", "with"]
+    rng = random.Random(11)
+    for _ in range(50):
+        tokens = [rng.choice(vocabulary) for _ in range(40)]
+        naive = {(start + len(pattern) - 1, pattern_id)
+                 for pattern_id, pattern in enumerate(patterns)
+                 for start in range(len(tokens) - len(pattern) + 1)
+                 if tokens[start:start + len(pattern)] == pattern}
+        assert set(matcher.find_all(tokens)) == naive
+
+
+def test_longest_alias_wins_and_punctuated_names_stay_whole():
+    skills = skill_extractor.skills_in("Shipped services in C++, C# and Node.js on PostgreSQL", trusted=True)
+    assert skills == {"C++", "C#", "Node.js", "PostgreSQL"}
+
+
+def test_everyday_words_count_only_in_a_skills_section():
+    assert "Go" not in skill_extractor.skills_in("Happy to go the extra mile")
+    profile = skill_extractor.profile("Experience\nI like to go hiking\n\nSkills\nGo, Python, R\n")
+    names = skill_extractor.skill_names(profile)
+    assert {"Go", "Python", "R"} <= names
+
+
+def test_profile_roles_and_empty_text():
+    profile = skill_extractor.profile("Experience\nBackend Developer at Acme, 2019 - 2022\nBuilt APIs in Java")
+    assert profile["roles"] == ["Backend Engineer"]
+    assert "Java" in skill_extractor.skill_names(profile)
+    assert not has_profile(skill_extractor.profile(""))
+
+
+def test_returned_profile_does_not_share_state_with_the_cache():
+    text = "Skills\nPython, Docker\n"
+    first = skill_extractor.profile(text)
+    first["skills"].clear()
+    first["categories"].clear()
+    second = skill_extractor.profile(text)
+    assert {"Python", "Docker"} <= skill_extractor.skill_names(second)
+    assert second["categories"]
+
+
+def test_custom_taxonomy_and_tokenizer():
+    extractor = SkillExtractor(skills={"language": {"C++": ("cpp",), "C": ()}}, roles={})
+    assert extractor.skills_in("cpp then c++ then c", trusted=True) == {"C++", "C"}
+    assert tech_tokenize("Used C++.") == ["used", "c++"]
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from utils.speech_analysis import FILLER_PHRASES, HEDGE_PHRASES, speech_analyzer, tokenize
+
+PHRASES = {" ".join(tokenize(p)) for p in FILLER_PHRASES + HEDGE_PHRASES}
+WORDS = sorted({w for p in PHRASES for w in p.split()} | {"python", "cache", "latency"})
+
+
+def reference_matches(tokens):
+    """Leftmost-longest, non-overlapping phrase matches by brute force"""
+    found, i = [], 0
+    longest = max(len(p.split()) for p in PHRASES)
+    while i < len(tokens):
+        for length in range(min(longest, len(tokens) - i), 0, -1):
+            phrase = " ".join(tokens[i:i + length])
+            if phrase in PHRASES:
+                found.append(phrase)
+                i += length
+                break
+        else:
+            i += 1
+    return sorted(found)
+
+
+def counted_phrases(counts):
+    phrases = []
+    for breakdown in (counts["filler_breakdown"], counts["hedge_breakdown"]):
+        for phrase, count in breakdown.items():
+            phrases.extend([phrase] * count)
+    return sorted(phrases)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("and stuff like that", ["and stuff", "like"]),
+    ("stuff like that", ["stuff like that"]),
+    ("okay so we shipped it", ["okay so"]),
+    ("i am not sure i think", ["i am not sure", "i think"]),
+    ("i'm not sure", ["i'm not sure"]),
+    ("kind of sort of", ["kind of", "sort of"]),
+])
+def test_overlapping_phrases_are_counted_leftmost_longest(text, expected):
+    assert counted_phrases(speech_analyzer.count_tokens(tokenize(text))) == sorted(expected)
+
+
+def test_filler_and_hedge_totals_never_count_a_word_twice():
+    counts = speech_analyzer.count_tokens(tokenize("and stuff like that"))
+    assert counts["filler_count"] == 2
+    assert counts["hedge_count"] == 0
+
+
+@pytest.mark.parametrize("pieces, expected", [
+    (["and stuff", "like that"], ["and stuff", "like"]),
+    (["stuff like", "that"], ["stuff like that"]),
+    (["i am not", "sure about it"], ["i am not sure"]),
+    (["okay", "so"], ["okay so"]),
+])
+def test_phrases_spanning_chunks_match_the_whole_text(pieces, expected):
+    counter = speech_analyzer.counter()
+    for piece in pieces:
+        counter.feed(tokenize(piece))
+    assert counted_phrases(counter.counts()) == sorted(expected)
+
+
+def test_snapshot_mid_phrase_does_not_change_the_final_counts():
+    counter = speech_analyzer.counter()
+    counter.feed(tokenize("stuff like"))
+    assert counted_phrases(counter.counts()) == ["like"]
+    counter.feed(tokenize("that"))
+    assert counted_phrases(counter.counts()) == ["stuff like that"]
+
+
+def test_random_streams_match_the_reference_in_any_chunking():
+    rng = random.Random(31)
+    for _ in range(300):
+        tokens = [rng.choice(WORDS) for _ in range(rng.randint(0, 30))]
+        expected = reference_matches(tokens)
+        assert counted_phrases(speech_analyzer.count_tokens(tokens)) == expected
+
+        counter, i = speech_analyzer.counter(), 0
+        while i < len(tokens):
+            step = rng.randint(1, 4)
+            counter.feed(tokens[i:i + step])
+            i += step
+        assert counted_phrases(counter.counts()) == expected
+
+
+def test_repetitions_are_counted_across_chunks():
+    counter = speech_analyzer.counter()
+    counter.feed(tokenize("we cache"))
+    counter.feed(tokenize("cache results that that"))
+    assert counter.counts()["repetition_count"] == 1
@@ -0,0 +1,43 @@
+"""
+/analyze-speech request validation: bodies are pydantic models, so bad types never reach the analyzer
+"""
+import asyncio
+
+import pytest
+from pydantic import ValidationError
+
+from main import SpeechAnalysisRequest, SpeechBatchRequest, analyze_speech, analyze_speech_batch
+
+
+def test_numeric_string_duration_is_coerced():
+    result = asyncio.run(analyze_speech(SpeechAnalysisRequest(transcript="we cached the results",
+                                                               duration_seconds="2")))
+    assert result["success"] and result["words_per_minute"] == 120.0
+
+
+@pytest.mark.parametrize("body", [
+    {"transcript": "fine", "duration_seconds": "forty"},
+    {"transcript": 5},
+    {"transcript": ["a", "b"]},
+])
+def test_malformed_single_requests_are_rejected(body):
+    with pytest.raises(ValidationError):
+        SpeechAnalysisRequest(**body)
+
+
+def test_batch_mixes_strings_and_objects():
+    request = SpeechBatchRequest(transcripts=["um so yes", {"transcript": "we cached it", "duration_seconds": 3}])
+    result = asyncio.run(analyze_speech_batch(request))
+    assert result["count"] == 2
+    assert result["results"][0]["words_per_minute"] is None
+    assert result["results"][1]["words_per_minute"] == 60.0
+
+
+@pytest.mark.parametrize("body", [
+    {"transcripts": "not a list"},
+    {"transcripts": [5]},
+    {"transcripts": [{"transcript": "ok", "duration_seconds": "soon"}]},
+])
+def test_malformed_batches_are_rejected(body):
+    with pytest.raises(ValidationError):
+        SpeechBatchRequest(**body)
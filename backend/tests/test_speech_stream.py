@@ -0,0 +1,85 @@
+import pytest
+
+from utils.speech_stream import SpeechStreamManager, SpeechStreamSession, parse_chunk
+
+
+def _stream() -> SpeechStreamSession:
+    return SpeechStreamSession("test")
+
+
+def test_disjoint_chunks_add_up():
+    stream = _stream()
+    stream.add_chunk("we cached", 0.0, 1.0)
+    stream.add_chunk("the results", 2.0, 3.5)
+    assert stream.stats()["speaking_seconds"] == pytest.approx(2.5)
+    assert stream.stats()["elapsed_seconds"] == pytest.approx(3.5)
+
+
+@pytest.mark.parametrize("chunks, expected", [
+    ([(0.0, 2.0), (1.0, 3.0)], 3.0),                 # partial overlap
+    ([(0.0, 4.0), (1.0, 2.0)], 4.0),                 # contained
+    ([(0.0, 2.0), (0.0, 2.0)], 2.0),                 # re-sent segment
+    ([(3.0, 4.0), (0.0, 1.0), (0.5, 3.5)], 4.0),     # out of order, bridging two ranges
+    ([(0.0, 1.0), (1.0, 2.0)], 2.0),                 # touching
+])
+def test_overlapping_chunks_are_merged(chunks, expected):
+    stream = _stream()
+    for start, end in chunks:
+        stream.add_chunk("word", start, end)
+    assert stream.stats()["speaking_seconds"] == pytest.approx(expected)
+
+
+def test_chunks_without_timing_only_update_counts():
+    stream = _stream()
+    stream.add_chunk("um so basically", None, None)
+    stats = stream.stats()
+    assert stats["speaking_seconds"] == 0
+    assert stats["filler_words"] == 3
+
+
+def test_pauses_between_chunks_are_bucketed():
+    stream = _stream()
+    stream.add_chunk("first", 0.0, 1.0)
+    stream.add_chunk("second", 1.1, 2.0)   # below the pause threshold
+    stream.add_chunk("third", 4.5, 5.0)    # long pause
+    stats = stream.stats()
+    assert stats["pause_count"] == 1
+    assert stats["long_pauses"] == 1
+    assert stats["pause_histogram"][">=5.0s"] == 0
+
+
+def test_manager_streams_phrases_across_chunks():
+    manager = SpeechStreamManager()
+    stream = manager.start("session")
+    manager.add_chunks(stream.stream_id, [{"text": "and stuff", "start": 0.0, "end": 1.0},
+                                          {"text": "like that", "start": 0.8, "end": 2.0}])
+    final = manager.end(stream.stream_id)
+    assert final["filler_breakdown"] == {"and stuff": 1, "like": 1}
+    assert final["speaking_seconds"] == pytest.approx(2.0)
+    assert manager.get(stream.stream_id) is None
+
+
+@pytest.mark.parametrize("chunk", [
+    {"text": 5},
+    {"text": "ok", "start": "0", "end": "1"},
+    {"text": "ok", "start": True, "end": 1.0},
+    {"text": "ok", "start": 0.0, "end": float("nan")},
+    {"text": "ok", "start": float("-inf")},
+    "not an object",
+])
+def test_malformed_chunks_are_rejected(chunk):
+    with pytest.raises(ValueError):
+        parse_chunk(chunk)
+
+
+def test_rejected_chunk_leaves_the_stream_usable():
+    manager = SpeechStreamManager()
+    stream_id = manager.start().stream_id
+    with pytest.raises(ValueError):
+        manager.add_chunks(stream_id, [{"text": "fine", "start": 0, "end": 1}, {"text": "x", "start": "0", "end": "1"}])
+    stream = manager.get(stream_id)
+    assert stream.chunks == 0 and stream.first_start is None
+
+    manager.add_chunks(stream_id, [{"text": "we cached", "start": 0, "end": 1}, {"text": "it", "start": 2, "end": 2.5}])
+    stats = stream.stats()
+    assert stats["chunks"] == 2 and stats["pause_count"] == 1 and stats["elapsed_seconds"] == 2.5
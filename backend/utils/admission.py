@@ -0,0 +1,227 @@
+"""
+Admission Control - Bounded concurrency for the LLM-backed interview calls
+Every crew request (start, answer, turn, end, and WebSocket answers / ends)
+needs an admission slot. At most ADMISSION_MAX_ACTIVE run at once and at
+most ADMISSION_MAX_ACTIVE_PER_USER of them belong to one user. Requests that
+find no slot wait in a bounded queue for at most ADMISSION_QUEUE_TIMEOUT
+seconds. Freed slots are handed out round-robin across users, so one client
+firing many requests cannot starve the others.
+
+A request is shed (AdmissionRejected, 429 with Retry-After) when the queue,
+or the user's share of it, is full, when the recent drain rate says it
+would not get a slot before its deadline, or when the deadline passes.
+Retry-After is the time the current queue needs to drain at that rate.
+
+The controller lives on the event loop; acquire and release are only
+called from coroutines, so its state needs no lock.
+"""
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+import asyncio
+import math
+import os
+import time
+
+ADMISSION_MAX_ACTIVE = int(os.getenv("ADMISSION_MAX_ACTIVE", "8"))
+ADMISSION_MAX_ACTIVE_PER_USER = int(os.getenv("ADMISSION_MAX_ACTIVE_PER_USER", "2"))
+ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "32"))
+ADMISSION_MAX_QUEUED_PER_USER = int(os.getenv("ADMISSION_MAX_QUEUED_PER_USER", "4"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+MAX_RETRY_AFTER = 60
+
+# Drain rate is measured over the most recent releases within this window
+DRAIN_WINDOW_SECONDS = 60.0
+DRAIN_SAMPLE_SIZE = 64
+
+SHED_REASONS = ("queue_full", "user_queue_full", "predicted_timeout", "deadline")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; carries the reason and the suggested Retry-After"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Server busy ({reason}), retry in {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Concurrency limit plus a fair, bounded, deadline-aware wait queue"""
+
+    def __init__(self, max_active: int = ADMISSION_MAX_ACTIVE,
+                 max_active_per_user: int = ADMISSION_MAX_ACTIVE_PER_USER,
+                 queue_size: int = ADMISSION_QUEUE_SIZE,
+                 max_queued_per_user: int = ADMISSION_MAX_QUEUED_PER_USER,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT):
+        self.max_active = max_active
+        self.max_active_per_user = max_active_per_user
+        self.queue_size = queue_size
+        self.max_queued_per_user = max_queued_per_user
+        self.queue_timeout = queue_timeout
+
+        self._active = 0
+        self._active_by_user: Dict[str, int] = {}
+        # One FIFO per waiting user; users are served in round-robin order
+        self._waiting: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._queued = 0
+        self._releases: Deque[float] = deque(maxlen=DRAIN_SAMPLE_SIZE)
+        self._service_seconds = 0.0
+
+        self.admitted = 0
+        self.queued_total = 0
+        self.wait_seconds = 0.0
+        self.shed = {reason: 0 for reason in SHED_REASONS}
+
+    # ==================== Public API ====================
+
+    @asynccontextmanager
+    async def admit(self, user: str):
+        """Hold an admission slot for the body of the `async with`"""
+        await self.acquire(user)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(user, time.monotonic() - started)
+
+    async def acquire(self, user: str):
+        if self._queued == 0 and self._has_room(user):
+            self._grant(user)
+            return
+        if self._queued >= self.queue_size:
+            self._shed("queue_full")
+        if len(self._waiting.get(user, ())) >= self.max_queued_per_user:
+            self._shed("user_queue_full")
+        rate = self.drain_rate()
+        if rate and (self._queued + 1) / rate > self.queue_timeout:
+            self._shed("predicted_timeout")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(user, deque()).append(waiter)
+        self._queued += 1
+        self.queued_total += 1
+        enqueued = time.monotonic()
+        # Slots may be free for this user even though others are waiting on their per-user limit
+        self._dispatch()
+        try:
+            await asyncio.wait({waiter}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # The client went away; give back a slot that was granted in the meantime
+            if waiter.done() and not waiter.cancelled():
+                self.release(user, 0.0)
+            else:
+                self._remove(user, waiter)
+            raise
+        finally:
+            self.wait_seconds += time.monotonic() - enqueued
+        if not waiter.done():
+            self._remove(user, waiter)
+            self._shed("deadline")
+
+    def release(self, user: str, service_seconds: float):
+        self._active -= 1
+        remaining = self._active_by_user.get(user, 1) - 1
+        if remaining:
+            self._active_by_user[user] = remaining
+        else:
+            self._active_by_user.pop(user, None)
+        self._releases.append(time.monotonic())
+        self._service_seconds += service_seconds
+        self._dispatch()
+
+    def drain_rate(self) -> Optional[float]:
+        """Completed requests per second over the recent window, None without enough data"""
+        cutoff = time.monotonic() - DRAIN_WINDOW_SECONDS
+        recent = [t for t in self._releases if t >= cutoff]
+        if len(recent) < 2 or recent[-1] <= recent[0]:
+            return None
+        return (len(recent) - 1) / (recent[-1] - recent[0])
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue (plus one more request) should have drained"""
+        rate = self.drain_rate()
+        if rate:
+            seconds = (self._queued + 1) / rate
+        else:
+            done = self.admitted - self._active
+            service = self._service_seconds / done if done else self.queue_timeout
+            seconds = service * (self._queued // max(1, self.max_active) + 1)
+        return max(1, min(MAX_RETRY_AFTER, math.ceil(seconds)))
+
+    def stats(self) -> Dict:
+        rate = self.drain_rate()
+        return {
+            "active": self._active,
+            "max_active": self.max_active,
+            "queue_depth": self._queued,
+            "queue_size": self.queue_size,
+            "waiting_users": len(self._waiting),
+            "admitted": self.admitted,
+            "queued_total": self.queued_total,
+            "avg_wait_ms": round(self.wait_seconds / self.queued_total * 1000, 1) if self.queued_total else 0.0,
+            "shed": dict(self.shed),
+            "shed_total": sum(self.shed.values()),
+            "drain_rate_per_s": round(rate, 3) if rate else None,
+            "retry_after": self.retry_after(),
+        }
+
+    # ==================== Internals ====================
+
+    def _has_room(self, user: str) -> bool:
+        return (self._active < self.max_active
+                and self._active_by_user.get(user, 0) < self.max_active_per_user)
+
+    def _grant(self, user: str):
+        self._active += 1
+        self._active_by_user[user] = self._active_by_user.get(user, 0) + 1
+        self.admitted += 1
+
+    def _shed(self, reason: str):
+        self.shed[reason] += 1
+        raise AdmissionRejected(reason, self.retry_after())
+
+    def _remove(self, user: str, waiter: asyncio.Future):
+        queue = self._waiting.get(user)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self._queued -= 1
+        if not queue:
+            del self._waiting[user]
+
+    def _dispatch(self):
+        """Hand free slots to waiting users, one request per user per round"""
+        granted = True
+        while granted and self._active < self.max_active:
+            granted = False
+            for user in list(self._waiting):
+                if self._active >= self.max_active:
+                    return
+                if not self._has_room(user):
+                    continue
+                queue = self._waiting.pop(user)
+                waiter = queue.popleft()
+                self._queued -= 1
+                if queue:
+                    self._waiting[user] = queue  # back of the round-robin order
+                self._grant(user)
+                waiter.set_result(True)
+                granted = True
+
+
+def admission_key(connection) -> str:
+    """Who a request (HTTP or WebSocket handshake) counts against
+    
+    The authenticated identity when an authentication middleware set one,
+    else the client address. Client-supplied headers are never trusted here:
+    a made-up user id per request would get its own per-user limits.
+    """
+    user = connection.scope.get("user")
+    if user is not None and getattr(user, "is_authenticated", False):
+        return f"user:{user.display_name}"
+    return f"ip:{connection.client.host if connection.client else 'unknown'}"
+
+
+# Global admission controller for the crew endpoints
+admission = AdmissionController()
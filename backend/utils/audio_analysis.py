@@ -0,0 +1,249 @@
+"""
+Audio Analysis - Vectorized pace and pause detection from raw PCM / WAV audio
+Audio is read in fixed-size chunks (bounded memory), reduced to 20 ms frame
+energies with NumPy, and voice activity, pauses, speaking rate and long
+silences are derived from the frame energies in vectorized operations.
+The resulting scores feed the `confidence` and `communication` dimensions.
+"""
+from typing import BinaryIO, Dict, Optional, Tuple
+import os
+import wave
+
+import numpy as np
+
+from utils.local_scorer import compute_final_score
+
+FRAME_SECONDS = 0.02
+READ_CHUNK_SECONDS = 10.0
+MIN_PAUSE_SECONDS = 0.25       # shorter gaps are merged into speech
+MIN_VOICED_SECONDS = 0.06      # shorter bursts are treated as clicks
+LONG_SILENCE_SECONDS = 1.5
+MAX_SILENCE_EVENTS = 50
+SYLLABLES_PER_WORD = 1.5
+IDEAL_WPM = (110, 160)
+
+# How much of confidence/communication comes from audio when blending with LLM scores
+AUDIO_SCORE_WEIGHT = float(os.getenv("AUDIO_SCORE_WEIGHT", "0.3"))
+
+_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+
+class AudioFormatError(ValueError):
+    """Raised for audio the analyzer cannot decode"""
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and end (exclusive) indices of True runs"""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.diff(padded.astype(np.int8))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _clamp(value: float) -> int:
+    return int(round(max(0.0, min(100.0, value))))
+
+
+class FrameEnergyAccumulator:
+    """Turns PCM chunks into per-frame RMS energies, carrying partial frames over"""
+
+    def __init__(self, sample_rate: int, channels: int, sample_width: int):
+        if sample_width not in _DTYPES:
+            raise AudioFormatError(f"Unsupported sample width: {sample_width} bytes")
+        if sample_rate <= 0 or channels <= 0:
+            raise AudioFormatError("Sample rate and channel count must be positive")
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.dtype = _DTYPES[sample_width]
+        self.frame_size = max(1, int(sample_rate * FRAME_SECONDS))
+        self.scale = float(2 ** (8 * sample_width - 1))
+        self._carry = np.empty(0, dtype=np.float32)
+        self._pending = b""
+        self._energies = []
+        self.samples = 0
+
+    def feed(self, data: bytes):
+        """Consume raw little-endian PCM bytes"""
+        data = self._pending + data
+        usable = len(data) - len(data) % (self.sample_width * self.channels)
+        self._pending = data[usable:]
+        if not usable:
+            return
+        pcm = np.frombuffer(data[:usable], dtype=self.dtype).astype(np.float32)
+        if self.sample_width == 1:
+            pcm -= 128.0  # 8-bit WAV is unsigned
+        pcm /= self.scale
+        if self.channels > 1:
+            pcm = pcm.reshape(-1, self.channels).mean(axis=1)
+        self.samples += pcm.size
+
+        if self._carry.size:
+            pcm = np.concatenate((self._carry, pcm))
+        whole = pcm.size - pcm.size % self.frame_size
+        self._carry = pcm[whole:].copy()
+        if whole:
+            frames = pcm[:whole].reshape(-1, self.frame_size)
+            self._energies.append(np.sqrt(np.mean(frames * frames, axis=1)))
+
+    def energies(self) -> np.ndarray:
+        if not self._energies:
+            return np.empty(0, dtype=np.float32)
+        return np.concatenate(self._energies)
+
+
+class AudioAnalyzer:
+    """Voice activity, pauses and speaking rate from frame energies"""
+
+    def analyze_file(self, fileobj: BinaryIO, sample_rate: Optional[int] = None, channels: int = 1,
+                     sample_width: int = 2, word_count: Optional[int] = None) -> Dict:
+        """Analyze a WAV file, or raw PCM when sample_rate is given for a headerless stream"""
+        header = fileobj.read(12)
+        fileobj.seek(0)
+        if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+            try:
+                with wave.open(fileobj, "rb") as wav:
+                    if wav.getcomptype() != "NONE":
+                        raise AudioFormatError("Compressed WAV is not supported")
+                    acc = FrameEnergyAccumulator(wav.getframerate(), wav.getnchannels(), wav.getsampwidth())
+                    frames_per_read = max(1, int(acc.sample_rate * READ_CHUNK_SECONDS))
+                    while True:
+                        data = wav.readframes(frames_per_read)
+                        if not data:
+                            break
+                        acc.feed(data)
+            except wave.Error as e:
+                raise AudioFormatError(f"Invalid WAV file: {e}")
+        else:
+            if not sample_rate:
+                raise AudioFormatError("Raw PCM needs sample_rate (and channels / sample_width if not mono 16-bit)")
+            acc = FrameEnergyAccumulator(sample_rate, channels, sample_width)
+            read_bytes = int(sample_rate * READ_CHUNK_SECONDS) * channels * sample_width
+            while True:
+                data = fileobj.read(read_bytes)
+                if not data:
+                    break
+                acc.feed(data)
+        return self.analyze_energies(acc.energies(), acc.samples / acc.sample_rate, word_count)
+
+    def analyze_energies(self, energies: np.ndarray, duration: float,
+                         word_count: Optional[int] = None) -> Dict:
+        """Derive speech metrics from per-frame RMS energies"""
+        if energies.size == 0:
+            return self._empty(duration)
+
+        db = 20 * np.log10(np.maximum(energies, 1e-10))
+        # Adaptive threshold: a margin above the noise floor, never below -50 dBFS
+        noise_floor = float(np.percentile(db, 10))
+        peak = float(np.percentile(db, 95))
+        threshold = max(noise_floor + 0.25 * (peak - noise_floor), noise_floor + 6.0, -50.0)
+        voiced = db > threshold
+
+        starts, ends = _runs(voiced)
+        if starts.size:
+            # Merge gaps shorter than a real pause, then drop click-length bursts
+            gaps = starts[1:] - ends[:-1]
+            keep = gaps >= int(MIN_PAUSE_SECONDS / FRAME_SECONDS)
+            starts = starts[np.concatenate(([True], keep))]
+            ends = ends[np.concatenate((keep, [True]))]
+            long_enough = (ends - starts) >= int(MIN_VOICED_SECONDS / FRAME_SECONDS)
+            starts, ends = starts[long_enough], ends[long_enough]
+        if starts.size == 0:
+            return self._empty(duration)
+
+        voiced_frames = int(np.sum(ends - starts))
+        speaking_seconds = voiced_frames * FRAME_SECONDS
+        span_seconds = float(ends[-1] - starts[0]) * FRAME_SECONDS
+        pauses = (starts[1:] - ends[:-1]) * FRAME_SECONDS
+        pause_seconds = float(pauses.sum()) if pauses.size else 0.0
+        long_mask = pauses >= LONG_SILENCE_SECONDS
+        long_silences = [
+            {"start": round(float(ends[i] * FRAME_SECONDS), 2),
+             "duration": round(float(pauses[i]), 2)}
+            for i in np.flatnonzero(long_mask)[:MAX_SILENCE_EVENTS]
+        ]
+
+        # Syllable nuclei: local maxima of the smoothed envelope inside speech
+        bounds = np.zeros(db.size + 1, dtype=np.int32)
+        bounds[starts] += 1
+        bounds[ends] -= 1
+        mask = np.cumsum(bounds[:-1]) > 0
+        envelope = np.convolve(db, np.ones(5) / 5, mode="same")
+        inner = envelope[1:-1]
+        peaks = (inner > envelope[:-2]) & (inner >= envelope[2:]) & mask[1:-1] & (inner > threshold + 3.0)
+        syllables = int(np.count_nonzero(peaks))
+
+        if word_count:
+            wpm = word_count / span_seconds * 60 if span_seconds > 0 else 0.0
+            pace_source = "transcript"
+        else:
+            wpm = syllables / SYLLABLES_PER_WORD / span_seconds * 60 if span_seconds > 0 else 0.0
+            pace_source = "estimated"
+
+        pause_ratio = pause_seconds / span_seconds if span_seconds > 0 else 0.0
+        low, high = IDEAL_WPM
+        pace_score = 100 - 1.5 * max(0.0, low - wpm, wpm - high)
+        communication = _clamp(0.6 * pace_score + 0.4 * (100 - max(0.0, pause_ratio - 0.2) * 200))
+        confidence = _clamp(100 - 8 * int(long_mask.sum()) - max(0.0, pause_ratio - 0.25) * 150)
+
+        return {
+            "duration_seconds": round(duration, 2),
+            "speaking_seconds": round(speaking_seconds, 2),
+            "speech_span_seconds": round(span_seconds, 2),
+            "voiced_ratio": round(speaking_seconds / duration, 3) if duration else 0.0,
+            "segments": int(starts.size),
+            "pause_count": int(pauses.size),
+            "total_pause_seconds": round(pause_seconds, 2),
+            "avg_pause_seconds": round(float(pauses.mean()), 2) if pauses.size else 0.0,
+            "median_pause_seconds": round(float(np.median(pauses)), 2) if pauses.size else 0.0,
+            "p90_pause_seconds": round(float(np.percentile(pauses, 90)), 2) if pauses.size else 0.0,
+            "pause_ratio": round(pause_ratio, 3),
+            "long_silences": long_silences,
+            "long_silence_count": int(long_mask.sum()),
+            "syllable_rate": round(syllables / speaking_seconds, 2) if speaking_seconds else 0.0,
+            "words_per_minute": round(float(wpm), 1),
+            "pace_source": pace_source,
+            "mean_level_db": round(float(db[mask].mean()), 1),
+            "communication_score": communication,
+            "confidence_score": confidence,
+        }
+
+    @staticmethod
+    def _empty(duration: float) -> Dict:
+        return {
+            "duration_seconds": round(duration, 2),
+            "speaking_seconds": 0.0,
+            "speech_span_seconds": 0.0,
+            "voiced_ratio": 0.0,
+            "segments": 0,
+            "pause_count": 0,
+            "total_pause_seconds": 0.0,
+            "avg_pause_seconds": 0.0,
+            "median_pause_seconds": 0.0,
+            "p90_pause_seconds": 0.0,
+            "pause_ratio": 0.0,
+            "long_silences": [],
+            "long_silence_count": 0,
+            "syllable_rate": 0.0,
+            "words_per_minute": 0.0,
+            "pace_source": "none",
+            "mean_level_db": None,
+            "communication_score": 0,
+            "confidence_score": 0,
+        }
+
+
+def blend_audio_scores(scores: Dict, audio: Dict, weight: float = None) -> Dict:
+    """Mix audio-derived confidence/communication into a score block"""
+    if not audio or not audio.get("segments"):
+        return scores
+    weight = AUDIO_SCORE_WEIGHT if weight is None else weight
+    for dim, key in (("confidence", "confidence_score"), ("communication", "communication_score")):
+        scores[dim] = int(round((1 - weight) * float(scores.get(dim, 0)) + weight * audio[key]))
+    scores["final_score"] = compute_final_score(scores)
+    scores["audio"] = {k: audio[k] for k in ("words_per_minute", "pause_ratio", "long_silence_count",
+                                              "communication_score", "confidence_score")}
+    return scores
+
+
+# Global audio analyzer
+audio_analyzer = AudioAnalyzer()
@@ -0,0 +1,217 @@
+"""
+CPU Pool - Worker processes for CPU-bound work
+reportlab PDF builds, resume parsing and large speech-analysis batches are
+pure Python: on a thread they still hold the GIL against the event loop, so
+one large report slows every concurrent interview. Functions registered
+with @cpu_job run in a small pool of worker processes instead:
+
+  - typed submission: only registered module-level functions are accepted
+    (a worker must be able to import them), and submit/run/call keep the
+    job's return type
+  - bounded: at most CPU_POOL_MAX_PENDING jobs are queued or running; past
+    that, submit raises CpuPoolBusy rather than letting latency grow
+  - cancellation: a queued job is cancelled when its caller times out or
+    its request is cancelled; a running job finishes but its result is dropped
+
+Workers are spawned (not forked) so they never inherit the server's threads
+or locks, and they import the registered job modules when they start.
+A worker that dies breaks the pool; the next job starts a fresh one.
+Only the warm-up waits for the workers to come up; a job submitted to a cold
+(or just restarted) pool is queued while they start, and run() does that
+first submission off the event loop.
+Workers exit by themselves if the server process is killed.
+CPU_POOL_WORKERS=0 runs jobs inline on the calling thread.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional, TypeVar
+import asyncio
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+T = TypeVar("T")
+
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) - 1)))))
+CPU_POOL_MAX_PENDING = int(os.getenv("CPU_POOL_MAX_PENDING", "32"))
+CPU_JOB_TIMEOUT = float(os.getenv("CPU_JOB_TIMEOUT", "60"))
+
+_JOBS: Dict[str, Callable] = {}
+
+
+def _job_name(fn: Callable) -> str:
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+
+def cpu_job(fn: Callable[..., T]) -> Callable[..., T]:
+    """Register a module-level function as a job the pool may run"""
+    if "<locals>" in fn.__qualname__:
+        raise ValueError(f"{fn.__qualname__} must be defined at module level to run in a worker process")
+    _JOBS[_job_name(fn)] = fn
+    return fn
+
+
+def _exit_with_parent(parent_pid: int):
+    # Workers block on a queue the parent never closes if it is killed; do not outlive it
+    while os.getppid() == parent_pid:
+        time.sleep(1.0)
+    os._exit(0)
+
+
+def _init_worker(parent_pid: int, modules):
+    threading.Thread(target=_exit_with_parent, args=(parent_pid,), daemon=True).start()
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class CpuPoolBusy(RuntimeError):
+    """Raised when CPU_POOL_MAX_PENDING jobs are already queued or running"""
+
+
+class CpuPool:
+    """Bounded process pool for registered CPU-bound jobs"""
+
+    def __init__(self, workers: int = CPU_POOL_WORKERS, max_pending: int = CPU_POOL_MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0,
+                       "rejected": 0, "restarts": 0, "job_seconds": 0.0}
+
+    def start(self) -> Optional[ProcessPoolExecutor]:
+        """Spawn the workers now and wait until they answer (the startup warm-up does)"""
+        executor, created = self._ensure_executor()
+        if created:
+            # Processes are created on demand; one concurrent ping per worker starts them all
+            for future in [executor.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+        return executor
+
+    def _ensure_executor(self):
+        """(executor, whether this call created it); never waits for the workers"""
+        with self._lock:
+            if self._executor is not None or self.workers <= 0:
+                return self._executor, False
+            modules = sorted({fn.__module__ for fn in _JOBS.values()})
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(os.getpid(), modules),
+            )
+            return self._executor, True
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, job: Callable[..., T], *args) -> "Future[T]":
+        """Queue a registered job; raises CpuPoolBusy when the pool is full"""
+        name = _job_name(job)
+        if _JOBS.get(name) is not job:
+            raise ValueError(f"{name} is not registered with @cpu_job")
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise CpuPoolBusy(f"CPU pool is full ({self.max_pending} jobs pending)")
+            self._pending += 1
+            self._stats["submitted"] += 1
+        submitted = time.perf_counter()
+        try:
+            executor, _ = self._ensure_executor()
+            if executor is None:
+                future = Future()
+                try:
+                    future.set_result(job(*args))
+                except Exception as e:
+                    future.set_exception(e)
+            else:
+                future = executor.submit(job, *args)
+        except BrokenProcessPool:
+            self._restart()
+            self._finish("failed", submitted)
+            raise
+        except Exception:
+            self._finish("failed", submitted)
+            raise
+        future.add_done_callback(lambda f: self._on_done(f, submitted))
+        return future
+
+    def call(self, job: Callable[..., T], *args, timeout: float = CPU_JOB_TIMEOUT) -> T:
+        """Run a job and wait for its result (from a worker thread, never the event loop)"""
+        future = self.submit(job, *args)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    async def run(self, job: Callable[..., T], *args, timeout: float = CPU_JOB_TIMEOUT) -> T:
+        """Await a job from a request handler; cancelling the handler cancels a queued job"""
+        if self._executor is None:
+            # The first job of a cold or restarted pool spawns its processes (and inline
+            # jobs run right away): keep both off the event loop
+            future = await run_in_threadpool(self.submit, job, *args)
+        else:
+            future = self.submit(job, *args)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            future.cancel()
+            raise
+
+    def _on_done(self, future: Future, submitted: float):
+        if future.cancelled():
+            self._finish("cancelled", submitted)
+        elif future.exception() is not None:
+            if isinstance(future.exception(), BrokenProcessPool):
+                self._restart()
+            self._finish("failed", submitted)
+        else:
+            self._finish("completed", submitted)
+
+    def _finish(self, outcome: str, submitted: float):
+        with self._lock:
+            self._pending -= 1
+            self._stats[outcome] += 1
+            self._stats["job_seconds"] += time.perf_counter() - submitted
+
+    def _restart(self):
+        """Drop a broken executor so the next job spawns a fresh one"""
+        with self._lock:
+            executor = self._executor
+            if executor is None or not getattr(executor, "_broken", True):
+                return
+            self._executor = None
+            self._stats["restarts"] += 1
+        print("⚠️  CPU pool worker died; restarting the pool")
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            done = self._stats["completed"] + self._stats["failed"] + self._stats["cancelled"]
+            return {
+                "workers": self.workers,
+                "started": self._executor is not None,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                **self._stats,
+                "job_seconds": round(self._stats["job_seconds"], 3),
+                "avg_job_ms": round(self._stats["job_seconds"] / done * 1000, 2) if done else 0.0,
+            }
+
+
+# Global CPU pool
+cpu_pool = CpuPool()
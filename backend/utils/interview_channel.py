@@ -0,0 +1,317 @@
+"""
+Interview Channel - One persistent WebSocket per interview
+Multiplexes answer submission, streamed question tokens, score / feedback
+events, live speech stats and the end-of-interview report over a single
+connection instead of one HTTP round trip per turn.
+
+Outbound events go through a bounded queue drained by one sender task. When
+the client falls behind, droppable events (question tokens, live speech
+stats, heartbeats) are discarded; any other event waits for room and the
+connection is closed if the client stays stuck. Inbound answers are handled
+one at a time per connection. A heartbeat keeps proxies from closing the
+socket and drops clients that stop responding.
+
+Protocol (JSON messages with a "type"):
+    client -> server: answer {answer, seq}, speech_chunk {text, start, end}, end, ping, pong
+    server -> client: ready, question_token, question, score, speech, speech_summary,
+                      end, error, heartbeat, pong
+
+Answers and ends go through the admission controller; a shed one gets an
+error event with code 429 and retry_after instead of being processed.
+"""
+from typing import Dict, Optional, Set
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+
+from starlette.concurrency import run_in_threadpool
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from memory.session_memory import AnswerSequenceError
+from utils.admission import admission, AdmissionRejected
+from utils.token_usage import set_llm_endpoint
+from utils.speech_stream import parse_chunk, speech_stream_manager
+
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "64"))
+WS_HEARTBEAT_SECONDS = float(os.getenv("WS_HEARTBEAT_SECONDS", "20"))
+WS_IDLE_TIMEOUT = float(os.getenv("WS_IDLE_TIMEOUT", "60"))
+WS_SLOW_CONSUMER_SECONDS = float(os.getenv("WS_SLOW_CONSUMER_SECONDS", "10"))
+QUESTION_TOKEN_WORDS = 3
+
+# Events a lagging client can lose without harm; a later event supersedes them
+DROPPABLE_EVENTS = {"question_token", "speech", "heartbeat"}
+
+CLOSE_NORMAL = 1000
+CLOSE_GOING_AWAY = 1001
+CLOSE_TRY_AGAIN_LATER = 1013
+CLOSE_SESSION_NOT_FOUND = 4404
+
+_WORD_RE = re.compile(r"\S+\s*")
+
+
+def question_tokens(question: str, words_per_token: int = QUESTION_TOKEN_WORDS):
+    """Split a question into small text pieces for progressive rendering"""
+    words = _WORD_RE.findall(question or "")
+    for i in range(0, len(words), words_per_token):
+        yield "".join(words[i:i + words_per_token])
+
+
+class InterviewChannel:
+    """Serves one interview over one WebSocket"""
+
+    def __init__(self, websocket: WebSocket, session_id: str, user_key: str,
+                 queue_size: int = WS_SEND_QUEUE_SIZE):
+        self.websocket = websocket
+        self.session_id = session_id
+        # Whom this channel's crew calls count against for admission control: the
+        # handshake's admission_key, so HTTP and WebSocket calls share one budget
+        self.user_key = user_key
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.last_seen = time.monotonic()
+        self.closed = False
+        self.dropped = 0
+        self.sent = 0
+        self._answer_task: Optional[asyncio.Task] = None
+        self._stream_id: Optional[str] = None
+
+    # ==================== Outbound ====================
+
+    async def send(self, event: Dict):
+        """Queue an event for the client, applying backpressure"""
+        if self.closed:
+            return
+        if event.get("type") in DROPPABLE_EVENTS:
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                channel_registry.dropped += 1
+            return
+        try:
+            await asyncio.wait_for(self.queue.put(event), WS_SLOW_CONSUMER_SECONDS)
+        except asyncio.TimeoutError:
+            print(f"⚠️  WebSocket client for {self.session_id} is not reading - closing")
+            await self.close(CLOSE_TRY_AGAIN_LATER, "Client too slow")
+
+    def publish(self, event: Dict):
+        """Thread-safe send, for results produced outside the event loop"""
+        if self.closed or self.loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.send(event), self.loop)
+        except RuntimeError:
+            pass  # loop already shut down
+
+    async def _sender(self):
+        while True:
+            event = await self.queue.get()
+            try:
+                await self.websocket.send_text(json.dumps(event))
+            except Exception:
+                self.closed = True  # the receive loop notices the disconnect
+                return
+            self.sent += 1
+
+    async def _heartbeat(self):
+        while not self.closed:
+            await asyncio.sleep(WS_HEARTBEAT_SECONDS)
+            if time.monotonic() - self.last_seen > WS_IDLE_TIMEOUT:
+                await self.close(CLOSE_GOING_AWAY, "Heartbeat timeout")
+                return
+            await self.send({"type": "heartbeat", "ts": time.time()})
+
+    async def close(self, code: int = CLOSE_NORMAL, reason: str = ""):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+    # ==================== Inbound ====================
+
+    async def run(self, crew):
+        """Serve the connection until the client leaves or the interview ends
+
+        `crew` provides answer_turn(session_id, answer, seq) and end_interview(session_id).
+        """
+        self.loop = asyncio.get_running_loop()
+        await self.websocket.accept()
+        channel_registry.add(self)
+        sender = asyncio.create_task(self._sender())
+        heartbeat = asyncio.create_task(self._heartbeat())
+        await self.send({"type": "ready", "session_id": self.session_id,
+                         "heartbeat_seconds": WS_HEARTBEAT_SECONDS})
+        try:
+            while not self.closed:
+                raw = await self.websocket.receive_text()
+                self.last_seen = time.monotonic()
+                try:
+                    message = json.loads(raw)
+                except ValueError:
+                    await self.send({"type": "error", "error": "Invalid JSON"})
+                    continue
+                if not isinstance(message, dict):
+                    await self.send({"type": "error", "error": "Messages must be JSON objects"})
+                    continue
+                await self._dispatch(message, crew)
+        except (WebSocketDisconnect, RuntimeError):
+            pass  # client went away, or the socket was closed by us
+        finally:
+            self.closed = True
+            channel_registry.remove(self)
+            heartbeat.cancel()
+            sender.cancel()
+            if self._stream_id:
+                speech_stream_manager.end(self._stream_id)
+
+    async def _dispatch(self, message: Dict, crew):
+        kind = message.get("type")
+        if kind == "ping":
+            await self.send({"type": "pong", "ts": time.time()})
+        elif kind == "pong":
+            return
+        elif kind == "answer":
+            if self._answer_task and not self._answer_task.done():
+                await self.send({"type": "error", "error": "An answer is already being processed",
+                                 "seq": message.get("seq")})
+                return
+            self._answer_task = asyncio.create_task(self._handle_answer(message, crew))
+        elif kind == "speech_chunk":
+            await self._handle_speech_chunk(message)
+        elif kind == "end":
+            if self._answer_task and not self._answer_task.done():
+                await self._answer_task
+            await self._handle_end(crew)
+        else:
+            await self.send({"type": "error", "error": f"Unknown message type: {kind}"})
+
+    async def _handle_answer(self, message: Dict, crew):
+        answer = message.get("answer") or ""
+        seq = message.get("seq")
+        if not isinstance(seq, int):
+            await self.send({"type": "error", "error": "answer needs an integer seq"})
+            return
+        speech = self._end_speech_stream()
+        if speech:
+            await self.send({"type": "speech_summary", "seq": seq, **speech})
+        try:
+            set_llm_endpoint("ws:answer")
+            async with admission.admit(self.user_key):
+                result = await run_in_threadpool(crew.answer_turn, self.session_id, answer, seq)
+        except AdmissionRejected as e:
+            # The answer was not processed; the client resends it after retry_after seconds
+            await self.send({"type": "error", "error": str(e), "seq": seq, "code": 429,
+                             "retry_after": e.retry_after})
+            return
+        except AnswerSequenceError as e:
+            await self.send({"type": "error", "error": str(e), "seq": seq, "expected_seq": e.expected})
+            return
+        except Exception as e:
+            print(f"❌ WebSocket answer error: {e}")
+            await self.send({"type": "error", "error": str(e), "seq": seq})
+            return
+        if not result.get("success"):
+            await self.send({"type": "error", "error": result.get("error", "Answer failed"), "seq": seq})
+            return
+
+        question = result.get("question") or ""
+        for token in question_tokens(question):
+            await self.send({"type": "question_token", "seq": seq, "text": token})
+        await self.send({
+            "type": "question",
+            "seq": seq,
+            "question": question,
+            "is_followup": result.get("is_followup", False),
+            "confidence": result.get("confidence", 0),
+        })
+        if "score" in result:
+            await self.send({"type": "score", "seq": seq, "score": result.get("score"),
+                             "feedback": result.get("feedback", "")})
+
+    async def _handle_speech_chunk(self, message: Dict):
+        try:
+            chunk = dict(zip(("text", "start", "end"), parse_chunk(message)))
+        except ValueError as e:
+            await self.send({"type": "error", "error": str(e)})
+            return
+        if self._stream_id is None:
+            self._stream_id = speech_stream_manager.start(self.session_id).stream_id
+        stream = speech_stream_manager.add_chunks(self._stream_id, [chunk])
+        if stream is not None:
+            await self.send({"type": "speech", **stream.stats()})
+
+    def _end_speech_stream(self) -> Optional[Dict]:
+        if self._stream_id is None:
+            return None
+        stats = speech_stream_manager.end(self._stream_id)
+        self._stream_id = None
+        return stats
+
+    async def _handle_end(self, crew):
+        try:
+            set_llm_endpoint("ws:end")
+            async with admission.admit(self.user_key):
+                result = await run_in_threadpool(crew.end_interview, self.session_id)
+        except AdmissionRejected as e:
+            await self.send({"type": "error", "error": str(e), "code": 429, "retry_after": e.retry_after})
+            return
+        except Exception as e:
+            print(f"❌ WebSocket end error: {e}")
+            await self.send({"type": "error", "error": str(e)})
+            return
+        await self.send({"type": "end", **result})
+        # Let the sender flush the report before closing
+        deadline = time.monotonic() + WS_SLOW_CONSUMER_SECONDS
+        while not self.queue.empty() and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        await self.close(CLOSE_NORMAL, "Interview ended")
+
+
+class ChannelRegistry:
+    """Open channels by session id, so background work can push events"""
+
+    def __init__(self):
+        self.channels: Dict[str, Set[InterviewChannel]] = {}
+        self.opened = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def add(self, channel: InterviewChannel):
+        with self._lock:
+            self.channels.setdefault(channel.session_id, set()).add(channel)
+            self.opened += 1
+
+    def remove(self, channel: InterviewChannel):
+        with self._lock:
+            channels = self.channels.get(channel.session_id)
+            if channels is not None:
+                channels.discard(channel)
+                if not channels:
+                    del self.channels[channel.session_id]
+
+    def publish(self, session_id: str, event: Dict) -> int:
+        """Push an event to every channel of a session from any thread; returns channels reached"""
+        with self._lock:
+            channels = list(self.channels.get(session_id, ()))
+        for channel in channels:
+            channel.publish(event)
+        return len(channels)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "open_connections": sum(len(c) for c in self.channels.values()),
+                "sessions": len(self.channels),
+                "opened_total": self.opened,
+                "dropped_events": self.dropped,
+            }
+
+
+# Global channel registry
+channel_registry = ChannelRegistry()
@@ -0,0 +1,182 @@
+"""
+LLM Scheduler - Priority scheduling of the agents' LLM calls
+Every crew kickoff goes through one scheduler with LLM_CONCURRENCY slots
+(one per Groq key by default). When the slots are busy, waiting calls are
+served by priority class rather than arrival order:
+
+  next_question  the question (or follow-up decision) a candidate is waiting on
+  scoring        scoring an answer, inline or deferred
+  report         chunk summaries and the final report
+  prefetch       speculative work nobody is waiting on yet
+
+Aging keeps lower classes from starving: every LLM_AGING_SECONDS a call has
+waited promotes it by one class, so a report queued behind a steady stream
+of interview turns still gets a slot. Among equal effective priorities the
+oldest call goes first. A call may bound how long it waits for a slot:
+past that it leaves the queue and raises TimeoutError instead of starting
+late.
+
+Identical prompts in flight at the same time share one call (singleflight).
+Kickoffs run on worker threads (the request threadpool, the scoring and
+report-map pools), so slots are handed out under a threading lock.
+"""
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, TypeVar
+import itertools
+import os
+import threading
+import time
+
+from memory.token_ledger import token_ledger
+from utils.singleflight import llm_singleflight, prompt_key, LLM_COALESCE
+
+T = TypeVar("T")
+
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+LLM_AGING_SECONDS = float(os.getenv("LLM_AGING_SECONDS", "10"))
+
+# Highest priority first
+LLM_CLASSES = ("next_question", "scoring", "report", "prefetch")
+NEXT_QUESTION, SCORING, REPORT, PREFETCH = LLM_CLASSES
+
+# Recent queueing delays kept per class for the percentiles in stats()
+WAIT_SAMPLE_SIZE = 256
+
+
+class _Waiter:
+    __slots__ = ("rank", "enqueued", "order", "event")
+
+    def __init__(self, rank: int, order: int):
+        self.rank = rank
+        self.enqueued = time.monotonic()
+        self.order = order
+        self.event = threading.Event()
+
+
+class LlmScheduler:
+    """Bounded LLM concurrency with priority classes and aging"""
+
+    def __init__(self, concurrency: int = LLM_CONCURRENCY, aging_seconds: float = LLM_AGING_SECONDS):
+        self.concurrency = concurrency
+        self.aging_seconds = aging_seconds
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiting: List[_Waiter] = []
+        self._order = itertools.count()
+        self._waits: Dict[str, Deque[float]] = {name: deque(maxlen=WAIT_SAMPLE_SIZE) for name in LLM_CLASSES}
+        self._stats = {name: {"calls": 0, "queued": 0, "aged": 0, "timed_out": 0, "wait_seconds": 0.0,
+                              "max_wait_seconds": 0.0}
+                       for name in LLM_CLASSES}
+
+    # ==================== Public API ====================
+
+    def run(self, llm_class: str, call: Callable[[], T], timeout: Optional[float] = None) -> T:
+        """Run `call` once a slot is free for its class, waiting at most `timeout` seconds for it"""
+        self.acquire(llm_class, timeout)
+        try:
+            return call()
+        finally:
+            self.release()
+
+    def kickoff(self, crew, llm_class: str, coalesce: bool = True, session_id: Optional[str] = None,
+                timeout: Optional[float] = None):
+        """Kick off a CrewAI crew under the given priority class
+
+        Identical prompts already in flight are coalesced into one call
+        (utils/singleflight.py) unless `coalesce` is False. The call's tokens
+        are recorded in the token ledger against `session_id`; a coalesced
+        caller spends none. With a `timeout`, a call still queued after that
+        many seconds is never made and TimeoutError is raised.
+        """
+        def call():
+            result = self.run(llm_class, crew.kickoff, timeout)
+            token_ledger.record(crew, result, session_id)
+            return result
+
+        if coalesce and LLM_COALESCE:
+            return llm_singleflight.do(prompt_key(crew), call)
+        return call()
+
+    def acquire(self, llm_class: str, timeout: Optional[float] = None):
+        rank = LLM_CLASSES.index(llm_class)
+        with self._lock:
+            self._stats[llm_class]["calls"] += 1
+            if self._active < self.concurrency and not self._waiting:
+                self._active += 1
+                self._record_wait(llm_class, 0.0)
+                return
+            waiter = _Waiter(rank, next(self._order))
+            self._waiting.append(waiter)
+            self._stats[llm_class]["queued"] += 1
+            self._dispatch()
+        if waiter.event.wait(timeout):
+            return
+        with self._lock:
+            if waiter.event.is_set():
+                return  # handed a slot just as the wait ran out
+            self._waiting.remove(waiter)
+            self._stats[llm_class]["timed_out"] += 1
+        raise TimeoutError(f"No LLM slot for a {llm_class} call within {timeout:.1f}s")
+
+    def release(self):
+        with self._lock:
+            self._active -= 1
+            self._dispatch()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            classes = {}
+            for name in LLM_CLASSES:
+                counters = self._stats[name]
+                waits = sorted(self._waits[name])
+                pick = lambda q: waits[min(len(waits) - 1, int(q * len(waits)))] * 1000 if waits else 0.0
+                classes[name] = {
+                    "calls": counters["calls"],
+                    "queued": counters["queued"],
+                    "waiting": sum(1 for w in self._waiting if LLM_CLASSES[w.rank] == name),
+                    "aged": counters["aged"],
+                    "timed_out": counters["timed_out"],
+                    "avg_wait_ms": round(counters["wait_seconds"] / counters["calls"] * 1000, 1)
+                    if counters["calls"] else 0.0,
+                    "p50_wait_ms": round(pick(0.5), 1),
+                    "p95_wait_ms": round(pick(0.95), 1),
+                    "max_wait_ms": round(counters["max_wait_seconds"] * 1000, 1),
+                }
+            return {
+                "concurrency": self.concurrency,
+                "aging_seconds": self.aging_seconds,
+                "active": self._active,
+                "waiting": len(self._waiting),
+                "classes": classes,
+            }
+
+    # ==================== Internals ====================
+
+    def _effective_rank(self, waiter: _Waiter, now: float) -> float:
+        if self.aging_seconds <= 0:
+            return waiter.rank
+        return waiter.rank - (now - waiter.enqueued) / self.aging_seconds
+
+    def _dispatch(self):
+        """Hand free slots to the best waiters (caller holds the lock)"""
+        while self._waiting and self._active < self.concurrency:
+            now = time.monotonic()
+            waiter = min(self._waiting, key=lambda w: (self._effective_rank(w, now), w.order))
+            self._waiting.remove(waiter)
+            self._active += 1
+            name = LLM_CLASSES[waiter.rank]
+            # Served ahead of a waiting call of a higher class only because it aged
+            if any(w.rank < waiter.rank for w in self._waiting):
+                self._stats[name]["aged"] += 1
+            self._record_wait(name, now - waiter.enqueued)
+            waiter.event.set()
+
+    def _record_wait(self, name: str, seconds: float):
+        counters = self._stats[name]
+        counters["wait_seconds"] += seconds
+        counters["max_wait_seconds"] = max(counters["max_wait_seconds"], seconds)
+        self._waits[name].append(seconds)
+
+
+# Global LLM scheduler shared by every agent
+llm_scheduler = LlmScheduler()
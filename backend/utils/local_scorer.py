@@ -0,0 +1,179 @@
+"""
+Local Scorer - Deterministic, LLM-free scoring of interview answers
+Computes cheap text features and maps them onto the ScoringAgent's four
+dimensions. Used as a fallback when the LLM fails, as an opt-in gate that
+skips the LLM for empty answers and explicit non-answers, and for the weighted
+final score arithmetic.
+"""
+from typing import Dict, Iterable, List, Optional, Set
+import re
+
+from utils.speech_analysis import speech_analyzer, tokenize as speech_tokenize
+from utils.skill_taxonomy import skill_extractor
+
+# Weights for the final score (must match the ScoringAgent rubric)
+SCORE_WEIGHTS = {
+    "domain_knowledge": 0.3,
+    "communication": 0.25,
+    "confidence": 0.2,
+    "depth": 0.25,
+}
+
+SCORE_DIMENSIONS = tuple(SCORE_WEIGHTS.keys())
+
+STRUCTURE_MARKERS = ("first", "second", "then", "next", "finally", "because", "therefore", "so that",
+                     "for example", "for instance", "as a result", "in summary", "the situation",
+                     "my task", "i decided", "the result", "we measured", "which led to")
+# "yes" / "no" are real answers to closed questions, so they still go to the ScoringAgent
+NON_ANSWERS = {"", "idk", "i don't know", "i dont know", "no idea", "pass", "skip", "next",
+               "not sure", "nothing", "none", "n/a"}
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "if", "of", "to", "in", "on", "at", "for", "with", "by", "from",
+    "is", "are", "was", "were", "be", "been", "being", "do", "does", "did", "have", "has", "had", "i", "you",
+    "he", "she", "it", "we", "they", "me", "my", "your", "our", "their", "this", "that", "these", "those",
+    "what", "which", "who", "how", "why", "when", "where", "can", "could", "would", "should", "will", "about",
+    "tell", "describe", "explain", "us", "some", "any", "as", "into", "than", "then", "there", "so", "not",
+    "also", "just", "very", "more", "most", "all", "one", "its", "it's", "i'm", "them", "up", "out",
+}
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-']*")
+_SENTENCE_RE = re.compile(r"[.!?]+")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?%?")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with trailing punctuation stripped"""
+    return [w.rstrip(".-'") for w in _WORD_RE.findall((text or "").lower())]
+
+
+def content_words(tokens: Iterable[str]) -> Set[str]:
+    return {t for t in tokens if len(t) > 2 and t not in STOPWORDS}
+
+
+def compute_final_score(scores: Dict) -> int:
+    """Weighted average of the four dimensions, rounded to an int"""
+    total = sum(float(scores.get(dim, 0) or 0) * weight for dim, weight in SCORE_WEIGHTS.items())
+    return int(round(max(0.0, min(100.0, total))))
+
+
+def _clamp(value: float) -> int:
+    return int(round(max(0.0, min(100.0, value))))
+
+
+def _phrase_pattern(phrases: Iterable[str]):
+    return re.compile(r"\b(?:" + "|".join(re.escape(p) for p in phrases) + r")\b")
+
+
+_STRUCTURE_RE = _phrase_pattern(STRUCTURE_MARKERS)
+
+
+class LocalScorer:
+    """Feature-based scorer producing the same JSON shape as the ScoringAgent"""
+
+    def extract_features(self, question: str, answer: str, resume_text: str = "") -> Dict:
+        """Cheap text features for one answer"""
+        answer_lower = (answer or "").lower()
+        tokens = tokenize(answer_lower)
+        word_count = len(tokens)
+        sentences = [s for s in _SENTENCE_RE.split(answer or "") if s.strip()]
+        sentence_count = max(1, len(sentences))
+
+        speech = speech_analyzer.count_tokens(speech_tokenize(answer_lower))
+        filler_count = speech["filler_count"]
+        hedge_count = speech["hedge_count"]
+        structure_count = len(_STRUCTURE_RE.findall(answer_lower))
+
+        answer_terms = content_words(tokens)
+        question_terms = content_words(tokenize(question))
+        keyword_overlap = len(answer_terms & question_terms) / len(question_terms) if question_terms else 0.0
+
+        resume_terms = content_words(tokenize(resume_text)) if resume_text else set()
+        resume_coverage = len(answer_terms & resume_terms) / len(answer_terms) if resume_terms and answer_terms else 0.0
+
+        # Technologies named in the answer, normalized through the skill taxonomy
+        answer_skills = skill_extractor.skills_in(answer)
+        resume_skills = skill_extractor.skill_names(skill_extractor.profile(resume_text)) if resume_text else set()
+
+        return {
+            "word_count": word_count,
+            "sentence_count": sentence_count,
+            "avg_sentence_length": word_count / sentence_count,
+            "unique_ratio": len(set(tokens)) / word_count if word_count else 0.0,
+            "filler_count": filler_count,
+            "filler_ratio": filler_count / word_count if word_count else 0.0,
+            "hedge_count": hedge_count,
+            "structure_markers": structure_count,
+            "numbers": len(_NUMBER_RE.findall(answer_lower)),
+            "keyword_overlap": keyword_overlap,
+            "resume_coverage": resume_coverage,
+            "content_terms": len(answer_terms),
+            "skill_mentions": len(answer_skills),
+            "resume_skill_mentions": len(answer_skills & resume_skills),
+        }
+
+    def is_trivial(self, answer: str) -> bool:
+        """Empty answers and exact non-answers ("idk", "pass", ...) that need no LLM to judge
+
+        Anything else, however short, may still be a correct answer ("O(n log n)",
+        "Use a mutex") and goes to the LLM.
+        """
+        raw = (answer or "").strip().lower().rstrip(".!")
+        return raw in NON_ANSWERS or " ".join(tokenize(answer)) in NON_ANSWERS
+
+    def score(self, question: str, answer: str, resume_text: str = "",
+              features: Optional[Dict] = None) -> Dict:
+        """Score an answer on the four dimensions plus final_score and feedback"""
+        f = features or self.extract_features(question, answer, resume_text)
+        words = f["word_count"]
+
+        if self.is_trivial(answer):
+            scores = {dim: 10 if words else 0 for dim in SCORE_DIMENSIONS}
+            scores["final_score"] = compute_final_score(scores)
+            scores["feedback"] = ("The answer was too short to evaluate. Try to address the question directly "
+                                  "and support it with a concrete example from your experience.")
+            return scores
+
+        # Saturating length signal: ~150 words is a complete spoken answer
+        length = min(1.0, words / 150.0)
+        sentence_len = f["avg_sentence_length"]
+        sentence_quality = 1.0 if 8 <= sentence_len <= 25 else 0.6 if sentence_len < 40 else 0.3
+        structure = min(1.0, f["structure_markers"] / 3.0)
+        filler_penalty = min(1.0, f["filler_ratio"] * 10)
+        hedge_penalty = min(1.0, f["hedge_count"] / 3.0)
+        vocabulary = min(1.0, f["content_terms"] / 25.0)
+
+        scores = {
+            "domain_knowledge": _clamp(30 + 25 * min(1.0, f["keyword_overlap"] * 2)
+                                       + 15 * vocabulary + 15 * min(1.0, f["resume_coverage"] * 3)
+                                       + 15 * min(1.0, (f["skill_mentions"] + f["resume_skill_mentions"]) / 3.0)),
+            "communication": _clamp(35 + 25 * sentence_quality + 25 * structure
+                                    + 15 * f["unique_ratio"] - 30 * filler_penalty),
+            "confidence": _clamp(85 - 35 * hedge_penalty - 25 * filler_penalty + 15 * length),
+            "depth": _clamp(20 + 45 * length + 15 * structure + 10 * min(1.0, f["numbers"] / 2.0)
+                            + 10 * vocabulary),
+        }
+        scores["final_score"] = compute_final_score(scores)
+        scores["feedback"] = self._feedback(f, scores)
+        return scores
+
+    def _feedback(self, f: Dict, scores: Dict) -> str:
+        """Short, rule-based feedback naming the weakest signals"""
+        notes = []
+        if f["keyword_overlap"] < 0.2:
+            notes.append("address the specific question more directly")
+        if f["word_count"] < 60:
+            notes.append("add depth with a concrete example and its outcome")
+        if f["structure_markers"] == 0:
+            notes.append("structure the answer (situation, action, result)")
+        if f["filler_ratio"] > 0.05:
+            notes.append("reduce filler words")
+        if f["hedge_count"] >= 2:
+            notes.append("state your points with more conviction")
+        if not notes:
+            return "Clear, relevant and well-supported answer. Keep quantifying your impact."
+        return "To improve: " + "; ".join(notes) + "."
+
+
+# Global local scorer
+local_scorer = LocalScorer()
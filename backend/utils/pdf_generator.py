@@ -9,10 +9,24 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from datetime import datetime
+import io
 import os
-from typing import Dict, List, Any
+import time
+from typing import Dict, List, Any, Tuple
 import json
 
+from utils.cpu_pool import cpu_job
+from utils.score_aggregates import summary_aggregates, TREND_THRESHOLD
+
+def ordinal(n: int) -> str:
+    """1 -> '1st', 2 -> '2nd', 11 -> '11th', 22 -> '22nd'"""
+    if 10 <= n % 100 <= 20:
+        suffix = 'th'
+    else:
+        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+    return f"{n}{suffix}"
+
+
 class PDFReportGenerator:
     """Generates professional PDF reports for interview sessions"""
     
@@ -42,13 +56,11 @@ class PDFReportGenerator:
             fontName='Helvetica-Bold'
         ))
         
-        self.styles.add(ParagraphStyle(
-            name='BodyText',
-            parent=self.styles['BodyText'],
-            fontSize=11,
-            alignment=TA_JUSTIFY,
-            spaceAfter=10
-        ))
+        # The sample stylesheet already defines BodyText; adjust it in place
+        body_text = self.styles['BodyText']
+        body_text.fontSize = 11
+        body_text.alignment = TA_JUSTIFY
+        body_text.spaceAfter = 10
         
         self.styles.add(ParagraphStyle(
             name='ScoreLabel',
@@ -58,29 +70,18 @@ class PDFReportGenerator:
             fontName='Helvetica-Bold'
         ))
     
-    def generate_report(self, session_data: Dict[str, Any], output_path: str = None) -> str:
+    def render_report(self, session_data: Dict[str, Any]) -> bytes:
         """
-        Generate a comprehensive PDF report
+        Render a comprehensive PDF report into memory
         
         Args:
             session_data: Dictionary containing interview session data
-            output_path: Optional custom output path
         
         Returns:
-            Path to generated PDF file
+            The PDF document as bytes
         """
-        if output_path is None:
-            output_dir = os.path.join(os.path.dirname(__file__), '..', 'reports')
-            os.makedirs(output_dir, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = os.path.join(output_dir, f"interview_report_{timestamp}.pdf")
-        
-        print(f"\n📝 Generating PDF Report...")
-        print(f"   Output path: {output_path}")
-        print(f"   Directory exists: {os.path.exists(os.path.dirname(output_path))}")
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(output_path, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
         story = []
         
         # Add title
@@ -105,21 +106,37 @@ class PDFReportGenerator:
         # Build PDF
         try:
             doc.build(story)
-            
-            # Verify file was created
-            if os.path.exists(output_path):
-                file_size = os.path.getsize(output_path)
-                print(f"✅ PDF Report generated successfully!")
-                print(f"   File: {output_path}")
-                print(f"   Size: {file_size} bytes")
-                return output_path
-            else:
-                print(f"❌ PDF file was not created at {output_path}")
-                raise Exception(f"PDF file not created at {output_path}")
-        
         except Exception as e:
             print(f"❌ Error building PDF: {e}")
             raise
+        
+        pdf_bytes = buffer.getvalue()
+        print(f"✅ PDF Report rendered in memory ({len(pdf_bytes)} bytes)")
+        return pdf_bytes
+    
+    def generate_report(self, session_data: Dict[str, Any], output_path: str = None) -> str:
+        """
+        Render a PDF report and write it to disk
+        
+        Args:
+            session_data: Dictionary containing interview session data
+            output_path: Optional custom output path
+        
+        Returns:
+            Path to generated PDF file
+        """
+        if output_path is None:
+            output_dir = os.path.join(os.path.dirname(__file__), '..', 'reports')
+            os.makedirs(output_dir, exist_ok=True)
+            session_id = session_data.get('session_id') or datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = os.path.join(output_dir, f"interview_report_{session_id}.pdf")
+        
+        pdf_bytes = self.render_report(session_data)
+        with open(output_path, 'wb') as f:
+            f.write(pdf_bytes)
+        
+        print(f"   File: {output_path}")
+        return output_path
     
     def _create_session_info(self, session_data: Dict) -> List:
         """Create session information section"""
@@ -195,6 +212,54 @@ class PDFReportGenerator:
             ('GRID', (0, 0), (-1, -1), 1, colors.grey),
         ]))
         
+        elements.append(table)
+        elements.extend(self._create_percentile_table(session_data))
+        return elements
+    
+    def _create_percentile_table(self, session_data: Dict) -> List:
+        """Per-dimension percentile against prior interviews for the same role and difficulty"""
+        elements = []
+        ranking = session_data.get('percentiles') or {}
+        dimensions = ranking.get('dimensions') or {}
+        if not any(d.get('percentile') is not None for d in dimensions.values()):
+            return elements
+        
+        elements.append(Spacer(1, 0.15*inch))
+        elements.append(Paragraph(
+            f"Compared with {ranking.get('cohort_size', 0)} previous interviews for "
+            f"{ranking.get('role', 'N/A')} ({ranking.get('difficulty', 'N/A')})",
+            self.styles['BodyText']
+        ))
+        
+        labels = {
+            'domain_knowledge': 'Domain Knowledge',
+            'communication': 'Communication',
+            'confidence': 'Confidence',
+            'depth': 'Depth',
+            'final_score': 'Final Score',
+        }
+        rows = [["Dimension", "Your Average", "Percentile"]]
+        for dim, label in labels.items():
+            entry = dimensions.get(dim)
+            if not entry:
+                continue
+            percentile = entry.get('percentile')
+            rows.append([
+                label,
+                f"{entry.get('score', 0):.1f}",
+                ordinal(int(round(percentile))) if percentile is not None else "N/A",
+            ])
+        
+        table = Table(rows, colWidths=[2.4*inch, 1.8*inch, 1.8*inch])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e8eaf6')),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ]))
         elements.append(table)
         return elements
     
@@ -275,30 +340,19 @@ class PDFReportGenerator:
     
     def _analyze_performance(self, session_data: Dict) -> Dict[str, List[str]]:
         """Analyze performance and generate insights"""
-        interactions = session_data.get('interaction_blocks', [])
+        aggregates = summary_aggregates(session_data)
+        dimensions = aggregates.get('dimensions', {})
         
         strengths = []
         weaknesses = []
         recommendations = []
         
-        # Calculate average scores by category
-        domain_scores = []
-        communication_scores = []
-        confidence_scores = []
-        depth_scores = []
-        
-        for interaction in interactions:
-            scores = interaction.get('scores', {})
-            domain_scores.append(scores.get('domain_knowledge', 0))
-            communication_scores.append(scores.get('communication', 0))
-            confidence_scores.append(scores.get('confidence', 0))
-            depth_scores.append(scores.get('depth', 0))
-        
-        # Calculate averages
-        avg_domain = sum(domain_scores) / len(domain_scores) if domain_scores else 0
-        avg_communication = sum(communication_scores) / len(communication_scores) if communication_scores else 0
-        avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
-        avg_depth = sum(depth_scores) / len(depth_scores) if depth_scores else 0
+        # Averages by category come precomputed from the session's running aggregates
+        mean = lambda dim: dimensions.get(dim, {}).get('mean', 0)
+        avg_domain = mean('domain_knowledge')
+        avg_communication = mean('communication')
+        avg_confidence = mean('confidence')
+        avg_depth = mean('depth')
         
         # Identify strengths (scores > 75)
         if avg_domain > 75:
@@ -324,6 +378,16 @@ class PDFReportGenerator:
             weaknesses.append(f"Answers lack sufficient depth (Current: {avg_depth:.0f}/100)")
             recommendations.append("Provide more detailed examples and explanations in your answers")
         
+        # Trend over the interview. Per-topic averages are keyed by question type
+        # (follow-up, new question, ...), not subject, so they give no advice here
+        trend = dimensions.get('final_score', {}).get('trend', 0)
+        if aggregates.get('count', 0) >= 3:
+            if trend >= TREND_THRESHOLD:
+                strengths.append("Performance improved steadily as the interview progressed")
+            elif trend <= -TREND_THRESHOLD:
+                weaknesses.append("Answers became weaker later in the interview")
+                recommendations.append("Practice longer mock interviews to build stamina and focus")
+        
         # Add general recommendations
         if not recommendations:
             recommendations.append("Continue practicing to maintain and improve your performance")
@@ -337,3 +401,11 @@ class PDFReportGenerator:
             "weaknesses": weaknesses if weaknesses else ["No major weaknesses identified"],
             "recommendations": recommendations
         }
+
+
+@cpu_job
+def render_report_job(session_data: Dict[str, Any]) -> Tuple[bytes, float]:
+    """Render a report in a CPU pool worker; returns the PDF and the CPU seconds it took"""
+    started = time.process_time()
+    pdf_bytes = PDFReportGenerator().render_report(session_data)
+    return pdf_bytes, time.process_time() - started
@@ -0,0 +1,137 @@
+"""
+Question Bank - Resume-grounded question seeds
+Ranks the topics of a resume profile worth probing for a role (projects
+first, then skills by mentions, boosted when their category matters for the
+role) and turns the top ones into starter questions for the
+InterviewerAgent, one template per skill category, topped up with generic
+questions for the role. Topics already named in asked questions are skipped;
+names are matched as whole tokens, so "C" or "R" are not found inside words.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from utils.skill_taxonomy import skill_extractor, tech_tokenize
+
+MAX_TOPICS = 10
+PROJECT_TOPIC_SCORE = 5.0
+
+# Skill categories that matter most for each taxonomy role, most important first
+ROLE_FOCUS: Dict[str, tuple] = {
+    "Software Engineer": ("language", "backend", "practice", "database"),
+    "Backend Engineer": ("backend", "database", "language", "cloud"),
+    "Frontend Engineer": ("frontend", "language", "testing"),
+    "Full Stack Engineer": ("frontend", "backend", "database"),
+    "Mobile Engineer": ("mobile", "language", "frontend"),
+    "Data Scientist": ("ml", "data", "language"),
+    "Data Engineer": ("data", "database", "cloud"),
+    "Data Analyst": ("data", "database"),
+    "Machine Learning Engineer": ("ml", "data", "cloud"),
+    "DevOps Engineer": ("devops", "cloud"),
+    "QA Engineer": ("testing", "devops"),
+    "Security Engineer": ("practice", "cloud", "devops"),
+    "Product Manager": ("practice",),
+    "Engineering Manager": ("practice",),
+}
+FOCUS_BOOST = (3.0, 2.0, 1.5, 1.0)
+
+ROLE_QUESTIONS: Dict[str, List[str]] = {
+    "Software Engineer": [
+        "Tell me about yourself and your software development experience.",
+        "Describe your most challenging project and how you solved it.",
+        "How do you approach debugging a complex issue?",
+        "What design patterns are you familiar with?",
+        "How do you handle code reviews and feedback?",
+        "What's your experience with testing and CI/CD?"
+    ],
+    "Data Scientist": [
+        "Tell me about your experience with machine learning.",
+        "Walk me through a data science project you've worked on.",
+        "How do you handle missing data in a dataset?",
+        "Explain the difference between supervised and unsupervised learning.",
+        "What metrics do you use to evaluate model performance?",
+        "How do you prevent overfitting in your models?"
+    ],
+    "Product Manager": [
+        "Tell me about your product management experience.",
+        "Describe a product you've worked on and its impact.",
+        "How do you prioritize features?",
+        "What's your approach to user research?",
+        "How do you measure product success?",
+        "Tell me about a difficult stakeholder situation you handled."
+    ]
+}
+
+GENERIC_QUESTIONS = [
+    "Tell me about yourself.",
+    "Why are you interested in this role?",
+    "Describe your greatest strength.",
+    "Tell me about a challenge you overcame.",
+    "Where do you see yourself in 5 years?",
+    "Why should we hire you?"
+]
+
+# One template per skill category of the taxonomy
+SKILL_TEMPLATES: Dict[str, str] = {
+    "language": "What is the hardest problem you solved in {skill}, and which language features helped or got in the way?",
+    "frontend": "How did you structure state and components in your {skill} work so the UI stayed fast and maintainable?",
+    "backend": "How did you design the service you built with {skill}, and how did it handle failures and load?",
+    "database": "How did you model your data in {skill}, and how did you find and fix slow queries?",
+    "cloud": "Which {skill} services did you rely on, and how did you keep cost and failure modes under control?",
+    "devops": "Walk me through how you used {skill} in your delivery pipeline and what went wrong along the way.",
+    "data": "Describe a pipeline or analysis you built with {skill}: its inputs, scale, and how you checked the results.",
+    "ml": "Tell me about a model you built using {skill}: how you chose features, evaluated it and shipped it.",
+    "mobile": "What was the most difficult {skill} feature you shipped, and how did you test it across devices?",
+    "testing": "How did you decide what to cover with {skill}, and what bugs did it catch that mattered?",
+    "practice": "Give me a concrete example of applying {skill} in your work and the trade-offs you made.",
+}
+
+PROJECT_TEMPLATE = "Walk me through {project}: what you built, the hardest technical problem, and how you measured the result."
+
+
+def role_questions(role: str) -> List[str]:
+    """Generic questions for a role, used when there is no resume to ground them"""
+    return ROLE_QUESTIONS.get(role, GENERIC_QUESTIONS)
+
+
+def rank_topics(profile: Optional[Dict], role: str, limit: int = MAX_TOPICS) -> List[Dict]:
+    """Resume topics to probe for a role, best first"""
+    profile = profile or {}
+    focus = ROLE_FOCUS.get(skill_extractor.canonical_role(role or "") or "", ())
+    topics = [{"kind": "project", "name": project, "category": "project",
+               "score": PROJECT_TOPIC_SCORE - i * 0.5}
+              for i, project in enumerate(profile.get("projects", [])[:2])]
+    for skill in profile.get("skills", []):
+        boost = FOCUS_BOOST[focus.index(skill["category"])] if skill["category"] in focus else 0.0
+        topics.append({"kind": "skill", "name": skill["name"], "category": skill["category"],
+                       "score": skill["mentions"] + boost})
+    topics.sort(key=lambda topic: -topic["score"])
+    return topics[:limit]
+
+
+def _token_text(text: str) -> str:
+    """Tokens joined by single spaces and padded, so a phrase matches only on token boundaries"""
+    return f" {' '.join(tech_tokenize(text))} "
+
+
+def select_questions(profile: Optional[Dict], role: str, asked_questions: Iterable[str] = (),
+                     limit: int = 3, topics: Optional[List[Dict]] = None) -> List[str]:
+    """Up to `limit` question seeds grounded in the resume profile (or its pre-ranked topics)"""
+    asked_questions = list(asked_questions)
+    asked = " ".join(asked_questions).lower()
+    # One line per question so a name cannot match across two of them
+    asked_tokens = "\n".join(_token_text(question) for question in asked_questions)
+    seeds = []
+    for topic in topics if topics is not None else rank_topics(profile, role):
+        if len(seeds) >= limit:
+            break
+        if _token_text(topic["name"]) in asked_tokens:
+            continue
+        if topic["kind"] == "project":
+            seeds.append(PROJECT_TEMPLATE.format(project=topic["name"]))
+        elif topic["category"] in SKILL_TEMPLATES:
+            seeds.append(SKILL_TEMPLATES[topic["category"]].format(skill=topic["name"]))
+    for question in role_questions(role):
+        if len(seeds) >= limit:
+            break
+        if question.lower() not in asked:
+            seeds.append(question)
+    return seeds[:limit]
@@ -0,0 +1,105 @@
+"""
+Report Cache - In-memory, content-addressed store for rendered PDF reports
+Keeps rendered reports keyed by session so downloads never touch the disk
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import hashlib
+import os
+import threading
+
+REPORT_FILENAME_PREFIX = "interview_report_"
+
+
+def report_filename(session_id: str) -> str:
+    """Download filename for a session's report"""
+    return f"{REPORT_FILENAME_PREFIX}{session_id}.pdf"
+
+
+def session_id_from_filename(filename: str) -> Optional[str]:
+    """Recover the session id from a report filename, if it is one"""
+    if filename.startswith(REPORT_FILENAME_PREFIX) and filename.endswith(".pdf"):
+        return filename[len(REPORT_FILENAME_PREFIX):-len(".pdf")] or None
+    return None
+
+
+class ReportCache:
+    """Size-bounded LRU cache of rendered PDFs, addressed by content digest"""
+
+    def __init__(self, max_bytes: int = None):
+        if max_bytes is None:
+            max_bytes = int(os.getenv("REPORT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+        self.max_bytes = max_bytes
+        self._blobs: "OrderedDict[str, bytes]" = OrderedDict()  # digest -> pdf bytes
+        self._sessions: Dict[str, str] = {}  # session_id -> digest
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(pdf_bytes: bytes) -> str:
+        """Content address of a rendered report (also used as its ETag)"""
+        return hashlib.sha256(pdf_bytes).hexdigest()
+
+    def put(self, session_id: str, pdf_bytes: bytes) -> str:
+        """Store a rendered report for a session and return its digest"""
+        digest = self.digest(pdf_bytes)
+        with self._lock:
+            if digest in self._blobs:
+                self._blobs.move_to_end(digest)
+            else:
+                self._blobs[digest] = pdf_bytes
+                self._total_bytes += len(pdf_bytes)
+            self._sessions[session_id] = digest
+            self._evict()
+        return digest
+
+    def get(self, session_id: str) -> Optional[Tuple[str, bytes]]:
+        """Return (digest, pdf_bytes) for a session, or None if not cached"""
+        with self._lock:
+            digest = self._sessions.get(session_id)
+            if digest is None or digest not in self._blobs:
+                self._sessions.pop(session_id, None)
+                self.misses += 1
+                return None
+            self._blobs.move_to_end(digest)
+            self.hits += 1
+            return digest, self._blobs[digest]
+
+    def get_digest(self, session_id: str) -> Optional[str]:
+        """Return the cached digest for a session without touching LRU order"""
+        with self._lock:
+            digest = self._sessions.get(session_id)
+            return digest if digest in self._blobs else None
+
+    def discard(self, session_id: str):
+        """Forget a session's report, dropping its blob unless another session shares it"""
+        with self._lock:
+            digest = self._sessions.pop(session_id, None)
+            if digest in self._blobs and digest not in self._sessions.values():
+                self._total_bytes -= len(self._blobs.pop(digest))
+
+    def _evict(self):
+        """Drop least recently used reports until the cache fits its budget"""
+        while self._total_bytes > self.max_bytes and len(self._blobs) > 1:
+            digest, blob = self._blobs.popitem(last=False)
+            self._total_bytes -= len(blob)
+            for session_id in [s for s, d in self._sessions.items() if d == digest]:
+                del self._sessions[session_id]
+
+    def stats(self) -> Dict:
+        """Cache occupancy and hit/miss counters"""
+        with self._lock:
+            return {
+                "entries": len(self._blobs),
+                "sessions": len(self._sessions),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Global report cache
+report_cache = ReportCache()
@@ -0,0 +1,166 @@
+"""
+Report Service - Lazily renders PDF reports on first download
+end_interview only persists the session summary; the PDF is built when someone
+actually asks for it (or by the optional background pre-warm worker) and cached
+"""
+from typing import Dict, Optional, Tuple
+import os
+import queue
+import threading
+import time
+
+from utils.cpu_pool import cpu_pool
+from utils.report_cache import report_cache
+from utils.report_store import report_store
+
+
+class ReportService:
+    """Coordinates the summary store, the report cache and PDF rendering"""
+
+    def __init__(self, store=None, cache=None, prewarm: bool = None):
+        self.store = store or report_store
+        self.cache = cache or report_cache
+        # Retention deletes must not leave a downloadable copy behind in the cache
+        self.store.add_delete_listener(self.cache.discard)
+        if prewarm is None:
+            prewarm = os.getenv("REPORT_PREWARM", "0") == "1"
+        self.prewarm_enabled = prewarm
+        self.prewarm_delay = float(os.getenv("REPORT_PREWARM_DELAY", "2.0"))
+
+        self._render_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._prewarm_queue: "queue.Queue[str]" = queue.Queue()
+        self._prewarm_thread = None
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "interviews_finished": 0,
+            "renders": 0,
+            "render_cpu_seconds": 0.0,
+            "first_downloads": 0,
+            "first_download_seconds": 0.0,
+            "repeat_downloads": 0,
+            "repeat_download_seconds": 0.0,
+        }
+
+    def finish_interview(self, report_id: str, session_summary: Dict):
+        """Persist the compact summary; rendering is deferred"""
+        self.store.save_summary(report_id, session_summary)
+        with self._stats_lock:
+            self._stats["interviews_finished"] += 1
+        if self.prewarm_enabled:
+            self._ensure_prewarm_worker()
+            self._prewarm_queue.put(report_id)
+
+    def has_report(self, report_id: str) -> bool:
+        """True if a report can be served for this id"""
+        return self.cache.get_digest(report_id) is not None or self.store.get_entry(report_id) is not None
+
+    def get_or_render(self, report_id: str) -> Optional[Tuple[str, bytes]]:
+        """Return (digest, pdf_bytes), rendering and caching on first request"""
+        started = time.perf_counter()
+        cached = self.cache.get(report_id)
+        if cached is not None:
+            self._record_download("repeat", time.perf_counter() - started)
+            return cached
+
+        # One render per report even if several downloads race
+        with self._render_lock(report_id):
+            cached = self.cache.get(report_id)
+            if cached is None:
+                cached = self._render(report_id)
+        with self._locks_guard:
+            self._render_locks.pop(report_id, None)
+        if cached is not None:
+            self._record_download("first", time.perf_counter() - started)
+        return cached
+
+    def _render(self, report_id: str) -> Optional[Tuple[str, bytes]]:
+        """Load a previously rendered PDF, or render the stored summary, into the cache"""
+        pdf_bytes = self.store.load_pdf(report_id)
+        if pdf_bytes is not None:
+            return self.cache.put(report_id, pdf_bytes), pdf_bytes
+
+        summary = self.store.load_summary(report_id)
+        if summary is None:
+            return None
+
+        # reportlab is imported on the first render (or by the startup warm-up), not at import;
+        # the build itself runs in a CPU pool worker so it never holds this process's GIL
+        from utils.pdf_generator import render_report_job
+        pdf_bytes, cpu_seconds = cpu_pool.call(render_report_job, summary)
+
+        digest = self.cache.put(report_id, pdf_bytes)
+        self.store.save_pdf(report_id, pdf_bytes, digest)
+        with self._stats_lock:
+            self._stats["renders"] += 1
+            self._stats["render_cpu_seconds"] += cpu_seconds
+        return digest, pdf_bytes
+
+    def _render_lock(self, report_id: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._render_locks.get(report_id)
+            if lock is None:
+                lock = self._render_locks[report_id] = threading.Lock()
+            return lock
+
+    def _record_download(self, kind: str, seconds: float):
+        with self._stats_lock:
+            self._stats[f"{kind}_downloads"] += 1
+            self._stats[f"{kind}_download_seconds"] += seconds
+
+    # ==================== Pre-warm worker ====================
+
+    def _ensure_prewarm_worker(self):
+        if self._prewarm_thread is None or not self._prewarm_thread.is_alive():
+            self._prewarm_thread = threading.Thread(
+                target=self._prewarm_loop, name="report-prewarm", daemon=True
+            )
+            self._prewarm_thread.start()
+
+    def _prewarm_loop(self):
+        """Render queued reports one at a time, yielding to interactive work"""
+        while True:
+            report_id = self._prewarm_queue.get()
+            try:
+                time.sleep(self.prewarm_delay)
+                if self.cache.get_digest(report_id) is None:
+                    with self._render_lock(report_id):
+                        if self.cache.get_digest(report_id) is None:
+                            self._render(report_id)
+            except Exception as e:
+                print(f"❌ Report pre-warm failed for {report_id}: {e}")
+            finally:
+                self._prewarm_queue.task_done()
+
+    # ==================== Reporting ====================
+
+    def stats(self) -> Dict:
+        """Render and download counters, including CPU saved by lazy rendering"""
+        with self._stats_lock:
+            s = dict(self._stats)
+        avg_render_cpu = s["render_cpu_seconds"] / s["renders"] if s["renders"] else 0.0
+        skipped = max(0, s["interviews_finished"] - s["renders"])
+        return {
+            **s,
+            "renders_skipped": skipped,
+            "avg_render_cpu_ms": round(avg_render_cpu * 1000, 2),
+            "estimated_cpu_saved_seconds": round(skipped * avg_render_cpu, 3),
+            "cpu_saved_per_interview_ms": round(
+                skipped * avg_render_cpu * 1000 / s["interviews_finished"], 2
+            ) if s["interviews_finished"] else 0.0,
+            "avg_first_download_ms": round(
+                s["first_download_seconds"] * 1000 / s["first_downloads"], 2
+            ) if s["first_downloads"] else 0.0,
+            "avg_repeat_download_ms": round(
+                s["repeat_download_seconds"] * 1000 / s["repeat_downloads"], 3
+            ) if s["repeat_downloads"] else 0.0,
+            "prewarm_enabled": self.prewarm_enabled,
+            "prewarm_pending": self._prewarm_queue.qsize(),
+            "cache": self.cache.stats(),
+            "store": self.store.stats(),
+        }
+
+
+# Global report service
+report_service = ReportService()
@@ -0,0 +1,390 @@
+"""
+Report Store - Sharded, indexed on-disk storage for finished interview reports
+Each report id owns a summary (JSON) and, once rendered, a PDF. Files live in
+hash-sharded directories and an in-memory index (backed by an append-only
+journal) maps report ids to files, so lookups never scan the disk.
+
+Over the byte budget, the least recently used reports are evicted first (a
+report is used when it is saved, loaded or rendered); the report being
+written is never evicted by its own write.
+
+Only the server's store writes the index. Other processes (the batch
+regeneration CLI) open it read-only, write PDF files and queue their ids in
+pending/; the server registers them, and applies its own budget, when it
+loads the index and on every retention sweep.
+"""
+from typing import Callable, Dict, List, Optional
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+DEFAULT_REPORTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'reports')
+
+_SAFE_ID = re.compile(r'^[A-Za-z0-9_.\-]{1,128}$')
+
+INDEX_FILENAME = "index.jsonl"
+PENDING_DIRNAME = "pending"
+
+
+def is_valid_report_id(report_id: str) -> bool:
+    """Report ids double as file names, so only allow a safe alphabet"""
+    return bool(report_id) and bool(_SAFE_ID.match(report_id)) and report_id not in (".", "..")
+
+
+class ReportStore:
+    """Stores report summaries and PDFs with an O(1) id index and retention policy"""
+
+    def __init__(self, base_dir: str = None, max_bytes: int = None, max_age_seconds: float = None,
+                 sweep_interval: float = None, read_only: bool = False):
+        self.base_dir = os.path.abspath(base_dir or os.getenv("REPORTS_DIR", DEFAULT_REPORTS_DIR))
+        if max_bytes is None:
+            max_bytes = int(os.getenv("REPORTS_MAX_BYTES", 1024 * 1024 * 1024))
+        if max_age_seconds is None:
+            max_age_seconds = float(os.getenv("REPORTS_MAX_AGE_DAYS", "30")) * 86400
+        if sweep_interval is None:
+            sweep_interval = float(os.getenv("REPORTS_SWEEP_INTERVAL", "600"))
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.sweep_interval = sweep_interval
+        self.read_only = read_only
+
+        self._index: Dict[str, Dict] = {}  # report_id -> entry
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._journal_path = os.path.join(self.base_dir, INDEX_FILENAME)
+        self._pending_dir = os.path.join(self.base_dir, PENDING_DIRNAME)
+        self._journal_records = 0
+        self._sweeper = None
+        self._stop = threading.Event()
+        self._loaded = False
+        self._delete_listeners: List[Callable[[str], None]] = []
+        self.evicted = 0
+
+    # ==================== Layout ====================
+
+    def _shard_dir(self, report_id: str) -> str:
+        digest = hashlib.sha1(report_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.base_dir, digest[:2], digest[2:4])
+
+    def _path(self, report_id: str, kind: str) -> str:
+        if not is_valid_report_id(report_id):
+            raise ValueError(f"Invalid report id: {report_id!r}")
+        extension = "json" if kind == "summary" else "pdf"
+        return os.path.join(self._shard_dir(report_id), f"{report_id}.{extension}")
+
+    # ==================== Index ====================
+
+    def _ensure_loaded(self):
+        """Replay the index journal once; compacts it if it grew stale"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if not self.read_only:
+                os.makedirs(self.base_dir, exist_ok=True)
+            if os.path.exists(self._journal_path):
+                with open(self._journal_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue  # torn write from a crash
+                        self._journal_records += 1
+                        if record.get("op") == "del":
+                            self._index.pop(record["id"], None)
+                        else:
+                            self._index[record["id"]] = record["entry"]
+            self._total_bytes = sum(self._entry_bytes(e) for e in self._index.values())
+            self._loaded = True
+            if self.read_only:
+                return
+            if self._journal_records > 2 * len(self._index) + 100:
+                self._compact_journal()
+            self.apply_pending_pdfs()
+
+    @staticmethod
+    def _entry_bytes(entry: Dict) -> int:
+        return entry.get("summary_bytes", 0) + entry.get("pdf_bytes", 0)
+
+    def _check_writable(self):
+        if self.read_only:
+            raise RuntimeError("This report store is read-only; the server owns the index")
+
+    def _append_journal(self, record: Dict):
+        self._check_writable()
+        with open(self._journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._journal_records += 1
+
+    def _compact_journal(self):
+        """Rewrite the journal with one record per live entry"""
+        self._check_writable()
+        tmp_path = f"{self._journal_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for report_id, entry in self._index.items():
+                f.write(json.dumps({"op": "put", "id": report_id, "entry": entry}, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self._journal_path)
+        self._journal_records = len(self._index)
+
+    def _put_entry(self, report_id: str, entry: Dict):
+        old = self._index.get(report_id)
+        if old:
+            self._total_bytes -= self._entry_bytes(old)
+        self._index[report_id] = entry
+        self._total_bytes += self._entry_bytes(entry)
+        self._append_journal({"op": "put", "id": report_id, "entry": entry})
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    # ==================== Summaries ====================
+
+    def save_summary(self, report_id: str, summary: Dict):
+        """Persist the compact summary for a finished session"""
+        self._ensure_loaded()
+        data = json.dumps(summary, separators=(",", ":")).encode("utf-8")
+        path = self._path(report_id, "summary")
+        with self._lock:
+            self._write_atomic(path, data)
+            entry = dict(self._index.get(report_id) or {"created_at": time.time()})
+            entry["summary_bytes"] = len(data)
+            entry["last_used"] = time.time()
+            self._put_entry(report_id, entry)
+        self.start_sweeper()
+
+    def load_summary(self, report_id: str) -> Optional[Dict]:
+        """Load a stored summary, or None if the report id is unknown"""
+        if not is_valid_report_id(report_id):
+            return None
+        self._ensure_loaded()
+        entry = self._index.get(report_id)
+        if not entry or "summary_bytes" not in entry:
+            return None
+        self._touch(entry)
+        try:
+            with open(self._path(report_id, "summary"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    # ==================== PDFs ====================
+
+    def pdf_path(self, report_id: str) -> str:
+        """Where a report's PDF lives (for writers outside this process)"""
+        return self._path(report_id, "pdf")
+
+    def write_pdf_file(self, report_id: str, pdf_bytes: bytes) -> str:
+        """Write PDF bytes to the report's shard without touching the index"""
+        path = self.pdf_path(report_id)
+        self._write_atomic(path, pdf_bytes)
+        return path
+
+    def queue_pdfs(self, report_ids: List[str]):
+        """Ask the server to register PDFs this process wrote with write_pdf_file
+        
+        Each call writes one batch file atomically, so the server never reads
+        half a batch; size and digest are taken from the files when applied.
+        """
+        if not report_ids:
+            return
+        os.makedirs(self._pending_dir, exist_ok=True)
+        name = f"{time.time():.6f}-{os.getpid()}-{threading.get_ident()}.txt"
+        self._write_atomic(os.path.join(self._pending_dir, name), "\n".join(report_ids).encode("utf-8"))
+
+    def apply_pending_pdfs(self) -> int:
+        """Register PDFs queued by other processes; returns how many were registered"""
+        if self.read_only:
+            return 0
+        self._ensure_loaded()
+        try:
+            names = sorted(name for name in os.listdir(self._pending_dir) if name.endswith(".txt"))
+        except FileNotFoundError:
+            return 0
+        registered = 0
+        for name in names:
+            path = os.path.join(self._pending_dir, name)
+            with open(path, "r", encoding="utf-8") as f:
+                report_ids = [line.strip() for line in f if is_valid_report_id(line.strip())]
+            for report_id in report_ids:
+                registered += self._register_written_pdf(report_id)
+            os.remove(path)
+        return registered
+
+    def _register_written_pdf(self, report_id: str) -> int:
+        path = self._path(report_id, "pdf")
+        with self._lock:
+            if report_id not in self._index:
+                # Deleted (or evicted) while the file was being written
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                return 0
+            try:
+                with open(path, "rb") as f:
+                    pdf_bytes = f.read()
+            except FileNotFoundError:
+                return 0
+            self.register_pdf(report_id, len(pdf_bytes), hashlib.sha256(pdf_bytes).hexdigest())
+        # Copies of the previous PDF are stale now
+        for callback in self._delete_listeners:
+            callback(report_id)
+        return 1
+
+    def save_pdf(self, report_id: str, pdf_bytes: bytes, digest: str = None):
+        """Persist a rendered PDF next to its summary"""
+        self._ensure_loaded()
+        with self._lock:
+            self.write_pdf_file(report_id, pdf_bytes)
+            self.register_pdf(report_id, len(pdf_bytes), digest or hashlib.sha256(pdf_bytes).hexdigest())
+
+    def register_pdf(self, report_id: str, size: int, digest: str):
+        """Record an already written PDF in the index"""
+        self._ensure_loaded()
+        with self._lock:
+            entry = dict(self._index.get(report_id) or {"created_at": time.time()})
+            entry["pdf_bytes"] = size
+            entry["digest"] = digest
+            entry["last_used"] = time.time()
+            self._put_entry(report_id, entry)
+            if self._total_bytes > self.max_bytes:
+                # A lazily rendered old report must survive its own registration
+                self._enforce_size_budget(keep=report_id)
+
+    def load_pdf(self, report_id: str) -> Optional[bytes]:
+        """Load a rendered PDF by id, or None if it was never rendered"""
+        if not is_valid_report_id(report_id):
+            return None
+        self._ensure_loaded()
+        entry = self._index.get(report_id)
+        if not entry or "pdf_bytes" not in entry:
+            return None
+        self._touch(entry)
+        try:
+            with open(self._path(report_id, "pdf"), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def get_entry(self, report_id: str) -> Optional[Dict]:
+        """Index entry for a report id (sizes, digest, creation time)"""
+        if not is_valid_report_id(report_id):
+            return None
+        self._ensure_loaded()
+        entry = self._index.get(report_id)
+        return dict(entry) if entry else None
+
+    def list_summary_ids(self) -> List[str]:
+        """Indexed report ids that have a stored summary, oldest first"""
+        return [rid for rid in self.list_report_ids() if "summary_bytes" in (self._index.get(rid) or {})]
+
+    def list_report_ids(self) -> List[str]:
+        """All indexed report ids, oldest first"""
+        self._ensure_loaded()
+        with self._lock:
+            return [rid for rid, _ in sorted(self._index.items(), key=lambda item: item[1].get("created_at", 0))]
+
+    # ==================== Retention ====================
+
+    def add_delete_listener(self, callback: Callable[[str], None]):
+        """Call `callback(report_id)` whenever a report is deleted or its PDF replaced (e.g. to drop cached copies)"""
+        self._delete_listeners.append(callback)
+
+    def delete(self, report_id: str):
+        """Remove a report's files and index entry"""
+        with self._lock:
+            entry = self._index.pop(report_id, None)
+            if entry is None:
+                return
+            self._total_bytes -= self._entry_bytes(entry)
+            self._append_journal({"op": "del", "id": report_id})
+        for kind in ("summary", "pdf"):
+            try:
+                os.remove(self._path(report_id, kind))
+            except FileNotFoundError:
+                pass
+        for callback in self._delete_listeners:
+            callback(report_id)
+
+    @staticmethod
+    def _touch(entry: Dict):
+        # In memory only, so reads do not grow the journal; the time is persisted
+        # with the entry's next write or journal compaction
+        entry["last_used"] = time.time()
+
+    def _enforce_size_budget(self, keep: str = None):
+        """Evict least recently used reports (never `keep`) until the store fits its byte budget"""
+        with self._lock:
+            if self._total_bytes <= self.max_bytes:
+                return
+            by_use = sorted(self._index.items(), key=lambda item: item[1].get("last_used", item[1].get("created_at", 0)))
+            for report_id, _ in by_use:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                if report_id == keep:
+                    continue
+                self.delete(report_id)
+                self.evicted += 1
+
+    def sweep(self) -> int:
+        """Apply age- and size-based retention; returns the number of evicted reports"""
+        self._ensure_loaded()
+        self.apply_pending_pdfs()
+        before = self.evicted
+        cutoff = time.time() - self.max_age_seconds
+        with self._lock:
+            expired = [rid for rid, e in self._index.items() if e.get("created_at", 0) < cutoff]
+            for report_id in expired:
+                self.delete(report_id)
+                self.evicted += 1
+            self._enforce_size_budget()
+            if self._journal_records > 2 * len(self._index) + 100:
+                self._compact_journal()
+        return self.evicted - before
+
+    def start_sweeper(self):
+        """Start the background retention sweeper (idempotent)"""
+        if self.sweep_interval <= 0 or (self._sweeper is not None and self._sweeper.is_alive()):
+            return
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="report-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        self._stop.set()
+
+    def _sweep_loop(self):
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                evicted = self.sweep()
+                if evicted:
+                    print(f"🧹 Report sweeper evicted {evicted} report(s)")
+            except Exception as e:
+                print(f"❌ Report sweeper error: {e}")
+
+    def stats(self) -> Dict:
+        """Index size, disk use and retention settings"""
+        self._ensure_loaded()
+        with self._lock:
+            return {
+                "reports": len(self._index),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+                "evicted": self.evicted,
+            }
+
+
+# Global report store
+report_store = ReportStore()
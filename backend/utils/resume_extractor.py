@@ -0,0 +1,232 @@
+"""
+Resume Extractor - Server-side PDF / DOCX text extraction keyed by content hash
+Uploads are hashed while being read in chunks; the SHA-256 digest is the
+resume id, so an identical file is only ever parsed once. Parsing runs on a
+small dedicated thread pool that hands the bytes to the CPU process pool,
+concurrent uploads of the same file share one parse, and extracted text is kept in an LRU so interview requests can refer
+to a resume by id instead of resending its text.
+
+PDF extraction uses pypdf when it is installed (imported on the first PDF,
+or by the startup warm-up); DOCX is read directly from the document XML
+inside the zip container.
+"""
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Dict, Optional, Tuple
+import hashlib
+import importlib.util
+import io
+import os
+import re
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+
+from utils.cpu_pool import cpu_pool, cpu_job
+
+RESUME_MAX_BYTES = int(os.getenv("RESUME_MAX_BYTES", 5 * 1024 * 1024))
+RESUME_MAX_PAGES = int(os.getenv("RESUME_MAX_PAGES", "20"))
+RESUME_MAX_CHARS = int(os.getenv("RESUME_MAX_CHARS", "20000"))
+RESUME_EXTRACT_WORKERS = int(os.getenv("RESUME_EXTRACT_WORKERS", "2"))
+RESUME_CACHE_SIZE = int(os.getenv("RESUME_CACHE_SIZE", "256"))
+READ_CHUNK_BYTES = 64 * 1024
+MIN_RESUME_CHARS = 10
+
+# A DOCX is a zip; refuse document XML that would inflate far beyond any real resume
+DOCX_MAX_XML_BYTES = 20 * 1024 * 1024
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_SPACES_RE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+class ResumeFormatError(ValueError):
+    """Raised for uploads no text can be extracted from"""
+
+
+def _hash_file(fileobj: BinaryIO) -> Tuple[str, int]:
+    """SHA-256 and size of a file, read in fixed-size chunks"""
+    digest = hashlib.sha256()
+    size = 0
+    fileobj.seek(0)
+    while True:
+        chunk = fileobj.read(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        digest.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
+
+def _normalize(text: str) -> str:
+    text = _SPACES_RE.sub(" ", text)
+    text = _BLANK_LINES_RE.sub("\n\n", text)
+    return text.strip()[:RESUME_MAX_CHARS]
+
+
+def load_pdf_reader():
+    """pypdf's (PdfReader, PdfReadError), or None when it is not installed
+
+    pypdf is deferred to the first PDF because importing it is a noticeable
+    share of the API's startup time.
+    """
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PdfReadError
+    except ImportError:  # PDF uploads are rejected without pypdf; DOCX and text still work
+        return None
+    return PdfReader, PdfReadError
+
+
+def _extract_pdf(fileobj: BinaryIO) -> Tuple[str, int]:
+    pypdf = load_pdf_reader()
+    if pypdf is None:
+        raise ResumeFormatError("PDF extraction requires the pypdf package")
+    PdfReader, PdfReadError = pypdf
+    try:
+        reader = PdfReader(fileobj)
+        if reader.is_encrypted:
+            raise ResumeFormatError("Password-protected PDFs are not supported")
+        pages = []
+        chars = 0
+        for page in reader.pages[:RESUME_MAX_PAGES]:
+            text = page.extract_text() or ""
+            pages.append(text)
+            chars += len(text)
+            if chars >= RESUME_MAX_CHARS:
+                break
+        return "\n\n".join(pages), len(reader.pages)
+    except ResumeFormatError:
+        raise
+    except (PdfReadError, ValueError, KeyError) as e:
+        raise ResumeFormatError(f"Invalid PDF file: {e}")
+
+
+def _extract_docx(fileobj: BinaryIO) -> str:
+    try:
+        with zipfile.ZipFile(fileobj) as archive:
+            info = archive.getinfo("word/document.xml")
+            if info.file_size > DOCX_MAX_XML_BYTES:
+                raise ResumeFormatError("DOCX document is too large")
+            parts = []
+            with archive.open(info) as document:
+                for _, elem in ET.iterparse(document, events=("end",)):
+                    if elem.tag == _W + "t":
+                        parts.append(elem.text or "")
+                    elif elem.tag == _W + "tab":
+                        parts.append("\t")
+                    elif elem.tag in (_W + "br", _W + "cr"):
+                        parts.append("\n")
+                    elif elem.tag == _W + "p":
+                        parts.append("\n")
+                        elem.clear()
+            return "".join(parts)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+        raise ResumeFormatError(f"Invalid DOCX file: {e}")
+
+
+def extract_text(fileobj: BinaryIO, filename: str = "") -> Dict:
+    """Detect the format from the file's magic bytes and extract its text"""
+    fileobj.seek(0)
+    header = fileobj.read(8)
+    fileobj.seek(0)
+    pages = None
+    if header.startswith(b"%PDF-"):
+        kind = "pdf"
+        text, pages = _extract_pdf(fileobj)
+    elif header.startswith(b"PK\x03\x04"):
+        kind = "docx"
+        text = _extract_docx(fileobj)
+    elif filename.lower().endswith((".txt", ".md")):
+        kind = "text"
+        text = fileobj.read(RESUME_MAX_BYTES).decode("utf-8", errors="replace")
+    else:
+        raise ResumeFormatError("Unsupported resume format - upload a PDF, DOCX or text file")
+    text = _normalize(text)
+    if len(text) < MIN_RESUME_CHARS:
+        raise ResumeFormatError("No text found in the resume - scanned documents are not supported")
+    return {"format": kind, "pages": pages, "chars": len(text), "text": text}
+
+
+@cpu_job
+def extract_text_bytes(data: bytes, filename: str = "") -> Dict:
+    """extract_text for an in-memory file, so parsing can run in a CPU pool worker"""
+    return extract_text(io.BytesIO(data), filename)
+
+
+class ResumeExtractor:
+    """Content-addressed resume text cache in front of a parsing pool"""
+
+    def __init__(self, workers: int = RESUME_EXTRACT_WORKERS, cache_size: int = RESUME_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resume")
+        self.parsed = 0
+        self.hits = 0
+
+    def submit(self, fileobj: BinaryIO, filename: str = "") -> Tuple[Future, bool]:
+        """Hash an upload and start (or join) its extraction; returns (future entry, cached)
+
+        Blocking (it reads the file), so call it from a worker thread. A second
+        upload of a file that is still being parsed waits on the first parse.
+        """
+        digest, size = _hash_file(fileobj)
+        with self._lock:
+            entry = self._cache.get(digest)
+            if entry is not None:
+                self._cache.move_to_end(digest)
+                self.hits += 1
+                future = Future()
+                future.set_result(entry)
+                return future, True
+            future = self._inflight.get(digest)
+            if future is not None:
+                self.hits += 1
+                return future, True
+            future = self._pool.submit(self._parse, fileobj, filename, digest, size)
+            self._inflight[digest] = future
+            return future, False
+
+    def _parse(self, fileobj: BinaryIO, filename: str, digest: str, size: int) -> Dict:
+        try:
+            # Uploads are capped at RESUME_MAX_BYTES, so the file is shipped to a worker process whole
+            fileobj.seek(0)
+            data = fileobj.read(RESUME_MAX_BYTES + 1)
+            entry = {"resume_id": digest, "size_bytes": size, **cpu_pool.call(extract_text_bytes, data, filename)}
+            with self._lock:
+                self._cache[digest] = entry
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                self.parsed += 1
+            return entry
+        finally:
+            with self._lock:
+                self._inflight.pop(digest, None)
+
+    def get(self, resume_id: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._cache.get(resume_id)
+            if entry is not None:
+                self._cache.move_to_end(resume_id)
+            return entry
+
+    def get_text(self, resume_id: str) -> Optional[str]:
+        entry = self.get(resume_id)
+        return entry["text"] if entry else None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "cached_resumes": len(self._cache),
+                "in_flight": len(self._inflight),
+                "parsed": self.parsed,
+                "cache_hits": self.hits,
+                "pdf_supported": importlib.util.find_spec("pypdf") is not None,
+            }
+
+
+# Global resume extractor
+resume_extractor = ResumeExtractor()
@@ -0,0 +1,108 @@
+"""
+Score Aggregates - Running per-dimension statistics for one interview
+Updated in O(1) per scored interaction: sums, min / max, last value, a
+least-squares trend over the interaction index, and per-topic sums. Reports
+and the FeedbackAgent read the snapshot instead of re-walking every block.
+
+A block's topic is the kind of question it answered (introduction, followup,
+hard_followup, different_question), not its subject.
+"""
+from typing import Dict, Iterable, Optional
+
+from utils.local_scorer import SCORE_DIMENSIONS
+
+AGGREGATE_DIMENSIONS = SCORE_DIMENSIONS + ("final_score",)
+
+# Trend slopes are in points per interaction; beyond this the trend is reported as a change
+TREND_THRESHOLD = 1.5
+
+
+class _RunningDimension:
+    __slots__ = ("count", "total", "minimum", "maximum", "last", "sum_x", "sum_xx", "sum_xy")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.last = None
+        self.sum_x = 0.0
+        self.sum_xx = 0.0
+        self.sum_xy = 0.0
+
+    def add(self, value: float, x: float):
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+        self.last = value
+        self.sum_x += x
+        self.sum_xx += x * x
+        self.sum_xy += x * value
+
+    def slope(self) -> float:
+        """Least-squares slope of value over interaction index"""
+        denominator = self.count * self.sum_xx - self.sum_x * self.sum_x
+        if self.count < 2 or not denominator:
+            return 0.0
+        return (self.count * self.sum_xy - self.sum_x * self.total) / denominator
+
+    def snapshot(self) -> Dict:
+        return {
+            "mean": round(self.total / self.count, 2) if self.count else 0.0,
+            "min": self.minimum,
+            "max": self.maximum,
+            "last": self.last,
+            "trend": round(self.slope(), 2),
+        }
+
+
+class ScoreAggregates:
+    """Incrementally maintained score statistics for a session"""
+
+    def __init__(self):
+        self.count = 0
+        self.dimensions = {dim: _RunningDimension() for dim in AGGREGATE_DIMENSIONS}
+        self.topics: Dict[str, Dict] = {}
+
+    def add(self, scores: Dict, index: int, topic: Optional[str] = None):
+        """Fold in the scores of interaction `index`"""
+        self.count += 1
+        for dim, running in self.dimensions.items():
+            running.add(float(scores.get(dim, 0) or 0), index)
+        if topic:
+            entry = self.topics.setdefault(topic, {"count": 0, "totals": dict.fromkeys(AGGREGATE_DIMENSIONS, 0.0)})
+            entry["count"] += 1
+            for dim in AGGREGATE_DIMENSIONS:
+                entry["totals"][dim] += float(scores.get(dim, 0) or 0)
+
+    def snapshot(self) -> Dict:
+        """Plain-dict view for summaries, reports and prompts"""
+        return {
+            "count": self.count,
+            "dimensions": {dim: running.snapshot() for dim, running in self.dimensions.items()},
+            "topics": {
+                topic: {
+                    "count": entry["count"],
+                    **{dim: round(total / entry["count"], 2) for dim, total in entry["totals"].items()},
+                }
+                for topic, entry in self.topics.items()
+            },
+        }
+
+    @classmethod
+    def from_blocks(cls, blocks: Iterable[Dict]) -> "ScoreAggregates":
+        """Rebuild from stored interaction blocks (summaries written before aggregates existed)"""
+        aggregates = cls()
+        for index, block in enumerate(blocks):
+            if isinstance(block.get("scores"), dict):
+                aggregates.add(block["scores"], index, block.get("topic"))
+        return aggregates
+
+
+def summary_aggregates(session_data: Dict) -> Dict:
+    """The aggregates snapshot of a session summary, rebuilt from its blocks if absent"""
+    aggregates = session_data.get("aggregates")
+    if aggregates:
+        return aggregates
+    return ScoreAggregates.from_blocks(session_data.get("interaction_blocks", [])).snapshot()
@@ -0,0 +1,88 @@
+"""
+Singleflight - Coalescing of identical in-flight LLM calls
+Retries, double-clicks and no-resume candidates starting the same role and
+difficulty at the same moment send byte-identical prompts to the same
+model. While one such call is in flight, later identical calls wait on its
+future instead of issuing their own: one LLM call, one scheduler slot, and
+every caller gets the same result (or the same exception).
+
+Nothing is cached: the key is forgotten as soon as the call finishes, so a
+prompt sent again later gets a fresh completion. Set LLM_COALESCE=0 to turn
+coalescing off, or pass coalesce=False for a task whose callers should each
+get their own sample.
+"""
+from concurrent.futures import Future
+from typing import Callable, Dict, TypeVar
+import hashlib
+import os
+import threading
+
+T = TypeVar("T")
+
+LLM_COALESCE = os.getenv("LLM_COALESCE", "1") == "1"
+
+
+def prompt_key(crew) -> str:
+    """Hash of everything that reaches the model: model name, agent persona and task prompts"""
+    digest = hashlib.sha256()
+    for agent in getattr(crew, "agents", None) or []:
+        llm = getattr(agent, "llm", None)
+        for part in (getattr(llm, "model", llm), getattr(agent, "role", None),
+                     getattr(agent, "goal", None), getattr(agent, "backstory", None)):
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\x00")
+    for task in getattr(crew, "tasks", None) or []:
+        for part in (getattr(task, "description", None), getattr(task, "expected_output", None)):
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class Singleflight:
+    """At most one in-flight call per key; concurrent callers share its future"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._stats = {"calls": 0, "executed": 0, "coalesced": 0, "failed": 0}
+
+    def do(self, key: str, call: Callable[[], T]) -> T:
+        with self._lock:
+            self._stats["calls"] += 1
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                future = Future()
+                self._inflight[key] = future
+                self._stats["executed"] += 1
+                leader = True
+        if not leader:
+            return future.result()
+        try:
+            result = call()
+        except BaseException as e:
+            with self._lock:
+                self._stats["failed"] += 1
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            calls = self._stats["calls"]
+            return {
+                "enabled": LLM_COALESCE,
+                "in_flight": len(self._inflight),
+                **self._stats,
+                "coalesced_ratio": round(self._stats["coalesced"] / calls, 3) if calls else 0.0,
+            }
+
+
+# Global coalescing layer in front of the LLM scheduler
+llm_singleflight = Singleflight()
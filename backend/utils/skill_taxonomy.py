@@ -0,0 +1,408 @@
+"""
+Skill Taxonomy - Local resume profiling without an LLM
+Every skill and job title alias in the taxonomy is compiled into one
+word-level Aho-Corasick automaton (the PhraseMatcher used for speech
+analysis, with a tokenizer that keeps "c++", "c#", "node.js" and ".net"
+intact). One pass over the resume tokens finds all aliases, which are
+normalized to canonical names; years of experience and project headings come
+from a light section parser. A typical resume is profiled in about a
+millisecond.
+
+Aliases that are also everyday words ("go", "r", "spring") only count inside
+a skills section.
+"""
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+import copy
+import re
+import time
+
+from utils.speech_analysis import PhraseMatcher
+
+# category -> canonical name -> aliases (the lowercased canonical name is always an alias)
+SKILL_TAXONOMY: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "language": {
+        "Python": ("python3", "py"),
+        "Java": ("java8", "java 8", "java 11", "java 17"),
+        "JavaScript": ("js", "ecmascript", "es6"),
+        "TypeScript": ("ts",),
+        "Go": ("golang", "go lang"),
+        "C++": ("cpp",),
+        "C#": ("c sharp", "csharp"),
+        "C": (),
+        "Rust": (),
+        "Ruby": (),
+        "PHP": (),
+        "Kotlin": (),
+        "Swift": (),
+        "Scala": (),
+        "R": (),
+        "SQL": ("t-sql", "pl/sql", "plsql"),
+        "Bash": ("shell scripting", "shell", "bash scripting"),
+        "MATLAB": (),
+    },
+    "frontend": {
+        "React": ("react.js", "reactjs", "react js"),
+        "React Native": (),
+        "Angular": ("angularjs", "angular.js"),
+        "Vue": ("vue.js", "vuejs"),
+        "Next.js": ("nextjs",),
+        "Redux": (),
+        "HTML": ("html5",),
+        "CSS": ("css3",),
+        "Tailwind CSS": ("tailwind", "tailwindcss"),
+        "Vite": (),
+        "Webpack": (),
+    },
+    "backend": {
+        "Node.js": ("node", "nodejs", "node js"),
+        "Express": ("express.js", "expressjs"),
+        "Django": (),
+        "Flask": (),
+        "FastAPI": ("fast api",),
+        "Spring Boot": ("spring", "springboot"),
+        ".NET": ("dotnet", "asp.net", ".net core"),
+        "Ruby on Rails": ("rails", "ror"),
+        "GraphQL": (),
+        "REST APIs": ("rest", "restful", "rest api", "restful apis", "rest apis"),
+        "gRPC": (),
+        "Microservices": ("microservice", "micro services", "microservices architecture"),
+    },
+    "database": {
+        "PostgreSQL": ("postgres", "postgresql", "psql"),
+        "MySQL": (),
+        "MongoDB": ("mongo",),
+        "Redis": (),
+        "SQLite": (),
+        "Cassandra": (),
+        "DynamoDB": ("dynamo db",),
+        "Elasticsearch": ("elastic search", "elk"),
+        "Oracle Database": ("oracle", "oracle db"),
+        "SQL Server": ("mssql", "ms sql", "microsoft sql server"),
+        "Snowflake": (),
+        "BigQuery": ("big query",),
+    },
+    "cloud": {
+        "AWS": ("amazon web services", "ec2", "s3", "lambda", "aws lambda"),
+        "Google Cloud": ("gcp", "google cloud platform"),
+        "Azure": ("microsoft azure",),
+        "Firebase": (),
+        "Heroku": (),
+        "Vercel": (),
+    },
+    "devops": {
+        "Docker": ("containers", "containerization"),
+        "Kubernetes": ("k8s", "eks", "gke", "aks"),
+        "Terraform": (),
+        "Ansible": (),
+        "Jenkins": (),
+        "GitHub Actions": (),
+        "GitLab CI": (),
+        "CI/CD": ("ci cd", "continuous integration", "continuous delivery", "continuous deployment"),
+        "Linux": ("unix", "ubuntu"),
+        "Nginx": (),
+        "Prometheus": (),
+        "Grafana": (),
+        "Git": ("github", "gitlab", "version control"),
+    },
+    "data": {
+        "Pandas": (),
+        "NumPy": (),
+        "Apache Spark": ("spark", "pyspark"),
+        "Apache Kafka": ("kafka",),
+        "Airflow": ("apache airflow",),
+        "dbt": (),
+        "Hadoop": (),
+        "ETL": ("elt", "data pipelines", "data pipeline"),
+        "Tableau": (),
+        "Power BI": ("powerbi",),
+        "Excel": ("ms excel", "microsoft excel"),
+    },
+    "ml": {
+        "Machine Learning": ("ml",),
+        "Deep Learning": ("dl", "neural networks", "neural network"),
+        "TensorFlow": ("tf", "keras"),
+        "PyTorch": ("torch",),
+        "scikit-learn": ("sklearn", "scikit learn"),
+        "NLP": ("natural language processing",),
+        "Computer Vision": ("cv", "opencv"),
+        "LLMs": ("llm", "large language models", "large language model", "gpt", "langchain", "rag"),
+        "Statistics": ("statistical analysis", "a/b testing", "ab testing", "hypothesis testing"),
+        "XGBoost": ("gradient boosting", "lightgbm"),
+    },
+    "mobile": {
+        "Android": (),
+        "iOS": (),
+        "Flutter": ("dart",),
+    },
+    "testing": {
+        "Unit Testing": ("unit tests", "pytest", "junit", "jest", "unittest"),
+        "Selenium": (),
+        "Cypress": (),
+        "Test Automation": ("automated testing", "automation testing"),
+    },
+    "practice": {
+        "System Design": ("distributed systems", "scalability", "high availability"),
+        "Agile": ("scrum", "kanban", "sprint planning"),
+        "Data Structures": ("algorithms", "data structures and algorithms", "dsa"),
+        "Object-Oriented Design": ("oop", "object oriented programming", "design patterns", "solid"),
+        "Security": ("oauth", "jwt", "authentication", "encryption", "owasp"),
+        "Product Management": ("roadmap", "roadmapping", "product strategy", "prioritization"),
+        "User Research": ("user interviews", "usability testing", "customer discovery"),
+        "Stakeholder Management": ("stakeholders", "cross-functional"),
+    },
+}
+
+# Aliases that are ordinary English words or single letters: only trusted in a skills section
+AMBIGUOUS_ALIASES = {"go", "c", "r", "rest", "spring", "swift", "express", "shell", "node", "rails", "solid",
+                     "ts", "js", "py", "ml", "dl", "cv", "tf", "rag", "elt", "containers", "oracle", "lambda",
+                     "s3", "torch", "scrum", "roadmap", "prioritization", "stakeholders", "authentication",
+                     "encryption", "scalability", "algorithms", "unix", "dart", "excel", "statistics"}
+
+ROLE_TAXONOMY: Dict[str, Tuple[str, ...]] = {
+    "Software Engineer": ("software developer", "sde", "swe", "software development engineer", "programmer",
+                          "application developer"),
+    "Backend Engineer": ("backend developer", "back-end engineer", "back-end developer", "back end developer",
+                         "server-side developer"),
+    "Frontend Engineer": ("frontend developer", "front-end engineer", "front-end developer", "front end developer",
+                          "ui developer", "web developer"),
+    "Full Stack Engineer": ("full stack developer", "full-stack developer", "full-stack engineer",
+                            "fullstack developer", "fullstack engineer"),
+    "Mobile Engineer": ("mobile developer", "android developer", "ios developer", "app developer"),
+    "Data Scientist": (),
+    "Data Engineer": (),
+    "Data Analyst": ("business analyst", "bi analyst", "analytics engineer"),
+    "Machine Learning Engineer": ("ml engineer", "ai engineer", "mlops engineer"),
+    "DevOps Engineer": ("site reliability engineer", "sre", "platform engineer", "infrastructure engineer",
+                        "cloud engineer"),
+    "QA Engineer": ("test engineer", "sdet", "quality assurance engineer", "qa analyst"),
+    "Security Engineer": ("security analyst", "application security engineer"),
+    "Product Manager": ("product owner", "associate product manager", "apm", "technical product manager"),
+    "Engineering Manager": ("tech lead", "technical lead", "team lead", "head of engineering"),
+}
+
+SECTION_HEADERS = {
+    "skills": ("skills", "technical skills", "core skills", "key skills", "core competencies", "technologies",
+               "tech stack", "tools", "tools and technologies", "tools & technologies"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "internships", "internship"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects", "selected projects",
+                 "side projects"),
+    "education": ("education", "academics", "academic background", "qualifications"),
+    "summary": ("summary", "profile", "professional summary", "objective", "about me", "about"),
+    "certifications": ("certifications", "certificates", "courses", "achievements", "awards"),
+}
+
+MONTHS = {m: i for i, m in enumerate(("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct",
+                                      "nov", "dec"), 1)}
+
+MAX_PROJECTS = 8
+MAX_YEARS = 50
+
+# Keeps the punctuation technology names rely on: c++, c#, node.js, .net ("ci/cd" splits into two tokens)
+_TECH_TOKEN_RE = re.compile(r"[a-z0-9.#+][a-z0-9+#.\-]*")
+_BULLET_RE = re.compile(r"^\s*[•·▪◦●\-*–]\s*")
+_EXPLICIT_YEARS_RE = re.compile(r"\b(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b(?:\s+of)?(?:\s+\w+){0,3}?\s+experience",
+                                re.IGNORECASE)
+_DATE = r"(?:(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s*)?((?:19|20)\d{2})"
+_RANGE_RE = re.compile(_DATE + r"\s*(?:-|–|—|to|until)\s*(?:" + _DATE + r"|(present|current|now|today))",
+                       re.IGNORECASE)
+_PROJECT_LABEL_RE = re.compile(r"\bproject\s*[:\-–]\s*([A-Z][^\n,.;|]{2,60})")
+_HEADING_SPLIT_RE = re.compile(r"\s*(?:\||–|—| - |:|\(|,\s*(?:19|20)\d{2})")
+
+_SECTION_LOOKUP = {alias: section for section, aliases in SECTION_HEADERS.items() for alias in aliases}
+# pdf.js text arrives as one line per page; split before ALL-CAPS section headers
+_INLINE_HEADER_RE = re.compile(
+    r"\s(" + "|".join(sorted((re.escape(a.upper()) for a in _SECTION_LOOKUP), key=len, reverse=True))
+    + r")\b:?\s*"
+)
+
+
+def tech_tokenize(text: str) -> List[str]:
+    """Lowercase tokens that keep technology punctuation; trailing sentence punctuation is dropped"""
+    tokens = []
+    for token in _TECH_TOKEN_RE.findall((text or "").lower()):
+        token = token.rstrip(".-")
+        if token and token != ".":
+            tokens.append(token)
+    return tokens
+
+
+def _section_of(line: str) -> Optional[str]:
+    key = line.strip().strip(":").strip().lower()
+    if len(key) > 40:
+        return None
+    return _SECTION_LOOKUP.get(key)
+
+
+def _months(month: Optional[str], year: str) -> int:
+    return int(year) * 12 + MONTHS.get((month or "jan")[:3].lower(), 1) - 1
+
+
+class SkillExtractor:
+    """Single-pass skill / role matcher over a compiled alias automaton"""
+
+    def __init__(self, skills: Dict[str, Dict[str, Tuple[str, ...]]] = SKILL_TAXONOMY,
+                 roles: Dict[str, Tuple[str, ...]] = ROLE_TAXONOMY):
+        self.entries: Dict[str, Tuple[str, str, str]] = {}  # key -> (kind, canonical name, category)
+        phrases: Dict[str, str] = {}
+        for category, names in skills.items():
+            for name, aliases in names.items():
+                key = f"skill:{name}"
+                self.entries[key] = ("skill", name, category)
+                for alias in (name.lower(),) + aliases:
+                    phrases[alias] = key
+        for name, aliases in roles.items():
+            key = f"role:{name}"
+            self.entries[key] = ("role", name, "role")
+            for alias in (name.lower(),) + aliases:
+                phrases[alias] = key
+        self.matcher = PhraseMatcher(phrases, tokenizer=tech_tokenize)
+        self._ambiguous = {i for i, (phrase, _, _) in enumerate(self.matcher.patterns)
+                           if phrase in AMBIGUOUS_ALIASES}
+
+    def _matches(self, tokens: List[str], trusted: bool) -> List[str]:
+        """Canonical keys of leftmost-longest, non-overlapping alias matches"""
+        patterns = self.matcher.patterns
+        found = []
+        for end, pattern_id in self.matcher.find_all(tokens):
+            length = patterns[pattern_id][2]
+            if pattern_id in self._ambiguous and not trusted:
+                continue
+            found.append((end - length + 1, -length, pattern_id))
+        found.sort()
+        keys = []
+        covered_until = -1
+        for start, neg_length, pattern_id in found:
+            if start <= covered_until:
+                continue
+            covered_until = start - neg_length - 1
+            keys.append(patterns[pattern_id][1])
+        return keys
+
+    def skills_in(self, text: str, trusted: bool = False) -> Set[str]:
+        """Canonical skill names mentioned in free text (answers, questions)"""
+        return {self.entries[key][1] for key in self._matches(tech_tokenize(text), trusted)
+                if self.entries[key][0] == "skill"}
+
+    def profile(self, text: str) -> Dict:
+        """Skills, roles, years of experience and project headings of a resume"""
+        # Deep copy: callers may edit the profile, and the cached one must not change
+        return copy.deepcopy(_cached_profile(self, text or ""))
+
+    def _profile(self, text: str) -> Dict:
+        lines = _INLINE_HEADER_RE.sub(r"\n\1\n", text).splitlines()
+        skill_counts: Dict[str, int] = {}
+        roles: List[str] = []
+        projects: List[str] = []
+        sections: List[str] = []
+        ranges: List[Tuple[int, int]] = []
+        section = None
+        now = time.localtime()
+        now_months = now.tm_year * 12 + now.tm_mon - 1
+
+        for raw in lines:
+            line = raw.strip()
+            if not line:
+                continue
+            header = _section_of(line)
+            if header:
+                section = header
+                sections.append(header)
+                continue
+            for key in self._matches(tech_tokenize(line), trusted=section == "skills"):
+                kind, name, _ = self.entries[key]
+                if kind == "skill":
+                    skill_counts[name] = skill_counts.get(name, 0) + 1
+                elif name not in roles and section != "education":
+                    roles.append(name)
+            if section != "education":
+                for match in _RANGE_RE.finditer(line):
+                    start = _months(match.group(1), match.group(2))
+                    end = now_months if match.group(5) else _months(match.group(3), match.group(4) or "0")
+                    if 0 < end - start <= MAX_YEARS * 12:
+                        ranges.append((start, end))
+            if section == "projects" and not _BULLET_RE.match(raw):
+                heading = _HEADING_SPLIT_RE.split(line, 1)[0].strip()
+                if heading and len(heading.split()) <= 8 and heading not in projects:
+                    projects.append(heading)
+            for match in _PROJECT_LABEL_RE.finditer(line):
+                name = match.group(1).strip()
+                if name not in projects:
+                    projects.append(name)
+
+        explicit = [float(y) for y in _EXPLICIT_YEARS_RE.findall(text) if 0 < float(y) <= MAX_YEARS]
+        years = max(explicit) if explicit else self._merged_years(ranges)
+        skills = sorted(skill_counts.items(), key=lambda item: -item[1])
+        categories: Dict[str, List[str]] = {}
+        for name, _ in skills:
+            categories.setdefault(self.entries[f"skill:{name}"][2], []).append(name)
+        return {
+            "skills": [{"name": name, "category": self.entries[f"skill:{name}"][2], "mentions": count}
+                       for name, count in skills],
+            "categories": categories,
+            "roles": roles,
+            "years_experience": years,
+            "projects": projects[:MAX_PROJECTS],
+            "sections": sections,
+        }
+
+    @staticmethod
+    def _merged_years(ranges: List[Tuple[int, int]]) -> Optional[float]:
+        """Total years covered by date ranges, overlapping jobs counted once"""
+        if not ranges:
+            return None
+        total = 0
+        current_start, current_end = None, None
+        for start, end in sorted(ranges):
+            if current_end is None or start > current_end:
+                if current_end is not None:
+                    total += current_end - current_start
+                current_start, current_end = start, end
+            else:
+                current_end = max(current_end, end)
+        total += current_end - current_start
+        return round(total / 12 * 2) / 2
+
+    def canonical_role(self, title: str) -> Optional[str]:
+        """Taxonomy name of a job title ("Backend Developer" -> "Backend Engineer"), if known"""
+        for key in self._matches(tech_tokenize(title), trusted=True):
+            kind, name, _ = self.entries[key]
+            if kind == "role":
+                return name
+        return None
+
+    def skill_names(self, profile: Dict) -> Set[str]:
+        return {skill["name"] for skill in (profile or {}).get("skills", [])}
+
+
+@lru_cache(maxsize=256)
+def _cached_profile(extractor: SkillExtractor, text: str) -> Dict:
+    # Sessions, prompts and the scorer ask for the same resume's profile repeatedly
+    return extractor._profile(text)
+
+
+def has_profile(profile: Optional[Dict]) -> bool:
+    """Whether a profile found anything worth asking about"""
+    return bool(profile and (profile.get("skills") or profile.get("projects") or profile.get("roles")))
+
+
+def profile_digest(profile: Optional[Dict], max_skills: int = 15) -> str:
+    """Compact, prompt-ready text for a resume profile"""
+    if not has_profile(profile):
+        return "No skills or projects found"
+    lines = []
+    if profile["skills"]:
+        names = [skill["name"] for skill in profile["skills"][:max_skills]]
+        lines.append("Skills: " + ", ".join(names))
+    if profile["roles"]:
+        lines.append("Roles held: " + ", ".join(profile["roles"]))
+    if profile.get("years_experience") is not None:
+        lines.append(f"Experience: ~{profile['years_experience']:g} years")
+    if profile["projects"]:
+        lines.append("Projects: " + "; ".join(profile["projects"]))
+    return "\n".join(lines)
+
+
+# Global skill extractor
+skill_extractor = SkillExtractor()
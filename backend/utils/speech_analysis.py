@@ -0,0 +1,266 @@
+"""
+Speech Analysis - Filler, hedge and repetition detection for transcripts
+A word-level Aho-Corasick automaton matches every single- and multi-word
+pattern ("um", "you know", "kind of", "i'm not sure", ...) in one linear pass
+over the transcript tokens. Overlapping matches are resolved leftmost-longest,
+so "and stuff like that" counts "and stuff" and "like", never a word twice.
+Immediate word repetitions are counted in the same pass.
+"""
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+import re
+
+from utils.cpu_pool import cpu_job
+
+FILLER_PHRASES = (
+    "um", "umm", "uh", "uhh", "er", "erm", "ah", "hmm", "like", "so", "actually", "basically",
+    "literally", "right", "okay so", "you know", "kind of", "sort of", "i mean", "you see",
+    "or something", "and stuff", "stuff like that",
+)
+
+HEDGE_PHRASES = (
+    "i think", "i guess", "i suppose", "i believe", "maybe", "probably", "perhaps", "possibly",
+    "not sure", "i'm not sure", "i am not sure", "i don't know", "i dont know", "might be",
+    "more or less", "to some extent", "somewhat",
+)
+
+FILLER = "filler"
+HEDGE = "hedge"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# Words that are legitimately doubled ("that that", "had had") are rare in
+# speech; numbers are excluded so "1 1" in a version string is not flagged
+_REPETITION_IGNORE = {"that", "had"}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; apostrophes are kept so "don't" stays one token"""
+    return _TOKEN_RE.findall((text or "").lower().replace("’", "'"))
+
+
+class PhraseMatcher:
+    """Word-level Aho-Corasick automaton over a fixed set of phrases"""
+
+    def __init__(self, phrases: Dict[str, str], tokenizer: Callable[[str], List[str]] = None):
+        """
+        Args:
+            phrases: mapping of phrase -> category
+            tokenizer: splits phrases into tokens; defaults to the transcript tokenizer
+        """
+        tokenizer = tokenizer or tokenize
+        self._goto: List[Dict[str, int]] = [{}]
+        self.vocabulary = set()  # every token that appears in some pattern
+        self._depth: List[int] = [0]  # tokens from the root to each state
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self.patterns: List[Tuple[str, str, int]] = []  # (phrase, category, length in tokens)
+
+        for phrase, category in phrases.items():
+            tokens = tokenizer(phrase)
+            if not tokens:
+                continue
+            self.vocabulary.update(tokens)
+            state = 0
+            for token in tokens:
+                nxt = self._goto[state].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][token] = nxt
+                    self._goto.append({})
+                    self._depth.append(self._depth[state] + 1)
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(len(self.patterns))
+            self.patterns.append((" ".join(tokens), category, len(tokens)))
+
+        # Breadth-first construction of failure links and merged outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(token, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def step(self, state: int, token: str) -> int:
+        """Advance the automaton by one token"""
+        if token not in self.vocabulary:
+            return 0
+        while state and token not in self._goto[state]:
+            state = self._fail[state]
+        return self._goto[state].get(token, 0)
+
+    def matches(self, state: int) -> List[int]:
+        """Pattern ids ending at the given state"""
+        return self._out[state]
+
+    def find_all(self, tokens: Sequence[str]) -> List[Tuple[int, int]]:
+        """All (end_token_index, pattern_id) matches, overlapping ones included"""
+        found = []
+        state = 0
+        for i, token in enumerate(tokens):
+            state = self.step(state, token)
+            for pattern_id in self._out[state]:
+                found.append((i, pattern_id))
+        return found
+
+
+class SpeechCounter:
+    """Resumable single-pass counter; feed tokens in any number of pieces
+    
+    Automaton state, matches not yet settled and the previous token survive
+    between feeds, so phrases and repetitions spanning two pieces are found
+    exactly as if the text had arrived at once.
+    
+    Matches are chosen leftmost-longest and never overlap: of all phrases in
+    the text, the one starting earliest wins (the longest if several start
+    there), then matching resumes after it. A match is settled once no phrase
+    still in progress could start at or before it; the automaton state's depth
+    gives exactly that bound.
+    """
+
+    def __init__(self, matcher: PhraseMatcher):
+        self.matcher = matcher
+        self.word_count = 0
+        self.totals = {FILLER: 0, HEDGE: 0}
+        self.breakdown: Dict[str, Dict[str, int]] = {FILLER: {}, HEDGE: {}}
+        self.repetitions = 0
+        self._state = 0
+        self._previous = None
+        self._pending: List[Tuple[int, int, int]] = []  # (start, -length, pattern_id) not yet settled
+        self._blocked = -1  # last token index covered by a counted match
+
+    def feed(self, tokens: Sequence[str]) -> "SpeechCounter":
+        """Consume tokens in O(len(tokens))"""
+        matcher = self.matcher
+        patterns = matcher.patterns
+        vocabulary = matcher.vocabulary
+        goto, fail, out, depth = matcher._goto, matcher._fail, matcher._out, matcher._depth
+        state, previous, pending, blocked = self._state, self._previous, self._pending, self._blocked
+        totals, breakdown = self.totals, self.breakdown
+        repetitions = self.repetitions
+        offset = self.word_count
+        for i, token in enumerate(tokens, offset):
+            # Inlined PhraseMatcher.step: tokens outside every pattern reset to the root
+            if token in vocabulary:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+                for pattern_id in out[state]:
+                    length = patterns[pattern_id][2]
+                    if i - length + 1 > blocked:
+                        pending.append((i - length + 1, -length, pattern_id))
+            else:
+                state = 0
+            if pending:
+                # No phrase still in progress can start before this token
+                pending, blocked = self._settle(pending, i - depth[state] + 1, blocked, totals, breakdown)
+            if token == previous and token not in _REPETITION_IGNORE and not token.isdigit():
+                repetitions += 1
+            previous = token
+        self._state, self._previous, self._pending, self._blocked = state, previous, pending, blocked
+        self.repetitions = repetitions
+        self.word_count = offset + len(tokens)
+        return self
+
+    def _settle(self, pending: List[Tuple[int, int, int]], frontier: float, blocked: int,
+                totals: Dict, breakdown: Dict) -> Tuple[List[Tuple[int, int, int]], int]:
+        """Count the leftmost-longest pending matches starting before `frontier`
+
+        Returns the matches left pending and the new last covered token index.
+        """
+        while pending:
+            best = min(pending)
+            if best[0] >= frontier:
+                break
+            start, negative_length, pattern_id = best
+            phrase, category, _ = self.matcher.patterns[pattern_id]
+            breakdown[category][phrase] = breakdown[category].get(phrase, 0) + 1
+            totals[category] += 1
+            blocked = start - negative_length - 1
+            pending = [match for match in pending if match[0] > blocked]
+        return pending, blocked
+
+    def counts(self) -> Dict:
+        """Snapshot of the running counts, as if the text ended here"""
+        totals, breakdown = self.totals, self.breakdown
+        if self._pending:
+            # Settle the open matches on copies; more tokens may still change them
+            totals = dict(totals)
+            breakdown = {category: dict(phrases) for category, phrases in breakdown.items()}
+            self._settle(list(self._pending), float("inf"), self._blocked, totals, breakdown)
+        return {
+            "word_count": self.word_count,
+            "filler_count": totals[FILLER],
+            "hedge_count": totals[HEDGE],
+            "repetition_count": self.repetitions,
+            "filler_breakdown": breakdown[FILLER],
+            "hedge_breakdown": breakdown[HEDGE],
+        }
+
+
+class SpeechAnalyzer:
+    """Computes filler, hedge, repetition and pace metrics for transcripts"""
+
+    def __init__(self, fillers: Iterable[str] = FILLER_PHRASES, hedges: Iterable[str] = HEDGE_PHRASES):
+        phrases = {p: FILLER for p in fillers}
+        phrases.update({p: HEDGE for p in hedges})
+        self.matcher = PhraseMatcher(phrases)
+
+    def counter(self) -> SpeechCounter:
+        """A fresh resumable counter backed by this analyzer's automaton"""
+        return SpeechCounter(self.matcher)
+
+    def count_tokens(self, tokens: Sequence[str]) -> Dict:
+        """Single pass over tokens: per-phrase counts, category totals, repetitions"""
+        return self.counter().feed(tokens).counts()
+
+    def analyze(self, transcript: str, duration_seconds: Optional[float] = None) -> Dict:
+        """Full speech-quality metrics for one transcript"""
+        counts = self.count_tokens(tokenize(transcript))
+        return self.build_metrics(counts, duration_seconds)
+
+    @staticmethod
+    def build_metrics(counts: Dict, duration_seconds: Optional[float] = None) -> Dict:
+        """Turn raw counts into the /analyze-speech response fields"""
+        total_words = counts["word_count"]
+        filler_count = counts["filler_count"]
+        filler_ratio = (filler_count / total_words * 100) if total_words > 0 else 0
+        hedge_ratio = (counts["hedge_count"] / total_words * 100) if total_words > 0 else 0
+        repetition_ratio = (counts["repetition_count"] / total_words * 100) if total_words > 0 else 0
+
+        # Real pace needs real timing; without a duration we do not guess
+        wpm = None
+        if duration_seconds and duration_seconds > 0:
+            wpm = round(total_words / duration_seconds * 60, 1)
+
+        clarity_score = 100 - min(filler_ratio * 2 + repetition_ratio * 2, 50)
+        confidence_score = 100 - min(filler_ratio + hedge_ratio * 2, 40)
+
+        return {
+            "filler_words": filler_count,
+            "filler_ratio": filler_ratio,
+            "filler_breakdown": dict(counts["filler_breakdown"]),
+            "hedge_count": counts["hedge_count"],
+            "hedge_breakdown": dict(counts["hedge_breakdown"]),
+            "repetition_count": counts["repetition_count"],
+            "total_words": total_words,
+            "words_per_minute": wpm,
+            "clarity_score": clarity_score,
+            "confidence_score": confidence_score,
+        }
+
+
+# Global speech analyzer (automaton is compiled once at import)
+speech_analyzer = SpeechAnalyzer()
+
+
+@cpu_job
+def analyze_transcripts(items: List[Tuple[str, Optional[float]]]) -> List[Dict]:
+    """Metrics for (transcript, duration_seconds) pairs; runs in a CPU pool worker for large batches"""
+    return [speech_analyzer.analyze(transcript, duration) for transcript, duration in items]
@@ -0,0 +1,204 @@
+"""
+Speech Stream - Incremental speech analytics for live transcripts
+The client sends transcript chunks with timestamps while the candidate speaks.
+Each chunk updates running counters (fillers, hedges, repetitions, pace,
+pauses) in O(chunk) time, and live stats can be read at any moment without
+reprocessing earlier text.
+
+Chunks are expected to break on word boundaries, which is what browser speech
+recognition produces for final results. Chunks from clients are validated
+(parse_chunk) before any stream state changes, so a malformed one is
+rejected without affecting the stream.
+"""
+from typing import Dict, List, Optional, Tuple
+import bisect
+import math
+import threading
+import time
+import uuid
+
+from utils.speech_analysis import SpeechAnalyzer, speech_analyzer, tokenize
+
+# Gaps between chunks shorter than this are normal inter-word spacing
+PAUSE_THRESHOLD_SECONDS = 0.3
+LONG_PAUSE_SECONDS = 2.0
+PAUSE_BUCKETS = (0.5, 1.0, 2.0, 5.0)  # upper bounds; the last bucket is open-ended
+
+
+def _seconds(value, name: str) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"Chunk {name} must be a finite number of seconds or null")
+    return float(value)
+
+
+def parse_chunk(chunk: Dict) -> Tuple[str, Optional[float], Optional[float]]:
+    """(text, start, end) of a client chunk; raises ValueError if it is malformed"""
+    if not isinstance(chunk, dict):
+        raise ValueError("Chunks must be objects")
+    text = chunk.get("text")
+    if text is None:
+        text = ""
+    if not isinstance(text, str):
+        raise ValueError("Chunk text must be a string")
+    return text, _seconds(chunk.get("start"), "start"), _seconds(chunk.get("end"), "end")
+
+
+class SpeechStreamSession:
+    """Running speech statistics for one live answer or interview"""
+
+    def __init__(self, stream_id: str, analyzer: SpeechAnalyzer = None, session_id: Optional[str] = None):
+        self.stream_id = stream_id
+        self.session_id = session_id
+        self.counter = (analyzer or speech_analyzer).counter()
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.chunks = 0
+
+        self.first_start: Optional[float] = None
+        self.last_end: Optional[float] = None
+        self.speaking_seconds = 0.0
+        # Disjoint, sorted [start, end] ranges already counted as speech
+        self._span_starts: List[float] = []
+        self._span_ends: List[float] = []
+
+        self.pause_count = 0
+        self.pause_seconds = 0.0
+        self.max_pause = 0.0
+        self.long_pauses = 0
+        self.pause_histogram = [0] * (len(PAUSE_BUCKETS) + 1)
+        self._lock = threading.Lock()
+
+    def add_chunk(self, text: str, start: Optional[float] = None, end: Optional[float] = None):
+        """Fold one transcript chunk (with optional start/end seconds) into the stats"""
+        tokens = tokenize(text)
+        with self._lock:
+            self.counter.feed(tokens)
+            self.chunks += 1
+            self.updated_at = time.time()
+
+            if start is None or end is None or end < start:
+                return
+            if self.first_start is None:
+                self.first_start = start
+            elif self.last_end is not None:
+                self._record_gap(start - self.last_end)
+            self.speaking_seconds += self._cover(start, end)
+            self.last_end = end if self.last_end is None else max(self.last_end, end)
+
+    def _cover(self, start: float, end: float) -> float:
+        """Merge [start, end] into the speech ranges; returns the seconds it newly covers
+
+        Recognizers re-send or overlap segments, so ranges are merged rather
+        than summed. Chunks arrive mostly in order, which keeps the merge at
+        the tail of the list.
+        """
+        starts, ends = self._span_starts, self._span_ends
+        first = bisect.bisect_left(ends, start)  # first range ending at or after start
+        last = bisect.bisect_right(starts, end)  # ranges from first up to here touch [start, end]
+        covered = sum(e - s for s, e in zip(starts[first:last], ends[first:last]))
+        if first < last:
+            start, end = min(start, starts[first]), max(end, ends[last - 1])
+        starts[first:last] = [start]
+        ends[first:last] = [end]
+        return (end - start) - covered
+
+    def _record_gap(self, gap: float):
+        if gap < PAUSE_THRESHOLD_SECONDS:
+            return
+        self.pause_count += 1
+        self.pause_seconds += gap
+        self.max_pause = max(self.max_pause, gap)
+        if gap >= LONG_PAUSE_SECONDS:
+            self.long_pauses += 1
+        for i, bound in enumerate(PAUSE_BUCKETS):
+            if gap < bound:
+                self.pause_histogram[i] += 1
+                break
+        else:
+            self.pause_histogram[-1] += 1
+
+    def stats(self) -> Dict:
+        """Live metrics; cost does not depend on how much has been streamed"""
+        with self._lock:
+            counts = self.counter.counts()
+            elapsed = None
+            if self.first_start is not None and self.last_end is not None:
+                elapsed = self.last_end - self.first_start
+            metrics = SpeechAnalyzer.build_metrics(counts, elapsed)
+
+            articulation_wpm = None
+            if self.speaking_seconds > 0:
+                articulation_wpm = round(counts["word_count"] / self.speaking_seconds * 60, 1)
+
+            # Long silences read as hesitation
+            pause_penalty = min(self.long_pauses * 3, 15)
+            metrics["confidence_score"] = max(0, metrics["confidence_score"] - pause_penalty)
+
+            labels = [f"<{b}s" for b in PAUSE_BUCKETS] + [f">={PAUSE_BUCKETS[-1]}s"]
+            metrics.update({
+                "stream_id": self.stream_id,
+                "session_id": self.session_id,
+                "chunks": self.chunks,
+                "elapsed_seconds": round(elapsed, 2) if elapsed is not None else None,
+                "speaking_seconds": round(self.speaking_seconds, 2),
+                "articulation_wpm": articulation_wpm,
+                "pause_count": self.pause_count,
+                "total_pause_seconds": round(self.pause_seconds, 2),
+                "avg_pause_seconds": round(self.pause_seconds / self.pause_count, 2) if self.pause_count else 0.0,
+                "max_pause_seconds": round(self.max_pause, 2),
+                "long_pauses": self.long_pauses,
+                "pause_histogram": dict(zip(labels, self.pause_histogram)),
+            })
+            return metrics
+
+
+class SpeechStreamManager:
+    """Holds live speech streams, expiring idle ones"""
+
+    def __init__(self, idle_timeout: float = 3600):
+        self.streams: Dict[str, SpeechStreamSession] = {}
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+
+    def start(self, session_id: Optional[str] = None) -> SpeechStreamSession:
+        """Open a new stream"""
+        self.cleanup_idle()
+        stream = SpeechStreamSession(uuid.uuid4().hex, session_id=session_id)
+        with self._lock:
+            self.streams[stream.stream_id] = stream
+        return stream
+
+    def get(self, stream_id: str) -> Optional[SpeechStreamSession]:
+        return self.streams.get(stream_id)
+
+    def add_chunks(self, stream_id: str, chunks: List[Dict]) -> Optional[SpeechStreamSession]:
+        """Append chunks of the form {"text", "start", "end"}
+        
+        Every chunk is validated first: a ValueError leaves the stream untouched.
+        """
+        stream = self.get(stream_id)
+        if stream is None:
+            return None
+        parsed = [parse_chunk(chunk) for chunk in chunks]
+        for text, start, end in parsed:
+            stream.add_chunk(text, start, end)
+        return stream
+
+    def end(self, stream_id: str) -> Optional[Dict]:
+        """Close a stream and return its final stats"""
+        with self._lock:
+            stream = self.streams.pop(stream_id, None)
+        return stream.stats() if stream else None
+
+    def cleanup_idle(self):
+        """Drop streams that have not received a chunk within the idle timeout"""
+        cutoff = time.time() - self.idle_timeout
+        with self._lock:
+            for stream_id in [sid for sid, s in self.streams.items() if s.updated_at < cutoff]:
+                del self.streams[stream_id]
+
+
+# Global speech stream manager
+speech_stream_manager = SpeechStreamManager()
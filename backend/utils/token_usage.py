@@ -0,0 +1,112 @@
+"""
+Token Usage - Token counts and cost of a single LLM call
+Reads the usage CrewAI reports for a kickoff (CrewOutput.token_usage, or the
+crew's usage_metrics) and prices it per model. When a call reports no usage
+the tokens are estimated from the prompt and output length (about four
+characters per token) and flagged as estimated.
+
+The endpoint a call is attributed to travels in a context variable: request
+handlers set it with `set_llm_endpoint(...)`, the request threadpool copies it
+into the worker thread, and the scoring / report pools are submitted with a
+copy of the caller's context.
+"""
+from contextvars import ContextVar
+from typing import Dict, Optional
+import math
+
+# Groq list prices, USD per million (input, output) tokens
+MODEL_PRICES = {
+    "groq/llama-3.1-8b-instant": (0.05, 0.08),
+}
+DEFAULT_PRICE = (0.05, 0.08)
+# Prompt tokens served from the provider's prefix cache are billed at this share of the input price
+CACHED_INPUT_FACTOR = 0.5
+
+CHARS_PER_TOKEN = 4
+
+USAGE_FIELDS = ("calls", "prompt_tokens", "completion_tokens", "cached_prompt_tokens", "total_tokens",
+                "estimated_calls")
+
+_endpoint: ContextVar[Optional[str]] = ContextVar("llm_endpoint", default=None)
+
+
+def set_llm_endpoint(name: str):
+    """Attribute the LLM calls of the current request to an endpoint
+
+    Every request runs in its own task (with its own copy of the context),
+    so the value never leaks into other requests.
+    """
+    _endpoint.set(name)
+
+
+def current_endpoint() -> str:
+    return _endpoint.get() or "internal"
+
+
+def new_usage_totals(breakdown: bool = True) -> Dict:
+    totals = {field: 0 for field in USAGE_FIELDS}
+    totals["cost_usd"] = 0.0
+    totals["cached_ratio"] = 0.0
+    if breakdown:
+        totals["by_agent"] = {}
+        totals["by_endpoint"] = {}
+    return totals
+
+
+def add_usage(totals: Dict, usage: Dict):
+    """Add one call's usage to a totals dict made by new_usage_totals"""
+    totals["calls"] += 1
+    for field in ("prompt_tokens", "completion_tokens", "cached_prompt_tokens", "total_tokens"):
+        totals[field] += usage[field]
+    totals["estimated_calls"] += 1 if usage["estimated"] else 0
+    totals["cost_usd"] = round(totals["cost_usd"] + usage["cost_usd"], 6)
+    # Share of prompt tokens the provider served from its prefix cache
+    if totals["prompt_tokens"]:
+        totals["cached_ratio"] = round(totals["cached_prompt_tokens"] / totals["prompt_tokens"], 3)
+
+
+def crew_model(crew) -> str:
+    agents = getattr(crew, "agents", None) or []
+    llm = getattr(agents[0], "llm", None) if agents else None
+    return str(getattr(llm, "model", llm) or "unknown")
+
+
+def crew_agent(crew) -> str:
+    agents = getattr(crew, "agents", None) or []
+    return str(getattr(agents[0], "role", None) or "unknown") if agents else "unknown"
+
+
+def _metric(metrics, name: str) -> int:
+    value = metrics.get(name) if isinstance(metrics, dict) else getattr(metrics, name, None)
+    return int(value or 0)
+
+
+def _estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def call_usage(crew, result) -> Dict:
+    """Tokens and cost of one kickoff of `crew` that returned `result`"""
+    metrics = getattr(result, "token_usage", None) or getattr(crew, "usage_metrics", None)
+    prompt = _metric(metrics, "prompt_tokens") if metrics is not None else 0
+    completion = _metric(metrics, "completion_tokens") if metrics is not None else 0
+    if prompt or completion:
+        cached = _metric(metrics, "cached_prompt_tokens")
+        estimated = False
+    else:
+        prompt_text = "".join(str(getattr(agent, field, "") or "") for agent in getattr(crew, "agents", None) or []
+                              for field in ("role", "goal", "backstory"))
+        prompt_text += "".join(str(getattr(task, "description", "") or "")
+                               for task in getattr(crew, "tasks", None) or [])
+        prompt, completion, cached = _estimate_tokens(prompt_text), _estimate_tokens(str(result)), 0
+        estimated = True
+    input_price, output_price = MODEL_PRICES.get(crew_model(crew), DEFAULT_PRICE)
+    return {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "cached_prompt_tokens": cached,
+        "total_tokens": prompt + completion,
+        "estimated": estimated,
+        "cost_usd": ((prompt - cached + cached * CACHED_INPUT_FACTOR) * input_price
+                     + completion * output_price) / 1_000_000,
+    }
@@ -0,0 +1,70 @@
+"""
+Warm-up - Explicit startup phase and readiness signal for the API
+main.py no longer builds the CrewAI agents or imports the heavy optional
+dependencies (crewai, reportlab, pypdf) at import time. The lifespan handler
+runs the warm-up steps on a worker thread once the server is listening:
+/health answers immediately (liveness) while /ready returns 503 until every
+step has finished, so a load balancer or autoscaler only sends interviews
+to a warm process. A request that arrives earlier still works; it just
+builds what it needs on first use.
+"""
+from typing import Callable, Dict, Iterable, Tuple
+import os
+import threading
+import time
+
+# "0" finishes the warm-up before the server accepts connections
+WARMUP_IN_BACKGROUND = os.getenv("WARMUP_IN_BACKGROUND", "1") == "1"
+
+
+class Warmup:
+    """Runs named startup steps once and reports their timings"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._steps: Dict[str, Dict] = {}
+        self._started_at = None
+        self._finished_at = None
+        self.ready = False
+
+    def run(self, steps: Iterable[Tuple[str, Callable[[], object]]]) -> bool:
+        """Run each step in order; the process is ready when none of them failed"""
+        with self._lock:
+            self._started_at = time.perf_counter()
+        for name, step in steps:
+            started = time.perf_counter()
+            try:
+                step()
+                result = {"status": "ok"}
+            except Exception as e:
+                print(f"⚠️  Warm-up step {name} failed: {e}")
+                result = {"status": "failed", "error": str(e)}
+            result["ms"] = round((time.perf_counter() - started) * 1000, 1)
+            with self._lock:
+                self._steps[name] = result
+        with self._lock:
+            self._finished_at = time.perf_counter()
+            self.ready = all(step["status"] == "ok" for step in self._steps.values())
+            total_ms = (self._finished_at - self._started_at) * 1000
+        print(f"{'✅' if self.ready else '❌'} Warm-up finished in {total_ms:.0f} ms (ready: {self.ready})")
+        return self.ready
+
+    def status(self) -> Dict:
+        with self._lock:
+            if self._started_at is None:
+                state = "pending"
+            elif self._finished_at is None:
+                state = "warming"
+            else:
+                state = "ready" if self.ready else "failed"
+            end = self._finished_at or time.perf_counter()
+            return {
+                "ready": self.ready,
+                "state": state,
+                "warmup_ms": round((end - self._started_at) * 1000, 1) if self._started_at else None,
+                "steps": dict(self._steps),
+            }
+
+
+# Global warm-up state
+warmup = Warmup()